@@ -1,19 +1,130 @@
-from flask import Flask, render_template, request, jsonify, send_from_directory
+from flask import Flask, render_template, request, jsonify, send_from_directory, stream_with_context
 from owlready2 import *
+import atexit
+import click
+import datetime
+import hashlib
+import io
 import os
+import tempfile
 import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeout
 from groq import Groq
 from dotenv import load_dotenv
+from entity_index import EntityIndex
+from ontology_queries import OntologyQueries, score_trait_name
+from question_catalog import QuestionCatalog
+from scoring import ScoringEngine
+from role_catalog import RoleCatalog, blueprints_from_json, seed_roles, write_roles
+from counterfactual import CounterfactualEngine
+from llm_cache import LLMCache
+from idempotency import IdempotencyStore, IdempotencyConflict
+from response_cache import ParticipantResponseCache
+from write_behind import WriteBehindSaver
+from population_norms import PopulationNorms
+from similarity_index import TraitVectorIndex
+from result_store import ResultStore
+from ontology_undo import OntologyUndo
+from rwlock import ReadWriteLock
+from contextlib import contextmanager
+import boot_snapshot
+import metrics
+import bulk_import
+import compaction
+import result_export
 
 load_dotenv()
 
 app = Flask(__name__)
 
 # --- CONFIGURATION ---
-ONTOLOGY_PATH = os.path.join(app.root_path, "project.rdf")
+ONTOLOGY_PATH = os.getenv("ONTOLOGY_PATH") or os.path.join(app.root_path, "project.rdf")
 GROQ_API_KEY = os.getenv("GROQ_API_KEY")
 FRONTEND_DIR = os.path.join(app.root_path, '../frontend')
 ALLOWED_FRONTEND_ORIGIN = "http://localhost:5173"
+MAX_BATCH_SCORE = int(os.getenv("MAX_BATCH_SCORE", "10000"))
+DEFAULT_BATCH_TOP_K = 10
+# Roles explained per /api/career-fit call (the best ones; ?top_k= overrides)
+CAREER_FIT_TOP_K = int(os.getenv("CAREER_FIT_TOP_K", "10"))
+# A* expansions allowed per "rank this role first" search: inline in career-fit / on /api/counterfactual
+COUNTERFACTUAL_MAX_STATES = int(os.getenv("COUNTERFACTUAL_MAX_STATES", "1000"))
+COUNTERFACTUAL_SEARCH_MAX_STATES = int(os.getenv("COUNTERFACTUAL_SEARCH_MAX_STATES", "20000"))
+DEFAULT_SIMILAR_K = 10
+MAX_SIMILAR_K = 100
+# Result exports read EXPORT_CHUNK_SIZE participants per read-lock acquisition
+EXPORT_CHUNK_SIZE = int(os.getenv("EXPORT_CHUNK_SIZE", "500"))
+# Bulk imports are scored and written IMPORT_CHUNK_SIZE records at a time
+IMPORT_CHUNK_SIZE = int(os.getenv("IMPORT_CHUNK_SIZE", "500"))
+MAX_IMPORT_ERRORS_REPORTED = 1000
+
+# Storage backend: "rdfxml" re-parses and rewrites project.rdf, "sqlite" keeps a persistent
+# owlready2 quadstore as the live database and treats project.rdf as an import/export artifact
+ONTOLOGY_STORAGE = os.getenv("ONTOLOGY_STORAGE", "rdfxml").strip().lower()
+if ONTOLOGY_STORAGE not in ("rdfxml", "sqlite"):
+    raise RuntimeError(f"ONTOLOGY_STORAGE must be 'rdfxml' or 'sqlite', not '{ONTOLOGY_STORAGE}'")
+QUADSTORE_PATH = os.getenv("ONTOLOGY_QUADSTORE_PATH", os.path.join(app.root_path, "project.sqlite3"))
+
+# RDF/XML saves are written behind: mutations mark the ontology dirty and one background save
+# runs after ONTOLOGY_SAVE_INTERVAL_SECONDS or once ONTOLOGY_SAVE_MAX_PENDING changes pile up.
+# An interval of 0 saves synchronously inside the request.
+ONTOLOGY_SAVE_INTERVAL_SECONDS = float(os.getenv("ONTOLOGY_SAVE_INTERVAL_SECONDS", "1.0"))
+ONTOLOGY_SAVE_MAX_PENDING = int(os.getenv("ONTOLOGY_SAVE_MAX_PENDING", "25"))
+
+# Optional SQLite snapshot of the parsed ontology (rdfxml mode). It is refreshed after every
+# save and used at boot whenever it matches project.rdf, so workers skip RDF/XML parsing.
+BOOT_SNAPSHOT_PATH = os.getenv("ONTOLOGY_BOOT_SNAPSHOT") or None
+
+# Per-trait population statistics (mean/variance + percentile histogram), saved next to the
+# ontology after every save and rebuilt from the stored scores when missing or stale
+POPULATION_NORMS_PATH = os.getenv("POPULATION_NORMS_PATH") or f"{os.path.splitext(ONTOLOGY_PATH)[0]}.norms.json"
+
+# Bump when ensure_custom_properties gains or changes a property. The seed part of the stamp
+# follows ROLE_BLUEPRINTS and ROLE_TRAIT_SKILL_GAPS automatically.
+SCHEMA_VERSION = 6
+
+# Request timing spans and Prometheus metrics on /metrics. Requests slower than
+# SLOW_REQUEST_MS (0 = off) are logged with their span breakdown.
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").strip().lower() not in ("0", "false", "no")
+SLOW_REQUEST_MS = float(os.getenv("SLOW_REQUEST_MS", "0"))
+
+# Independent LLM generations in one request run concurrently under a shared deadline (seconds)
+LLM_DEADLINE_SECONDS = float(os.getenv("LLM_DEADLINE_SECONDS", "60"))
+LLM_MAX_WORKERS = int(os.getenv("LLM_MAX_WORKERS", "8"))
+llm_executor = ThreadPoolExecutor(max_workers=LLM_MAX_WORKERS, thread_name_prefix="llm")
+
+# Cache of successful LLM generations. Bump a prompt version whenever its template changes so
+# stale generations are not served for the new prompt.
+LLM_PROMPT_VERSIONS = {
+    "analysis": "analysis-v1",
+    "justification": "justification-v1",
+    "role_explanations": "role-explanations-v1",
+}
+llm_cache = LLMCache(
+    max_entries=int(os.getenv("LLM_CACHE_MAX_ENTRIES", "1024")),
+    ttl_seconds=float(os.getenv("LLM_CACHE_TTL_SECONDS", str(7 * 24 * 3600))),
+    path=os.getenv("LLM_CACHE_PATH") or None,
+    save_interval=float(os.getenv("LLM_CACHE_SAVE_INTERVAL_SECONDS", "5")),
+)
+atexit.register(llm_cache.close)
+
+# Completed /submit_assessment responses by Idempotency-Key header (or, without one, by a hash
+# of the submission), so retries and double-clicks within the window replay the stored response
+# and a concurrent duplicate waits for the in-flight one instead of scoring and saving again.
+submission_idempotency = IdempotencyStore(
+    max_entries=int(os.getenv("IDEMPOTENCY_MAX_ENTRIES", "1024")),
+    ttl_seconds=float(os.getenv("IDEMPOTENCY_TTL_SECONDS", "600")),
+)
+
+# Rendered /get_previous_result, /api/justification and /api/career-fit responses per participant,
+# served with strong ETags. Submits and finished analyses invalidate their participant; a new
+# World, bulk import or role catalog drops everything.
+participant_responses = ParticipantResponseCache(
+    max_participants=int(os.getenv("RESPONSE_CACHE_MAX_PARTICIPANTS", "4096")),
+)
+
+ANALYSIS_UNAVAILABLE_MESSAGE = "AI analysis unavailable - Groq API key not configured. Please set GROQ_API_KEY environment variable."
 
 # Initialize Groq client only if API key is available
 client = None
@@ -23,10 +134,47 @@ if GROQ_API_KEY:
     except Exception as e:
         print(f"⚠️ Could not initialize Groq client: {e}")
 
+metrics_registry = metrics.Registry()
+http_requests_total = metrics_registry.counter(
+    "persona_http_requests_total", "HTTP requests served.", ("method", "route", "status"))
+http_request_duration = metrics_registry.histogram(
+    "persona_http_request_duration_seconds", "Time to produce the response (streamed bodies excluded).", ("method", "route"))
+span_duration = metrics_registry.histogram(
+    "persona_span_duration_seconds", "Time spent in instrumented phases (ontology load, lookups, LLM calls, saves).", ("span",))
+llm_fallbacks_total = metrics_registry.counter(
+    "persona_llm_fallbacks_total", "LLM calls answered with their fallback text.", ("call", "reason"))
+slow_requests_total = metrics_registry.counter(
+    "persona_slow_requests_total", "Requests slower than SLOW_REQUEST_MS.", ("route",))
+tracer = metrics.Tracer(span_duration, enabled=METRICS_ENABLED)
+
+# Concurrency model: routes read the shared World under the read lock (many at once) and
+# mutate it, reload it or swap it only under the write lock, so a reader never sees a World
+# being replaced or half-updated and writers are serialized.
+ontology_lock = ReadWriteLock()
+
 # Load ontology once at startup (absolute path) and provide a helper for reloads
 onto_world = None
-
-# Default career-role blueprint used for scoring and ontology seeding
+# Private copy of the boot snapshot backing onto_world, deleted when the World is replaced
+onto_world_copy = None
+# Boot-time measurements (ms), logged at startup and tracked by benchmarks/startup_time.py
+startup_timings = {}
+# (mtime, size) of project.rdf as of our last parse or save; lets force reloads skip unchanged files
+onto_file_signature = None
+# (inode, data_version) of the quadstore when onto_world was opened (sqlite mode); a commit by
+# another process (CLI import, another worker) or a rebuilt file changes it
+quadstore_signature = None
+# user_id -> Participant / Assessment / TraitScore lookups for the currently loaded World
+entity_index = EntityIndex()
+# Prepared SPARQL reads (participant record, trait scores) for the currently loaded World
+ontology_queries = OntologyQueries()
+# Questions compiled once per loaded World; served by /get_questions and reused by scoring
+question_catalog = None
+# Keying matrix + reverse-coding vector compiled alongside the question catalog
+scoring_engine = None
+# Running per-trait norms of the stored results; percentile ranks and z-scores in O(1)
+population_norms = PopulationNorms()
+
+# Default career roles seeded into the ontology's role catalog
 ROLE_BLUEPRINTS = {
     "Software Engineer": {
         "trait_targets": {
@@ -60,6 +208,77 @@ ROLE_BLUEPRINTS = {
     },
 }
 
+# Skills recommended per role when a participant falls short on a trait (seeded with the roles)
+ROLE_TRAIT_SKILL_GAPS = {
+    "Software Engineer": {
+        "Conscientiousness": ["Task Planning", "Test-Driven Development"],
+        "Openness": ["System Design Patterns", "Technical Architecture"],
+        "Neuroticism": ["Stress Management", "Incident Response Playbooks"],
+        "Extraversion": ["Stakeholder Communication", "Team Demos"],
+        "Agreeableness": ["Code Review Facilitation", "Pair Programming"],
+    },
+    "Manager": {
+        "Extraversion": ["Executive Presence", "Facilitation"],
+        "Agreeableness": ["Conflict Mediation", "Coaching"],
+        "Conscientiousness": ["Operational Cadence", "Prioritization"],
+        "Openness": ["Strategic Framing", "Innovation Workshops"],
+        "Neuroticism": ["Emotional Regulation", "Resilience Training"],
+    },
+    "Researcher": {
+        "Openness": ["Exploratory Research Methods", "Creative Prototyping"],
+        "Conscientiousness": ["Study Planning", "Documentation Rigor"],
+        "Extraversion": ["Conference Presentations", "Interviewing"],
+        "Agreeableness": ["Cross-team Collaboration", "Stakeholder Alignment"],
+        "Neuroticism": ["Experiment Recovery Plans", "Mindfulness"],
+    },
+}
+
+# Career roles compiled into target/weight matrices; read from the ontology per loaded World
+# (the blueprints above are only the seed and the fallback when the ontology has no roles)
+role_catalog = RoleCatalog(ROLE_BLUEPRINTS, ROLE_TRAIT_SKILL_GAPS)
+# Trait vectors of every scored participant for /api/similar; rebuilt per loaded World
+similarity_index = TraitVectorIndex(role_catalog.matrix)
+# Columnar mirror of every stored result (traits, performance, top roles, update time)
+# for cohort aggregates and the export; rebuilt per loaded World, updated by every write
+result_store = ResultStore(role_catalog.matrix, top_k=CAREER_FIT_TOP_K)
+
+
+def schema_stamp():
+    """Version of the custom properties plus a fingerprint of the seeded career roles."""
+    seed = hashlib.sha256(json.dumps([ROLE_BLUEPRINTS, ROLE_TRAIT_SKILL_GAPS], sort_keys=True).encode("utf-8")).hexdigest()[:12]
+    return f"schema-{SCHEMA_VERSION}:seed-{seed}"
+
+
+def stored_schema_stamp(o):
+    """The stamp recorded on the ontology by the last ensure_schema run, if any."""
+    if getattr(o, "schemaVersion", None) is None:
+        return None
+    values = o.metadata.schemaVersion
+    return str(values[0]) if values else None
+
+
+def ensure_schema(o):
+    """Run the custom-property probes and role seeding only when the stored stamp is stale.
+
+    Returns True when the ontology was migrated (and a save scheduled).
+    """
+    stamp = schema_stamp()
+    if stored_schema_stamp(o) == stamp:
+        return False
+    ensure_custom_properties(o)
+    ensure_career_roles_seed(o)
+    with o:
+        if getattr(o, "schemaVersion", None) is None:
+            class schemaVersion(AnnotationProperty):  # type: ignore
+                comment = ["Schema/seed stamp written by the backend; see SCHEMA_VERSION"]
+        o.metadata.schemaVersion = [stamp]
+    try:
+        persist_ontology(o)
+        print(f"🧩 Ontology schema stamped {stamp}")
+    except Exception as save_err:
+        print(f"⚠️ Could not persist schema stamp: {save_err}")
+    return True
+
 
 def ensure_custom_properties(o):
     """Ensure custom data properties exist on the ontology even after reloads."""
@@ -93,6 +312,25 @@ def ensure_custom_properties(o):
                 comment = ["Explainability report for the participant's scores"]
             created_new = True
 
+        ha = getattr(o, "hasAnalysisReport", None) or o.search_one(iri=f"{o.base_iri}hasAnalysisReport") or o.search_one(iri=f"{o.base_iri}#hasAnalysisReport")
+        if not ha:
+            class hasAnalysisReport(DataProperty):  # type: ignore
+                """Stores the streamed AI personality analysis for a participant."""
+                domain = [o.Participant]
+                range = [str]
+                label = ["hasAnalysisReport"]
+                comment = ["Markdown personality analysis generated by the LLM"]
+            created_new = True
+
+        ru = getattr(o, "resultUpdatedAt", None) or o.search_one(iri=f"{o.base_iri}resultUpdatedAt") or o.search_one(iri=f"{o.base_iri}#resultUpdatedAt")
+        if not ru:
+            class resultUpdatedAt(DataProperty):  # type: ignore
+                domain = [o.Participant]
+                range = [datetime.datetime]
+                label = ["resultUpdatedAt"]
+                comment = ["UTC time the participant's assessment results were last written"]
+            created_new = True
+
         # Career role fit extensions
         cr = getattr(o, "CareerRole", None) or o.search_one(iri=f"{o.base_iri}CareerRole") or o.search_one(iri=f"{o.base_iri}#CareerRole")
         if not cr:
@@ -106,15 +344,76 @@ def ensure_custom_properties(o):
                 label = ["Skill"]
             created_new = True
 
-        trait_cls = getattr(o, "Trait", None) or o.search_one(iri=f"{o.base_iri}Trait") or o.search_one(name="Trait")
+        # One TraitRequirement per (role, trait): requiresTrait, traitTarget, traitWeight, developsSkill
+        tr = getattr(o, "TraitRequirement", None) or o.search_one(iri=f"{o.base_iri}TraitRequirement") or o.search_one(iri=f"{o.base_iri}#TraitRequirement")
+        if not tr:
+            class TraitRequirement(Thing):  # type: ignore
+                label = ["TraitRequirement"]
+                comment = ["Target level and weight of one trait for a career role"]
+            created_new = True
+
+        htr = getattr(o, "hasTraitRequirement", None) or o.search_one(iri=f"{o.base_iri}hasTraitRequirement") or o.search_one(iri=f"{o.base_iri}#hasTraitRequirement")
+        if not htr:
+            class hasTraitRequirement(ObjectProperty):  # type: ignore
+                domain = [o.CareerRole]
+                range = [o.TraitRequirement]
+                label = ["hasTraitRequirement"]
+            created_new = True
+
+        trait_cls = getattr(o, "PersonalityTrait", None) or getattr(o, "Trait", None) or o.search_one(name="Trait")
         rt = getattr(o, "requiresTrait", None) or o.search_one(iri=f"{o.base_iri}requiresTrait") or o.search_one(iri=f"{o.base_iri}#requiresTrait")
-        if not rt and trait_cls:
+        if not rt:
             class requiresTrait(ObjectProperty):  # type: ignore
-                domain = [o.CareerRole] if getattr(o, "CareerRole", None) else [Thing]
-                range = [trait_cls]
+                domain = [o.TraitRequirement]
+                range = [trait_cls] if trait_cls else [Thing]
                 label = ["requiresTrait"]
             created_new = True
 
+        tt = getattr(o, "traitTarget", None) or o.search_one(iri=f"{o.base_iri}traitTarget") or o.search_one(iri=f"{o.base_iri}#traitTarget")
+        if not tt:
+            class traitTarget(DataProperty):  # type: ignore
+                domain = [o.TraitRequirement]
+                range = [float]
+                label = ["traitTarget"]
+                comment = ["Ideal trait percentage (0-100) for a career role"]
+            created_new = True
+
+        ds = getattr(o, "developsSkill", None) or o.search_one(iri=f"{o.base_iri}developsSkill") or o.search_one(iri=f"{o.base_iri}#developsSkill")
+        if not ds and getattr(o, "Skill", None):
+            class developsSkill(ObjectProperty):  # type: ignore
+                domain = [o.TraitRequirement]
+                range = [o.Skill]
+                label = ["developsSkill"]
+                comment = ["Skill to recommend when a participant falls short of this trait requirement"]
+            created_new = True
+
+        cp = getattr(o, "catalogPosition", None) or o.search_one(iri=f"{o.base_iri}catalogPosition") or o.search_one(iri=f"{o.base_iri}#catalogPosition")
+        if not cp:
+            class catalogPosition(DataProperty):  # type: ignore
+                domain = [o.CareerRole | o.TraitRequirement]
+                range = [int]
+                label = ["catalogPosition"]
+                comment = ["Display and tie-break order of roles in the catalog and of traits within a role"]
+            created_new = True
+
+        sd = getattr(o, "seedDigest", None) or o.search_one(iri=f"{o.base_iri}seedDigest") or o.search_one(iri=f"{o.base_iri}#seedDigest")
+        if not sd and getattr(o, "CareerRole", None):
+            class seedDigest(DataProperty):  # type: ignore
+                domain = [o.CareerRole]
+                range = [str]
+                label = ["seedDigest"]
+                comment = ["Fingerprint of the built-in blueprint a seeded role was written from; absent once an operator imports the role"]
+            created_new = True
+
+        so = getattr(o, "skillOrder", None) or o.search_one(iri=f"{o.base_iri}skillOrder") or o.search_one(iri=f"{o.base_iri}#skillOrder")
+        if not so:
+            class skillOrder(DataProperty):  # type: ignore
+                domain = [o.CareerRole | o.TraitRequirement]
+                range = [str]
+                label = ["skillOrder"]
+                comment = ["JSON list of skill labels in recommendation order (requiresSkill/developsSkill values are unordered)"]
+            created_new = True
+
         rs = getattr(o, "requiresSkill", None) or o.search_one(iri=f"{o.base_iri}requiresSkill") or o.search_one(iri=f"{o.base_iri}#requiresSkill")
         if not rs and getattr(o, "Skill", None):
             class requiresSkill(ObjectProperty):  # type: ignore
@@ -126,7 +425,7 @@ def ensure_custom_properties(o):
         tw = getattr(o, "traitWeight", None) or o.search_one(iri=f"{o.base_iri}traitWeight") or o.search_one(iri=f"{o.base_iri}#traitWeight")
         if not tw:
             class traitWeight(DataProperty):  # type: ignore
-                domain = [o.CareerRole]
+                domain = [o.TraitRequirement]
                 range = [float]
                 label = ["traitWeight"]
                 comment = ["Relative importance (0-1) of traits required for a career role"]
@@ -143,125 +442,448 @@ def ensure_custom_properties(o):
 
     if created_new:
         try:
-            o.save(file=ONTOLOGY_PATH, format="rdfxml")
+            persist_ontology(o)
             print("💾 Added missing custom properties to ontology file")
         except Exception as save_err:
             print(f"⚠️ Could not persist custom properties: {save_err}")
 
 
 def ensure_career_roles_seed(o):
-    """Seed core career roles, skills, and trait links so downstream scoring can attach data."""
+    """Write the built-in career roles (ROLE_BLUEPRINTS, ROLE_TRAIT_SKILL_GAPS) that are missing
+    or outdated; roles an operator imported are left alone (see seed_roles)."""
     try:
-        if not hasattr(o, "CareerRole") or not hasattr(o, "Skill"):
+        if not all(hasattr(o, name) for name in ("CareerRole", "Skill", "TraitRequirement")):
             return
 
-        def safe_name(label):
-            return "_".join(label.split()).replace("/", "_").replace("-", "_")
-        
-        def local_find_entity(cls, entity_name, ontology):
-            """Local entity finder for use during initialization."""
-            base = ontology.base_iri
-            candidates = []
-            if base.endswith('#'):
-                candidates.append(f"{base}{entity_name}")
-            else:
-                candidates.append(f"{base}#{entity_name}")
-            if base.endswith('/'):
-                candidates.append(f"{base}{entity_name}")
-            else:
-                candidates.append(f"{base}/{entity_name}")
-            candidates.append(entity_name)
-            
-            for iri in candidates:
-                found = ontology.search_one(iri=iri)
-                if found:
-                    return found
-            
-            if hasattr(cls, "instances"):
-                for inst in cls.instances():
-                    if inst.name == entity_name:
-                        return inst
-            return None
-
         with o:
-            for role_label, cfg in ROLE_BLUEPRINTS.items():
-                role_name = f"Role_{safe_name(role_label)}"
-                role = local_find_entity(o.CareerRole, role_name, o) or o.CareerRole(role_name)
-                try:
-                    role.label = [role_label]
-                except Exception:
-                    pass
-
-                trait_entities = []
-                weight_values = []
-                for trait_label, meta in cfg.get("trait_targets", {}).items():
-                    trait_entity = o.search_one(name=trait_label)
-                    if trait_entity is None:
-                        continue
-                    trait_entities.append(trait_entity)
-                    weight_values.append(meta.get("weight", 0.0))
-
-                if trait_entities:
-                    try:
-                        role.requiresTrait = list(trait_entities)
-                    except Exception:
-                        pass
-                if weight_values and hasattr(role, "traitWeight"):
-                    try:
-                        role.traitWeight = list(weight_values)
-                    except Exception:
-                        pass
-
-                skills = []
-                for skill_label in cfg.get("skills", [])[:4]:
-                    skill_name = f"Skill_{safe_name(skill_label)}"
-                    skill = local_find_entity(o.Skill, skill_name, o) or o.Skill(skill_name)
-                    try:
-                        skill.label = [skill_label]
-                    except Exception:
-                        pass
-                    skills.append(skill)
-
-                if skills:
-                    try:
-                        role.requiresSkill = skills
-                    except Exception:
-                        pass
+            seeded = seed_roles(o, ROLE_BLUEPRINTS, ROLE_TRAIT_SKILL_GAPS)
+        if not seeded:
+            return
 
         try:
-            o.save(file=ONTOLOGY_PATH, format="rdfxml")
-            print("💾 Career roles and skills seeded into ontology")
+            persist_ontology(o)
+            print(f"💾 Career roles seeded into ontology: {', '.join(seeded)}")
         except Exception as save_err:
             print(f"⚠️ Could not persist career roles: {save_err}")
     except Exception as seed_err:
         print(f"⚠️ Could not seed career roles: {seed_err}")
 
 
-def load_ontology(force_reload=False):
-    """Load ontology from disk. For force_reload, build a fresh World to avoid stale in-memory duplicates."""
+def ontology_file_signature():
+    """Cheap change detector for project.rdf based on modification time and size."""
+    try:
+        st = os.stat(ONTOLOGY_PATH)
+        return (st.st_mtime_ns, st.st_size)
+    except OSError:
+        return None
+
+
+@tracer.timed("save_ontology")
+def save_ontology_file(o):
+    """Write the ontology to project.rdf atomically: temp file in the same directory, then rename.
+
+    A crash mid-save leaves the previous project.rdf intact instead of a truncated file.
+    """
+    global onto_file_signature
+    buf = io.BytesIO()
+    o.save(file=buf, format="rdfxml")
+    data = buf.getvalue()
+    directory = os.path.dirname(ONTOLOGY_PATH)
+    fd, tmp_path = tempfile.mkstemp(prefix=".project.", suffix=".rdf.tmp", dir=directory)
+    try:
+        try:
+            os.chmod(tmp_path, os.stat(ONTOLOGY_PATH).st_mode & 0o777)
+        except OSError:
+            pass
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(data)
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp_path, ONTOLOGY_PATH)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+    onto_file_signature = ontology_file_signature()
+    save_population_norms(o)
+    if BOOT_SNAPSHOT_PATH:
+        try:
+            write_boot_snapshot(o, hashlib.sha256(data).hexdigest())
+        except Exception as snap_err:
+            print(f"⚠️ Could not refresh boot snapshot: {snap_err}")
+
+
+def population_norms_source():
+    """Identity of the persisted store the norms describe: (mtime, size) of the ontology file."""
+    try:
+        st = os.stat(QUADSTORE_PATH if ONTOLOGY_STORAGE == "sqlite" else ONTOLOGY_PATH)
+        return [st.st_mtime_ns, st.st_size]
+    except OSError:
+        return None
+
+
+def save_population_norms(o):
+    """Write the norms tagged with the store they now match (call right after saving o).
+
+    Norms not yet synced with o's World (e.g. during a boot-time schema save) are skipped;
+    sync_population_norms rebuilds them from the saved store.
+    """
+    if population_norms.world is not o.world:
+        return
+    try:
+        population_norms.source = population_norms_source()
+        population_norms.save(POPULATION_NORMS_PATH, population_norms.source)
+    except Exception as norms_err:
+        print(f"⚠️ Could not save population norms: {norms_err}")
+
+
+def rebuild_population_norms():
+    """Recompute the norms from every stored result (one pass over the entity index)."""
+    population_norms.reset(
+        stored_trait_percentages(user_id) for user_id in entity_index.scored_user_ids()
+    )
+
+
+def compile_role_catalog(o):
+    """Read the CareerRole catalog out of o; falls back to the built-in roles when it has none."""
+    global role_catalog
+    started = time.perf_counter()
+    catalog = RoleCatalog.from_ontology(o)
+    if not len(catalog):
+        catalog = RoleCatalog(ROLE_BLUEPRINTS, ROLE_TRAIT_SKILL_GAPS, world=o.world)
+        print("⚠️ No career roles in the ontology; using the built-in roles")
+    role_catalog = catalog
+    participant_responses.clear()
+    print(f"💼 Role catalog compiled: {len(catalog)} roles in {(time.perf_counter() - started) * 1000:.1f} ms")
+    return catalog
+
+
+def rebuild_similarity_index(o):
+    """Load every stored trait vector into the nearest-neighbour index."""
+    started = time.perf_counter()
+    similarity_index.rebuild(
+        ((user_id, stored_trait_percentages(user_id)) for user_id in entity_index.scored_user_ids()),
+        role_catalog.matrix,
+    )
+    similarity_index.world = o.world
+    print(f"🧭 Similarity index built over {len(similarity_index)} participants in {(time.perf_counter() - started) * 1000:.1f} ms")
+
+
+def stored_result_row(user_id):
+    """(user_id, {trait: pct}, {performance: score}, updated_at) as the result store keeps it.
+
+    Reads the entities directly, like stored_trait_percentages, so it is safe while a new
+    World is being loaded.
+    """
+    participant = export_participant(user_id)
+    performance, updated = {}, None
+    if participant is not None:
+        job = getattr(participant, "jobPerformance", None)
+        academic = getattr(participant, "academicPerformance", None)
+        stamps = getattr(participant, "resultUpdatedAt", None)
+        performance = {"JobPerformance": float(job[-1]) if job else None,
+                       "AcademicPerformance": float(academic[-1]) if academic else None}
+        updated = stamps[-1] if stamps else None
+    return user_id, stored_trait_percentages(user_id), performance, updated
+
+
+def rebuild_result_store(o):
+    """Mirror every scored participant into the columnar result store."""
+    started = time.perf_counter()
+    result_store.rebuild((stored_result_row(user_id) for user_id in entity_index.scored_user_ids()), role_catalog.matrix)
+    result_store.world = o.world
+    memory = result_store.memory_bytes()
+    per_row = memory["total"] / max(memory["participants"], 1)
+    print(f"🗃️ Result store built over {len(result_store)} participants ({memory['total'] / 1024:.1f} KiB, "
+          f"{per_row:.0f} B each) in {(time.perf_counter() - started) * 1000:.1f} ms")
+
+
+def sync_population_norms(o):
+    """Adopt the saved norms when they match the store just loaded, otherwise rebuild them."""
+    source = population_norms_source()
+    if population_norms.load(POPULATION_NORMS_PATH, source):
+        print(f"📊 Population norms loaded from {POPULATION_NORMS_PATH}")
+    else:
+        started = time.perf_counter()
+        rebuild_population_norms()
+        print(f"📊 Population norms rebuilt in {(time.perf_counter() - started) * 1000:.1f} ms")
+    population_norms.world = o.world
+    if not population_norms.source_matches(source) and not ontology_writer.dirty:
+        save_population_norms(o)
+
+
+def write_boot_snapshot(o, source_digest):
+    """Store the parsed World as the boot snapshot for the project.rdf with this digest."""
+    boot_snapshot.write_snapshot(o.world, BOOT_SNAPSHOT_PATH, {
+        "source_sha256": source_digest,
+        "schema": stored_schema_stamp(o) or "",
+    })
+
+
+def open_boot_snapshot():
+    """Open the boot snapshot when it was taken from the current project.rdf and schema, else None."""
+    global onto_world, onto_world_copy
+    meta = boot_snapshot.read_meta(BOOT_SNAPSHOT_PATH) if BOOT_SNAPSHOT_PATH else None
+    if not meta or meta.get("schema") != schema_stamp():
+        return None
+    if meta.get("source_sha256") != boot_snapshot.file_digest(ONTOLOGY_PATH):
+        print("⚠️ Boot snapshot is stale; parsing RDF/XML instead")
+        return None
+    world, copy_path = boot_snapshot.open_snapshot(BOOT_SNAPSHOT_PATH)
+    loaded = primary_ontology(world)
+    if loaded is None:
+        boot_snapshot.discard_snapshot_copy(world, copy_path)
+        return None
+    release_ontology_world()
+    onto_world, onto_world_copy = world, copy_path
+    return loaded
+
+
+def parse_ontology_file():
+    """Parse project.rdf into a fresh in-memory World."""
     global onto_world
+    release_ontology_world()
+    onto_world = World()
+    return onto_world.get_ontology(ONTOLOGY_PATH).load()
+
+
+def release_ontology_world():
+    """Drop the private snapshot copy backing the current World, if it was booted from one."""
+    global onto_world_copy
+    if onto_world_copy is not None:
+        boot_snapshot.discard_snapshot_copy(onto_world, onto_world_copy)
+        onto_world_copy = None
+
+
+def save_ontology_snapshot(o):
+    """Background save: the read lock keeps writers from mutating the World mid-serialization."""
+    with ontology_lock.read_locked():
+        save_ontology_file(o)
+
+
+ontology_writer = WriteBehindSaver(
+    save_ontology_snapshot,
+    interval=ONTOLOGY_SAVE_INTERVAL_SECONDS,
+    max_pending=ONTOLOGY_SAVE_MAX_PENDING,
+)
+
+
+def shutdown_ontology():
+    """Flush write-behind saves, then drop the boot snapshot copy backing the World."""
+    ontology_writer.close()
+    release_ontology_world()
+
+
+atexit.register(shutdown_ontology)
+
+
+@tracer.timed("persist_ontology")
+def persist_ontology(o):
+    """Persist pending changes: commit the quadstore transaction or schedule an RDF/XML save."""
+    if ONTOLOGY_STORAGE == "sqlite":
+        o.world.save()
+        save_population_norms(o)
+    elif ONTOLOGY_SAVE_INTERVAL_SECONDS > 0:
+        ontology_writer.mark_dirty(o)
+    else:
+        save_ontology_file(o)
+
+
+def primary_ontology(world):
+    """Return the project ontology stored in a world, skipping owlready2's anonymous placeholder."""
+    for candidate in list(world.ontologies.values()):
+        if candidate.base_iri == "http://anonymous/":
+            continue
+        if next(iter(candidate.classes()), None) is not None:
+            return candidate
+    return None
+
+
+def storage_location():
+    """Where persist_ontology writes: the quadstore in sqlite mode, else project.rdf."""
+    return QUADSTORE_PATH if ONTOLOGY_STORAGE == "sqlite" else ONTOLOGY_PATH
+
+
+def read_quadstore_signature(world):
+    """(inode, PRAGMA data_version) of the quadstore behind world.
+
+    SQLite moves data_version only when another connection commits, so our own saves keep it
+    stable; the inode changes when import-ontology replaces the file.
+    """
+    try:
+        inode = os.stat(QUADSTORE_PATH).st_ino
+    except OSError:
+        inode = None
+    return inode, world.graph.db.execute("PRAGMA data_version").fetchone()[0]
+
+
+def open_quadstore_ontology():
+    """Open the SQLite quadstore, importing project.rdf the first time the store is created."""
+    global onto_world, quadstore_signature
+    if onto_world is not None and quadstore_signature != read_quadstore_signature(onto_world):
+        # Another process changed the store: reopen, so no entity or index is read from stale caches
+        print(f"🔄 Quadstore {QUADSTORE_PATH} changed outside this process; reopening")
+        onto_world.close()
+        onto_world = None
+    if onto_world is None:
+        first_import = not os.path.exists(QUADSTORE_PATH)
+        # Non-exclusive so the Flask reloader's parent and child processes can both open the store
+        onto_world = World(filename=QUADSTORE_PATH, exclusive=False)
+        if first_import:
+            onto_world.get_ontology(ONTOLOGY_PATH).load()
+            onto_world.save()
+            print(f"📥 Imported {ONTOLOGY_PATH} into quadstore {QUADSTORE_PATH}")
+        quadstore_signature = read_quadstore_signature(onto_world)
+    onto_loaded = primary_ontology(onto_world)
+    if onto_loaded is None:
+        raise RuntimeError(f"Quadstore {QUADSTORE_PATH} does not contain the project ontology")
+    return onto_loaded
+
+
+def rollback_ontology(undo=None):
+    """Discard uncommitted changes and return a freshly loaded ontology.
+
+    While write-behind saves are pending project.rdf is behind the World, so re-parsing it would
+    also drop other requests' unsaved changes. The failed write is then taken back through undo
+    (an OntologyUndo captured before it) and the derived stores are rebuilt from the World.
+    """
+    global onto_world, onto_file_signature
+    if ONTOLOGY_STORAGE == "sqlite" and onto_world is not None:
+        # Closing the connection without committing drops the open transaction
+        onto_world.close()
+        onto_world = None
+    elif ontology_writer.dirty:
+        o = load_ontology(force_reload=True)
+        if undo is None:
+            print("⚠️ Rollback skipped: write-behind changes are still pending")
+            return o
+        for entity in undo.revert():
+            entity_index.register(entity)
+        rebuild_population_norms()
+        rebuild_similarity_index(o)
+        rebuild_result_store(o)
+        print(f"↩️ Rolled back {len(undo)} individuals; pending write-behind changes kept")
+        return o
+    # Force a real re-parse: the in-memory World may hold changes that never reached disk
+    onto_file_signature = None
+    return load_ontology(force_reload=True)
+
+
+@tracer.timed("load_ontology")
+def load_ontology(force_reload=False):
+    """Load ontology from disk. For force_reload, build a fresh World to avoid stale in-memory duplicates.
+
+    In sqlite storage mode the quadstore World is the live database, so it is opened once and
+    reused until another process commits to it; nothing is re-parsed. In rdfxml mode a forced reload is skipped
+    when project.rdf is unchanged since we last parsed or saved it, and while write-behind
+    changes are pending (the in-memory World is then ahead of the file).
+    """
+    global onto_world, onto_file_signature, question_catalog, scoring_engine
     try:
-        if force_reload or onto_world is None:
-            onto_world = World()
-        onto_obj = onto_world.get_ontology(ONTOLOGY_PATH)
-        onto_loaded = onto_obj.load(reload=force_reload)
-        print(f"✅ Ontology loaded from {ONTOLOGY_PATH}")
-        ensure_custom_properties(onto_loaded)
-        ensure_career_roles_seed(onto_loaded)
+        if ONTOLOGY_STORAGE == "sqlite":
+            onto_loaded = open_quadstore_ontology()
+            print(f"✅ Ontology opened from quadstore {QUADSTORE_PATH}")
+        else:
+            signature = ontology_file_signature()
+            if force_reload and onto_world is not None and (
+                ontology_writer.dirty or (signature is not None and signature == onto_file_signature)
+            ):
+                force_reload = False
+            if force_reload or onto_world is None:
+                started = time.perf_counter()
+                onto_loaded = open_boot_snapshot()
+                source = "boot snapshot"
+                if onto_loaded is None:
+                    onto_loaded = parse_ontology_file()
+                    source = "RDF/XML"
+                    if BOOT_SNAPSHOT_PATH and not ensure_schema(onto_loaded):
+                        # Nothing to save, so write the snapshot now for the next boot
+                        write_boot_snapshot(onto_loaded, boot_snapshot.file_digest(ONTOLOGY_PATH))
+                startup_timings["ontology_source"] = source
+                startup_timings["ontology_load_ms"] = round((time.perf_counter() - started) * 1000, 1)
+                print(f"✅ Ontology loaded from {ONTOLOGY_PATH} ({source}, {startup_timings['ontology_load_ms']} ms)")
+            else:
+                onto_loaded = primary_ontology(onto_world)
+            onto_file_signature = signature
+        ensure_schema(onto_loaded)
+        if entity_index.world is not onto_loaded.world:
+            entity_index.build(onto_loaded)
+        if ontology_queries.world is not onto_loaded.world:
+            ontology_queries.bind(onto_loaded)
+        if role_catalog.world is not onto_loaded.world:
+            compile_role_catalog(onto_loaded)
+        if population_norms.world is not onto_loaded.world:
+            sync_population_norms(onto_loaded)
+        if similarity_index.world is not onto_loaded.world or similarity_index.role_fit_matrix is not role_catalog.matrix:
+            rebuild_similarity_index(onto_loaded)
+        if result_store.world is not onto_loaded.world:
+            rebuild_result_store(onto_loaded)
+        elif result_store.role_fit_matrix is not role_catalog.matrix:
+            result_store.rescore(role_catalog.matrix)
+        if question_catalog is None or question_catalog.world is not onto_loaded.world:
+            question_catalog = compile_question_catalog(onto_loaded)
+            scoring_engine = ScoringEngine.from_catalog(question_catalog)
+        if participant_responses.world is not onto_loaded.world:
+            participant_responses.clear()
+            participant_responses.world = onto_loaded.world
         return onto_loaded
     except Exception as e:
         print(f"❌ CRITICAL ERROR: Could not load ontology. {e}")
         raise
 
 
-onto = load_ontology()
-ensure_custom_properties(onto)
-ensure_career_roles_seed(onto)
+def ontology_reload_needed():
+    """True when the backing store changed since the loaded World was parsed or saved."""
+    if onto_world is None:
+        return True
+    if ONTOLOGY_STORAGE == "sqlite":
+        return read_quadstore_signature(onto_world) != quadstore_signature
+    if ontology_writer.dirty:
+        return False
+    return ontology_file_signature() != onto_file_signature
+
+
+def refresh_ontology():
+    """Swap in a freshly loaded World (under the write lock) only if the store changed."""
+    global onto
+    if ontology_reload_needed():
+        with ontology_lock.write_locked():
+            onto = load_ontology(force_reload=True)
+    return onto
+
+
+@contextmanager
+def ontology_snapshot():
+    """Read-only access to a consistent World; concurrent readers share it, writers wait."""
+    refresh_ontology()
+    with ontology_lock.read_locked():
+        yield onto
+
+
+@contextmanager
+def ontology_transaction(undo=None):
+    """Exclusive access for mutations: reload if needed and hold off readers and other writers.
+
+    When the block raises, its changes are rolled back (through undo while write-behind saves are
+    pending) before the lock is released, so readers never see a half-applied write.
+    """
+    global onto
+    with ontology_lock.write_locked():
+        onto = load_ontology(force_reload=True)
+        try:
+            yield onto
+        except Exception:
+            onto = rollback_ontology(undo)
+            raise
+
 
 # --- HELPER FUNCTIONS ---
 
-def get_question_details(q):
+def get_question_details(q, o=None):
     """ Extract question info based on your ontology structure. """
+    o = o if o is not None else onto
     text = "Question text missing"
     if hasattr(q, "questionText") and q.questionText:
         text = q.questionText[0]
@@ -278,7 +900,7 @@ def get_question_details(q):
         trait_name = measured_entity.name 
 
     is_reverse = False
-    if hasattr(onto, "NegativelyKeyedQuestion") and isinstance(q, onto.NegativelyKeyedQuestion):
+    if hasattr(o, "NegativelyKeyedQuestion") and isinstance(q, o.NegativelyKeyedQuestion):
         is_reverse = True
     if not is_reverse and hasattr(q, "isReverseCoded") and q.isReverseCoded:
         val = q.isReverseCoded[0]
@@ -288,12 +910,41 @@ def get_question_details(q):
     return { "id": q_id, "text": text, "trait": trait_name, "is_reverse": is_reverse }
 
 
+def compile_question_catalog(o):
+    """Walk every AssessmentQuestion once and freeze the result into a QuestionCatalog."""
+    details = []
+    if hasattr(o, "AssessmentQuestion"):
+        # search(type=...) is a direct quadstore query; instances() would compile owlready2's SPARQL
+        # engine on first use, which dominates boot time
+        for q in o.search(type=o.AssessmentQuestion):
+            try:
+                details.append(get_question_details(q, o))
+            except Exception:
+                pass
+    catalog = QuestionCatalog.from_details(details, world=o.world)
+    print(f"📚 Compiled {len(catalog)} assessment questions (etag {catalog.etag})")
+    return catalog
+
+
 def normalize_user_id(user_id):
     return str(user_id).strip() if user_id is not None else ""
 
 
+@tracer.timed("find_entity_by_id")
 def find_entity_by_id(cls, name):
     """Robustly find an entity by name using multiple IRI strategies."""
+    # Strategy 0: In-process index (authoritative for Participant/Assessment/TraitScore)
+    indexed = entity_index.lookup(name)
+    if indexed is not None:
+        return indexed
+    if entity_index.covers(cls):
+        # One exact-IRI probe catches an individual the index has not seen (e.g. written by
+        # another process before the reload) and backfills it; no scan on a real miss
+        found = onto.world[f"{onto.base_iri}{name}"]
+        if found is not None:
+            entity_index.register(found)
+        return found
+
     base = onto.base_iri
     candidates = []
     
@@ -334,24 +985,33 @@ def find_entity_by_id(cls, name):
                 
     return None
 
-def get_or_create_singleton(cls, name):
+def get_or_create_singleton(cls, name, log=True):
     """Return a single individual by name; if multiple exist, keep one and destroy extras; if none, create."""
-    print(f"🔍 Looking for singleton: {name} of type {cls.name} (Base IRI: {onto.base_iri})")
+    if log:
+        print(f"🔍 Looking for singleton: {name} of type {cls.name} (Base IRI: {onto.base_iri})")
     
     keeper = find_entity_by_id(cls, name)
     
     if keeper:
-        print(f"   ✅ Found existing: {keeper.iri}")
-        # Check for duplicates in instances list just in case
-        if hasattr(cls, "instances"):
+        if log:
+            print(f"   ✅ Found existing: {keeper.iri}")
+        # Check for duplicates just in case (the index tracks every individual sharing this name)
+        if entity_index.covers(cls):
+            matches = entity_index.duplicates(name, keeper)
+        elif hasattr(cls, "instances"):
             matches = [m for m in cls.instances() if m.name == name and m != keeper]
-            for dup in matches:
-                print(f"   🗑️ Removing duplicate: {dup.iri}")
-                destroy_entity(dup)
+        else:
+            matches = []
+        for dup in matches:
+            print(f"   🗑️ Removing duplicate: {dup.iri}")
+            entity_index.forget(dup)
+            destroy_entity(dup)
     else:
-        print(f"   ✨ Creating new: {name}")
+        if log:
+            print(f"   ✨ Creating new: {name}")
         try:
             keeper = cls(name)
+            entity_index.register(keeper)
         except Exception as e:
             print(f"   ⚠️ Creation failed ({e}). Retrying fetch...")
             # Retry fetch in case of race condition or DB sync issue
@@ -382,16 +1042,14 @@ def dedup_user_entities(user_id):
 
     # Trait scores: keep one per trait suffix, drop extras
     by_trait = {}
-    for ts in list(onto.TraitScore.instances()):
-        if ts.name.startswith(f"Score_{user_id}_"):
-            trait_suffix = ts.name.split(f"Score_{user_id}_", 1)[-1]
-            if trait_suffix not in by_trait:
-                by_trait[trait_suffix] = ts
-            else:
-                try:
-                    destroy_entity(ts)
-                except Exception:
-                    pass
+    for trait_suffix, ts in entity_index.trait_scores(user_id).items():
+        by_trait[trait_suffix] = ts
+        for dup in entity_index.duplicates(ts.name, ts):
+            try:
+                entity_index.forget(dup)
+                destroy_entity(dup)
+            except Exception:
+                pass
 
     # Reattach cleaned trait scores to assessment
     try:
@@ -400,6 +1058,100 @@ def dedup_user_entities(user_id):
         pass
 
 
+def store_assessment_result(user_id, user_name, numeric_percentages, perf_scores, justification_report=None, trait_objects=None, log=True):
+    """Write one participant's assessment, performance and trait scores into the loaded ontology.
+
+    Must run inside `with onto:` under the write lock. trait_objects caches the Trait lookups
+    across calls (bulk imports pass one dict for the whole batch).
+    """
+    trait_objects = {} if trait_objects is None else trait_objects
+    previous_percentages = extract_trait_percentages_for_participant(user_id)
+    # Find or create participant by name (no wildcard), consolidating duplicates
+    participant = get_or_create_singleton(onto.Participant, f"Participant_{user_id}", log=log)
+    participant.participantID = [user_id]
+    entity_index.register_participant_id(user_id, participant)
+
+    # Use label or a specific property for the display name to avoid renaming the entity
+    # If 'name' is a DataProperty in your ontology, this is fine. 
+    # But if it conflicts with owlready2's .name (IRI suffix), it causes issues.
+    # Safest is to use label or ensure we are setting the DataProperty.
+    if hasattr(onto, "name") and isinstance(onto.name, DataPropertyClass):
+         participant.name = [user_name]
+    else:
+         participant.label = [user_name]
+
+    # Find or create assessment by name (no wildcard), consolidating duplicates
+    assessment = get_or_create_singleton(onto.Assessment, f"Assessment_{user_id}", log=log)
+    assessment.completedBy = [participant]
+
+    # Update performance scores
+    if "JobPerformance" in perf_scores:
+        if log:
+            print(f"   🔄 Updating JobPerformance to: {perf_scores['JobPerformance']}")
+        participant.jobPerformance = [] # Clear previous values to ensure update
+        participant.jobPerformance = [float(perf_scores["JobPerformance"])]
+
+    if "AcademicPerformance" in perf_scores:
+        if log:
+            print(f"   🔄 Updating AcademicPerformance to: {perf_scores['AcademicPerformance']}")
+        participant.academicPerformance = [] # Clear previous values to ensure update
+        participant.academicPerformance = [float(perf_scores["AcademicPerformance"])]
+
+    # Ensure hasScore is a list
+    if not hasattr(assessment, 'hasScore') or assessment.hasScore is None:
+        assessment.hasScore = []
+
+    # Build expected set of trait score individuals, reusing by name
+    expected_scores = []
+    for trait, value in numeric_percentages.items():
+        name = f"Score_{user_id}_{trait}"
+        ts = get_or_create_singleton(onto.TraitScore, name, log=log)
+        ts.meanScore = [value]
+
+        if trait not in trait_objects:
+            trait_objects[trait] = onto.search_one(name=trait)
+        trait_obj = trait_objects[trait]
+        if trait_obj:
+            ts.scoresOnTrait = [trait_obj]
+
+        expected_scores.append(ts)
+
+    # Replace assessment.hasScore with expected set (no destroys) and persist
+    assessment.hasScore = expected_scores
+
+    # Attach justification report (None clears it, e.g. bulk imports without narratives)
+    participant.hasJustificationReport = []
+    if justification_report is not None:
+        participant.hasJustificationReport = [justification_report]
+        if log:
+            print(f"   📝 Justification attached (len={len(participant.hasJustificationReport)}): {participant.hasJustificationReport[-1][:120]}...")
+
+    # New scores invalidate any stored analysis; it is regenerated through the analysis stream
+    if getattr(participant, "hasAnalysisReport", None):
+        participant.hasAnalysisReport = []
+
+    # Naive UTC timestamp drives the since/cursor filters of the results export
+    updated_at = datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None)
+    participant.resultUpdatedAt = [updated_at]
+
+    # Move this participant from their previous scores to the new ones in the running norms
+    population_norms.replace(previous_percentages, numeric_percentages)
+    similarity_index.upsert(user_id, numeric_percentages)
+    result_store.upsert(user_id, numeric_percentages, {
+        "JobPerformance": participant.jobPerformance[-1] if participant.jobPerformance else None,
+        "AcademicPerformance": participant.academicPerformance[-1] if participant.academicPerformance else None,
+    }, updated_at)
+    return participant
+
+
+def capture_assessment_entities(undo, user_id, numeric_percentages):
+    """Record the individuals store_assessment_result may create or change for user_id."""
+    undo.capture(onto.Participant, f"Participant_{user_id}")
+    undo.capture(onto.Assessment, f"Assessment_{user_id}")
+    for trait in numeric_percentages:
+        undo.capture(onto.TraitScore, f"Score_{user_id}_{trait}")
+
+
 def get_participant_display_name(participant):
     """Resolve the participant's display name safely across ontology variants."""
     try:
@@ -419,116 +1171,236 @@ def get_participant_display_name(participant):
 
 def extract_trait_percentages_for_participant(user_id):
     """Return Big Five trait percentages for the participant, reading the latest ontology state."""
-    scores = {}
     assessment = find_entity_by_id(onto.Assessment, f"Assessment_{user_id}") if hasattr(onto, "Assessment") else None
-    trait_scores = []
+    if assessment is not None:
+        return ontology_queries.trait_scores(assessment)
+    return trait_percentages(list(entity_index.trait_scores(user_id).values()))
+
 
+def read_participant_record(user_id, participant):
+    """Performance, reports, label and trait scores of one participant from one prepared query.
+
+    Participants without an Assessment individual fall back to their Score_<id>_<Trait> scores.
+    """
+    # The index covers every Assessment, so this skips find_entity_by_id's class lookups
+    assessment = entity_index.assessment(user_id)
+    record = ontology_queries.participant_record(participant, assessment)
+    if record["scores"] is None:
+        record["scores"] = trait_percentages(list(entity_index.trait_scores(user_id).values()))
+    return record
+
+
+def record_display_name(participant, record):
+    """get_participant_display_name for a participant whose record is already read."""
+    return record["label"] if record["label"] is not None else getattr(participant, "name", "Participant")
+
+
+def stored_trait_percentages(user_id):
+    """Same as extract_trait_percentages_for_participant, resolved through the entity index only.
+
+    Safe while a new World is being loaded, before the global onto points at it. Reads the
+    entities directly, so rebuilding norms or the similarity index never prepares SPARQL.
+    """
+    assessment = entity_index.assessment(user_id)
     if assessment and hasattr(assessment, "hasScore"):
-        trait_scores = list(assessment.hasScore or [])
-    else:
-        try:
-            trait_scores = [ts for ts in onto.TraitScore.instances() if ts.name.startswith(f"Score_{user_id}_")]
-        except Exception:
-            trait_scores = []
+        return trait_percentages(list(assessment.hasScore or []))
+    return trait_percentages(list(entity_index.trait_scores(user_id).values()))
+
 
+def trait_percentages(trait_scores):
+    """{trait: percentage} out of TraitScore individuals (trait taken from the Score_<id>_<Trait> name)."""
+    scores = {}
     for ts in trait_scores:
         try:
             val = 0.0
             if hasattr(ts, "meanScore") and ts.meanScore:
                 val = float(ts.meanScore[0])
-            trait_name = ts.name.split('_')[-1] if '_' in ts.name else (
-                ts.scoresOnTrait[0].name if hasattr(ts, "scoresOnTrait") and ts.scoresOnTrait else "Trait"
-            )
-            scores[trait_name] = val
+            trait = ts.scoresOnTrait[0] if "_" not in ts.name and getattr(ts, "scoresOnTrait", None) else None
+            scores[score_trait_name(ts, trait)] = val
         except Exception:
             continue
 
     return scores
 
 
-def score_role_fit(trait_scores):
-    """Compute per-role fit scores using ROLE_BLUEPRINTS and return detailed breakdown."""
-    role_results = {}
-    for role_name, cfg in ROLE_BLUEPRINTS.items():
-        total_weight = sum(meta.get("weight", 0.0) for meta in cfg.get("trait_targets", {}).values()) or 1.0
-        contributions = []
-        weighted_sum = 0.0
-
-        for trait_label, meta in cfg.get("trait_targets", {}).items():
-            target = meta.get("target", 70)
-            weight = meta.get("weight", 0.1)
-            actual = float(trait_scores.get(trait_label, 0.0))
-            proximity = max(0.0, 1.0 - abs(actual - target) / 100.0)
-            weighted = proximity * weight
-            weighted_sum += weighted
-            contributions.append({
-                "trait": trait_label,
-                "actual": round(actual, 2),
-                "target": target,
-                "weight": weight,
-                "closeness": round(proximity * 100, 2),
-            })
+def score_role_fit(trait_scores, top_k=None):
+    """Per-role fit scores with a detailed breakdown for every role, or only the top_k best.
 
-        overall = round(max(0.0, min(100.0, (weighted_sum / total_weight) * 100)), 2)
-        role_results[role_name] = {
-            "score": overall,
-            "contributions": sorted(contributions, key=lambda c: c["closeness"], reverse=True),
-        }
+    Returns (role_results, ranking): role_results in catalog order, ranking best first.
+    """
+    return role_catalog.fit(trait_scores, top_k)
 
-    ranking = sorted(role_results.keys(), key=lambda k: role_results[k]["score"], reverse=True)
-    return role_results, ranking
 
+def score_role_fit_batch(trait_rows, participant_ids=None, top_k=DEFAULT_BATCH_TOP_K, trait_matrix=None):
+    """Score N trait vectors against every role in one pass.
 
-ROLE_TRAIT_SKILL_GAPS = {
-    "Software Engineer": {
-        "Conscientiousness": ["Task Planning", "Test-Driven Development"],
-        "Openness": ["System Design Patterns", "Technical Architecture"],
-        "Neuroticism": ["Stress Management", "Incident Response Playbooks"],
-        "Extraversion": ["Stakeholder Communication", "Team Demos"],
-        "Agreeableness": ["Code Review Facilitation", "Pair Programming"],
-    },
-    "Manager": {
-        "Extraversion": ["Executive Presence", "Facilitation"],
-        "Agreeableness": ["Conflict Mediation", "Coaching"],
-        "Conscientiousness": ["Operational Cadence", "Prioritization"],
-        "Openness": ["Strategic Framing", "Innovation Workshops"],
-        "Neuroticism": ["Emotional Regulation", "Resilience Training"],
-    },
-    "Researcher": {
-        "Openness": ["Exploratory Research Methods", "Creative Prototyping"],
-        "Conscientiousness": ["Study Planning", "Documentation Rigor"],
-        "Extraversion": ["Conference Presentations", "Interviewing"],
-        "Agreeableness": ["Cross-team Collaboration", "Stakeholder Alignment"],
-        "Neuroticism": ["Experiment Recovery Plans", "Mindfulness"],
-    },
-}
+    trait_rows are {trait: percentage} dicts; pass an (N, T) trait_matrix in role-catalog trait
+    order instead to skip the conversion. Returns per-participant scores and rankings plus the
+    top_k participants for each role. Scores and rankings are identical to calling
+    score_role_fit on each vector.
+    """
+    matrix = role_catalog.matrix
+    X = trait_matrix if trait_matrix is not None else matrix.trait_matrix(trait_rows)
+    ids = list(participant_ids) if participant_ids is not None else list(range(X.shape[0]))
+    roles = matrix.roles
+    if not X.shape[0]:
+        return {"roles": list(roles), "participants": [], "top_by_role": {role: [] for role in roles}}
+
+    scores = matrix.scores(X)
+    rankings = matrix.rankings(scores)
+    score_rows = scores.tolist()
+
+    participants = []
+    for i, pid in enumerate(ids):
+        ranking = [
+            {"role": roles[r], "score": score_rows[i][r], "position": pos + 1}
+            for pos, r in enumerate(rankings[i].tolist())
+        ]
+        participants.append({
+            "id": pid,
+            "scores": {role: score_rows[i][r] for r, role in enumerate(roles)},
+            "ranking": ranking,
+            "top_recommendation": ranking[0]["role"] if ranking else None,
+        })
+
+    top_by_role = {}
+    for r, (role, rows) in enumerate(matrix.top_participants(scores, top_k).items()):
+        top_by_role[role] = [
+            {"id": ids[i], "score": score_rows[i][r], "position": pos + 1}
+            for pos, i in enumerate(rows)
+        ]
+
+    return {"roles": list(roles), "participants": participants, "top_by_role": top_by_role}
+
+
+def export_participant(user_id):
+    """Resolve the participant individual for a scored user id, if there is one."""
+    return entity_index.participant(user_id) or entity_index.participant_by_id(user_id)
+
+
+def export_sort_keys(since=None, cursor=None):
+    """(timestamp, user_id) keys of scored participants matching the filters, oldest first.
+
+    Participants written before timestamps were recorded sort first with an empty timestamp,
+    so they appear in a full export but never after a since/cursor filter.
+    """
+    keys = []
+    # The result store mirrors every scored participant's resultUpdatedAt, so no entity is read
+    for key in result_store.updated_keys():
+        if since is not None and key[0] < since:
+            continue
+        if cursor is not None and key <= cursor:
+            continue
+        keys.append(key)
+    keys.sort()
+    return keys
+
+
+def export_records(keys, include_justification=False):
+    """Build export records for a chunk of sort keys (call under the read lock)."""
+    user_ids, trait_rows, records = [], [], []
+    for key in keys:
+        user_id = key[1]
+        participant = export_participant(user_id)
+        stored = read_participant_record(user_id, participant) if participant is not None else None
+        record = {
+            "id": user_id,
+            "name": record_display_name(participant, stored) if stored is not None else None,
+            "updated_at": f"{key[0]}Z" if key[0] else None,
+            "scores": stored["scores"] if stored is not None else extract_trait_percentages_for_participant(user_id),
+            "performance": None,
+        }
+        if stored is not None:
+            record["performance"] = {
+                "JobPerformance": round(float(stored["job"]), 2) if stored["job"] is not None else None,
+                "AcademicPerformance": round(float(stored["academic"]), 2) if stored["academic"] is not None else None,
+            }
+        if include_justification:
+            reports = stored["justification"] if stored is not None else None
+            record["justification"] = str(reports) if reports else None
+        record["cursor"] = result_export.encode_cursor(key)
+        user_ids.append(user_id)
+        trait_rows.append(record["scores"])
+        records.append(record)
+
+    # Role fit for the whole chunk in one vectorized pass (identical to score_role_fit)
+    if records:
+        matrix = role_catalog.matrix
+        fit_rows = matrix.scores(matrix.trait_matrix(trait_rows)).tolist()
+        for record, fit in zip(records, fit_rows):
+            record["role_fit"] = dict(zip(matrix.roles, fit))
+    return records
+
+
+def iter_results_export(fmt="ndjson", since=None, cursor=None, include_justification=False, chunk_size=None):
+    """Yield the results export line by line, reading EXPORT_CHUNK_SIZE participants at a time.
+
+    Only the (timestamp, user_id) sort keys are held for the whole export; records are built
+    per chunk under the read lock, so writers are never blocked for the whole transfer.
+    Every record carries an opaque cursor: pass the last one back to resume after it.
+    """
+    chunk_size = chunk_size or EXPORT_CHUNK_SIZE
+    traits = scoring_engine.traits if scoring_engine is not None else ()
+    roles = role_catalog.roles
+    with ontology_snapshot():
+        keys = export_sort_keys(since, cursor)
+    if fmt == "csv":
+        yield result_export.csv_line(result_export.csv_columns(traits, roles, include_justification))
+    for start in range(0, len(keys), chunk_size):
+        with ontology_snapshot():
+            records = export_records(keys[start:start + chunk_size], include_justification)
+        for record in records:
+            if fmt == "csv":
+                yield result_export.csv_row(record, traits, roles, include_justification)
+            else:
+                yield result_export.ndjson_line(record)
 
 
 def suggest_skill_gaps(role_name, contributions):
     """Pick two skills to develop based on the weakest contributing traits."""
-    ordered = sorted(contributions, key=lambda c: c["closeness"])
-    skills = []
-    for item in ordered:
-        trait = item.get("trait")
-        trait_skills = ROLE_TRAIT_SKILL_GAPS.get(role_name, {}).get(trait, [])
-        for skill in trait_skills:
-            if skill not in skills:
-                skills.append(skill)
-            if len(skills) >= 2:
-                return skills[:2]
+    return role_catalog.suggest_skill_gaps(role_name, contributions)
+
 
-    fallback = ROLE_BLUEPRINTS.get(role_name, {}).get("skills", [])
-    for skill in fallback:
-        if skill not in skills:
-            skills.append(skill)
-        if len(skills) >= 2:
-            break
+def counterfactual_engine(trait_scores):
+    """CounterfactualEngine for one participant, stepping traits by single answer points."""
+    engine = scoring_engine
+    steps = engine.trait_steps() if engine is not None else {}
+    low, high = engine.percentage_range() if engine is not None else (20.0, 100.0)
+    return CounterfactualEngine(role_catalog.matrix, trait_scores, steps, low, high)
 
-    return skills[:2]
 
+@tracer.timed("counterfactual")
+def role_counterfactuals(trait_scores, roles, target_score=None, max_states=COUNTERFACTUAL_MAX_STATES):
+    """{role: what_if} with the cheapest change to rank each role first, per-trait marginal gains
+    and, when target_score is given, the cheapest change to reach it.
 
-def build_counterfactual_insight(contributions):
-    """Summarize which trait lifts would raise the role score most."""
+    rank_first is None when no plan was found within max_states search expansions.
+    """
+    engine = counterfactual_engine(trait_scores)
+    what_if = {}
+    for role in roles:
+        entry = {
+            "rank_first": engine.plan_rank_first(role, max_states=max_states),
+            "trait_gains": engine.trait_gains(role),
+        }
+        if target_score is not None:
+            entry["reach_score"] = engine.plan_score(role, target_score)
+        what_if[role] = entry
+    return what_if
+
+
+def build_counterfactual_insight(contributions, plan=None):
+    """Summarize the smallest trait change that makes the role the top fit, or which lifts help most."""
+    if plan is not None:
+        if not plan["answer_points"]:
+            return "Already your strongest fit; keep your current trait balance."
+        moves = [
+            f"{'increase' if delta > 0 else 'reduce'} {trait} by {abs(delta)} points"
+            for trait, delta in plan["changes"].items()
+        ]
+        points = plan["answer_points"]
+        return (f"{' and '.join(moves)} ({points} answer point{'s' if points != 1 else ''}) to make this your top role "
+                f"(fit {plan['score_before']} -> {plan['score_after']})")
     weakest = sorted(contributions, key=lambda c: c["closeness"])[:2]
     parts = []
     for item in weakest:
@@ -541,14 +1413,26 @@ def build_counterfactual_insight(contributions):
     return "; ".join(parts) if parts else "Maintain current balance to keep this fit strong."
 
 
-def persist_role_fit_scores(participant, role_results):
-    """Store role fit scores on the participant using the roleFitScore data property."""
+def role_fit_score_values(trait_scores):
+    """The "role:score" roleFitScore literals of every catalog role, whatever top_k was explained."""
+    if not role_catalog.roles:
+        return []
+    return [f"{role}:{score}" for role, score in zip(role_catalog.roles, role_catalog.score_row(trait_scores).tolist())]
+
+
+def persist_role_fit_scores(participant, values):
+    """Store role_fit_score_values on the participant using the roleFitScore data property.
+
+    Returns False without touching the participant when the stored values already match.
+    """
     try:
-        participant.roleFitScore = []
-        for role, info in role_results.items():
-            participant.roleFitScore.append(f"{role}:{info.get('score', 0)}")
+        if set(getattr(participant, "roleFitScore", None) or []) == set(values):
+            return False
+        participant.roleFitScore = values
+        return True
     except Exception as exc:
         print(f"⚠️ Could not persist role fit scores: {exc}")
+        return False
 
 
 def generate_role_explanations(name, trait_scores, role_results):
@@ -561,7 +1445,7 @@ def generate_role_explanations(name, trait_scores, role_results):
                 "explanation": f"Role fit at {info['score']}%. Strongest traits: {', '.join([c['trait'] for c in info['contributions'][:2]])}.",
                 "strengths": [c["trait"] for c in info.get("contributions", [])[:2]],
                 "challenges": [c["trait"] for c in info.get("contributions", [])[-2:]],
-                "counterfactual": build_counterfactual_insight(info.get("contributions", [])),
+                "counterfactual": build_counterfactual_insight(info.get("contributions", []), info.get("rank_first")),
                 "skill_gaps": suggest_skill_gaps(role, info.get("contributions", [])),
             }
         return mapped
@@ -580,19 +1464,20 @@ You are a concise career coach. Summarize role fit for {name} using the provided
 
 Trait scores (0-100): {trait_scores}
 Role fit scores: { {k: v['score'] for k, v in role_results.items()} }
+Smallest trait changes (percentage points) that would make each role the top fit: { {k: (v.get('rank_first') or {}).get('changes') for k, v in role_results.items()} }
 
-For each role (Software Engineer, Manager, Researcher), produce JSON with keys:
+For each role ({', '.join(role_results)}), produce JSON with keys:
 - role: role name
 - explanation: 2-3 sentences on why it fits or not (mention strengths and challenges)
 - strengths: array of 2 short bullet phrases
 - challenges: array of 2 short bullet phrases
-- counterfactual: one sentence on which trait change would most increase fit
+- counterfactual: one sentence on which trait change would most increase fit (use the smallest changes above)
 - skill_gaps: array of 2 skill recommendations to grow fit
 
 Keep total output compact and strictly valid JSON array.
 """
 
-    try:
+    def generate():
         completion = client.chat.completions.create(
             model="llama-3.3-70b-versatile",
             messages=[
@@ -616,9 +1501,22 @@ Keep total output compact and strictly valid JSON array.
                 "skill_gaps": item.get("skill_gaps", []),
             }
         return mapped
+
+    try:
+        cache_inputs = {
+            "name": name,
+            "traits": trait_scores,
+            "roles": {k: v.get("score") for k, v in role_results.items()},
+            "rank_first": {k: (v.get("rank_first") or {}).get("changes") for k, v in role_results.items()},
+        }
+        return cached_llm_call("role_explanations", cache_inputs, generate)
     except Exception as exc:
         print(f"⚠️ Groq role explanation fallback: {exc}")
-        return build_fallback_explanations()
+        # Marked so the response is not cached: the next request should try Groq again
+        fallback = build_fallback_explanations()
+        for explanation in fallback.values():
+            explanation["transient"] = True
+        return fallback
 
 def calculate_performance_scores(final_scores):
     job_perf = 3.0
@@ -642,11 +1540,185 @@ def calculate_performance_scores(final_scores):
         "AcademicPerformance": round(max(20, min(100, (acad_perf/5)*100)), 2)
     }
 
-def get_groq_suggestions(scores, name):
-    if not client:
-        return "AI analysis unavailable - Groq API key not configured. Please set GROQ_API_KEY environment variable."
-    
-    prompt = f"""
+def answer_validation_error(answers):
+    """Return the first problem with an answers mapping (values must be integers 1-5), or None."""
+    for q_id, value in answers.items():
+        try:
+            val = int(value)
+            if val < 1 or val > 5:
+                return f"Answer for question {q_id} must be between 1 and 5"
+        except (ValueError, TypeError):
+            return f"Invalid answer value for question {q_id}"
+    return None
+
+
+def validate_import_record(record):
+    """Normalize one bulk-import record to (user_id, name, answers) or raise ValueError."""
+    user_id = normalize_user_id(record.get("id"))
+    user_name = str(record.get("name") or "").strip()
+    answers = record.get("answers")
+    if not user_id:
+        raise ValueError("User ID is required")
+    if not user_name:
+        raise ValueError("Name is required")
+    if not answers or not isinstance(answers, dict):
+        raise ValueError("Answers are required")
+    answer_error = answer_validation_error(answers)
+    if answer_error:
+        raise ValueError(answer_error)
+    return user_id, user_name, answers
+
+
+def import_assessments(records, chunk_size=None, narratives=False):
+    """Score and store a stream of (line_no, record, error) tuples from bulk_import.iter_records.
+
+    Records go through the same scoring and calculate_performance_scores as submit_assessment,
+    chunk by chunk, so memory stays flat. Each chunk is written and persisted under the write
+    lock, so a rollback by a concurrent failing request never drops chunks already counted as
+    imported, and a failed chunk is rolled back on its own while the chunks before it are kept.
+    Justification narratives are generated only when narratives is true; otherwise they are
+    cleared and the AI analysis stays available on demand through /api/analysis/stream. Invalid
+    records are reported, never fatal.
+    """
+    chunk_size = chunk_size or IMPORT_CHUNK_SIZE
+    started = time.perf_counter()
+    report = {"records": 0, "imported": 0, "failed": 0, "errors": []}
+
+    def record_error(line_no, user_id, message):
+        report["failed"] += 1
+        if len(report["errors"]) < MAX_IMPORT_ERRORS_REPORTED:
+            report["errors"].append({"line": line_no, "id": user_id, "error": message})
+
+    refresh_ontology()
+    try:
+        import_chunks(records, chunk_size, narratives, report, record_error)
+    finally:
+        participant_responses.clear()
+
+    elapsed = time.perf_counter() - started
+    report["seconds"] = round(elapsed, 3)
+    report["records_per_second"] = round(report["records"] / elapsed, 1) if elapsed else None
+    return report
+
+
+def import_chunks(records, chunk_size, narratives, report, record_error):
+    """Validate, score and write records chunk by chunk (see import_assessments)."""
+    global onto
+    trait_objects, trait_world = {}, None
+    for chunk in bulk_import.chunked(records, chunk_size):
+        valid = []
+        for line_no, record, error in chunk:
+            report["records"] += 1
+            if error:
+                record_error(line_no, None, error)
+                continue
+            try:
+                valid.append((line_no,) + validate_import_record(record))
+            except ValueError as exc:
+                record_error(line_no, record.get("id"), str(exc))
+
+        score_errors = {}
+        scored = scoring_engine.score_batch([answers for _, _, _, answers in valid], score_errors)
+        rows = []
+        for idx, (line_no, user_id, user_name, answers) in enumerate(valid):
+            if idx in score_errors:
+                record_error(line_no, user_id, score_errors[idx])
+                continue
+            raw_scores, numeric_percentages, _formatted = scored[idx]
+            rows.append([user_id, user_name, numeric_percentages, calculate_performance_scores(raw_scores), None, answers])
+
+        if narratives:
+            # One wave per worker pool so each wave gets the full LLM deadline
+            fallback = "Justification could not be generated at this time."
+            for wave in bulk_import.chunked(rows, LLM_MAX_WORKERS):
+                results = run_llm_calls({
+                    idx: (generate_justification_report, (row[2], row[3], scoring_engine.answered_questions(row[5])), fallback)
+                    for idx, row in enumerate(wave)
+                })
+                for idx, row in enumerate(wave):
+                    row[4] = results[idx] or "Justification not available."
+
+        if rows:
+            with ontology_lock.write_locked():
+                if onto.world is not trait_world:
+                    # A concurrent rollback bound a new World; cached Traits belong to the old one
+                    trait_objects, trait_world = {}, onto.world
+                undo = OntologyUndo(find_entity_by_id, entity_index.forget)
+                try:
+                    for user_id, _name, numeric_percentages, _perf, _justification, _answers in rows:
+                        capture_assessment_entities(undo, user_id, numeric_percentages)
+                    with onto:
+                        for user_id, user_name, numeric_percentages, perf_scores, justification, _answers in rows:
+                            store_assessment_result(user_id, user_name, numeric_percentages, perf_scores, justification, trait_objects, log=False)
+                    # Persisted before the lock is released: rollback_ontology re-parses project.rdf
+                    # (or drops the open quadstore transaction) and would lose an unsaved chunk
+                    persist_ontology(onto)
+                except Exception:
+                    onto = rollback_ontology(undo)
+                    raise
+            report["imported"] += len(rows)
+        print(f"📥 Imported {report['imported']}/{report['records']} records")
+
+
+def run_llm_calls(calls, deadline_seconds=None):
+    """Run independent LLM generations concurrently and collect them before a shared deadline.
+
+    calls maps a key to (func, args, fallback). Each func is called with timeout=<deadline> so
+    the HTTP request itself is bounded too. A call that raises or misses the deadline yields its
+    fallback without holding up the others.
+    """
+    deadline_seconds = LLM_DEADLINE_SECONDS if deadline_seconds is None else deadline_seconds
+    deadline = time.monotonic() + deadline_seconds
+    futures = {
+        key: llm_executor.submit(tracer.bind(func), *args, timeout=deadline_seconds)
+        for key, (func, args, _fallback) in calls.items()
+    }
+
+    results = {}
+    for key, future in futures.items():
+        fallback = calls[key][2]
+        try:
+            results[key] = future.result(timeout=max(0.0, deadline - time.monotonic()))
+        except FuturesTimeout:
+            future.cancel()
+            print(f"⏱️ LLM call '{key}' missed the {deadline_seconds}s deadline; using fallback")
+            llm_fallbacks_total.inc(key, "deadline")
+            results[key] = fallback
+        except Exception as exc:
+            print(f"⚠️ LLM call '{key}' failed: {exc}")
+            llm_fallbacks_total.inc(key, "error")
+            results[key] = fallback
+    return results
+
+
+def groq_request_options(timeout=None):
+    """Per-request keyword arguments for the Groq client (only a timeout for now)."""
+    return {"timeout": timeout} if timeout else {}
+
+
+def normalize_llm_inputs(value):
+    """Canonical form of prompt inputs for cache keys: rounded floats, stripped strings, sorted keys."""
+    if isinstance(value, dict):
+        return {str(k): normalize_llm_inputs(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [normalize_llm_inputs(v) for v in value]
+    if isinstance(value, float):
+        return round(value, 2)
+    if isinstance(value, str):
+        return value.strip()
+    return value
+
+
+def cached_llm_call(kind, inputs, generate):
+    """Serve an LLM generation from llm_cache, calling generate() only on a miss."""
+    def timed_generate():
+        with tracer.span(f"llm:{kind}"):
+            return generate()
+    return llm_cache.get_or_create(kind, LLM_PROMPT_VERSIONS[kind], normalize_llm_inputs(inputs), timed_generate)
+
+
+def build_analysis_prompt(scores, name):
+    return f"""
         Act as an expert Industrial-Organizational Psychologist and Personality Profiler. 
         Analyze the personality of '{name}' based on the following Big Five trait scores (scale 0-100%):
         {scores}
@@ -676,17 +1748,86 @@ def get_groq_suggestions(scores, name):
         2.  **[Strategy 2]:** [Actionable advice]
         3.  **[Strategy 3]:** [Actionable advice]
     """
-    try:
+
+
+def get_groq_suggestions(scores, name, timeout=None):
+    if not client:
+        return ANALYSIS_UNAVAILABLE_MESSAGE
+
+    prompt = build_analysis_prompt(scores, name)
+
+    def generate():
         chat_completion = client.chat.completions.create(
             messages=[{"role": "user", "content": prompt}],
             model="llama-3.3-70b-versatile",
+            **groq_request_options(timeout),
         )
         return chat_completion.choices[0].message.content
+
+    try:
+        return cached_llm_call("analysis", {"name": name, "scores": scores}, generate)
     except Exception as e:
         return f"Error getting suggestions: {str(e)}"
 
 
-def generate_justification_report(big_five_scores, performance_predictions, answered_questions):
+def stream_groq_suggestions(scores, name, timeout=None):
+    """Yield the analysis as text deltas from a streaming Groq completion.
+
+    A cached analysis is yielded as a single chunk; a freshly streamed one is cached once the
+    stream completes. Errors propagate so the caller can report them to the client.
+    """
+    if not client:
+        yield ANALYSIS_UNAVAILABLE_MESSAGE
+        return
+
+    key = llm_cache.make_key("analysis", LLM_PROMPT_VERSIONS["analysis"], normalize_llm_inputs({"name": name, "scores": scores}))
+    cached = llm_cache.get(key)
+    if cached is not None:
+        yield cached
+        return
+
+    started = time.perf_counter()
+    stream = client.chat.completions.create(
+        messages=[{"role": "user", "content": build_analysis_prompt(scores, name)}],
+        model="llama-3.3-70b-versatile",
+        stream=True,
+        **groq_request_options(timeout),
+    )
+    parts = []
+    for chunk in stream:
+        if not chunk.choices:
+            continue
+        delta = chunk.choices[0].delta.content
+        if delta:
+            parts.append(delta)
+            yield delta
+    # Streamed after the request's own timing ends, so only the span histogram sees it
+    tracer.record("llm:analysis_stream", time.perf_counter() - started)
+    if parts:
+        llm_cache.set(key, "".join(parts))
+
+
+def store_analysis_report(user_id, text):
+    """Persist the finished analysis on the participant once its stream has completed."""
+    undo = OntologyUndo(find_entity_by_id, entity_index.forget)
+    with ontology_transaction(undo) as o:
+        undo.capture(o.Participant, f"Participant_{user_id}")
+        participant = find_entity_by_id(o.Participant, f"Participant_{user_id}")
+        if not participant:
+            return False
+        with o:
+            participant.hasAnalysisReport = [text]
+        persist_ontology(o)
+    participant_responses.invalidate(user_id)
+    return True
+
+
+def sse_event(event, payload):
+    """Format one Server-Sent Events message with a JSON data line."""
+    return f"event: {event}\ndata: {json.dumps(payload)}\n\n"
+
+
+def generate_justification_report(big_five_scores, performance_predictions, answered_questions, timeout=None):
     """Generate an explainable justification report via Groq."""
     if not client:
         return "Groq API key not configured; justification unavailable."
@@ -724,7 +1865,7 @@ RESPONSE STRUCTURE (keep this order):
 4. Plain-English Summary
 """
 
-    try:
+    def generate():
         completion = client.chat.completions.create(
             model="llama-3.3-70b-versatile",
             messages=[
@@ -732,12 +1873,40 @@ RESPONSE STRUCTURE (keep this order):
                 {"role": "user", "content": user_instructions},
             ],
             temperature=0.4,
+            **groq_request_options(timeout),
         )
         return completion.choices[0].message.content
+
+    try:
+        cache_inputs = {
+            "scores": big_five_scores,
+            "performance": performance_predictions,
+            "questions": question_lines,
+        }
+        return cached_llm_call("justification", cache_inputs, generate)
     except Exception as exc:
         print(f"❌ ERROR generating justification: {exc}")
         return "Justification could not be generated at this time."
 
+boot_started = time.perf_counter()
+onto = load_ontology()
+startup_timings["startup_ms"] = round((time.perf_counter() - boot_started) * 1000, 1)
+print(f"🚀 Ontology ready in {startup_timings['startup_ms']} ms")
+
+
+def warm_ontology_queries():
+    """Prepare the SPARQL reads off the request path; the first prepare initialises the engine."""
+    started = time.perf_counter()
+    try:
+        with ontology_snapshot():
+            count = ontology_queries.warm()
+        print(f"🔎 Prepared {count} SPARQL queries in {round((time.perf_counter() - started) * 1000, 1)} ms")
+    except Exception as exc:
+        print(f"⚠️ Could not prepare SPARQL queries: {exc}")
+
+
+threading.Thread(target=warm_ontology_queries, name="sparql-warmup", daemon=True).start()
+
 # --- ROUTES ---
 
 @app.route('/')
@@ -745,6 +1914,11 @@ def landing():
     return jsonify({"status": "ok", "message": "API server is running. Frontend served by Vite on port 5173."})
 
 
+@app.before_request
+def start_request_trace():
+    tracer.start_trace()
+
+
 @app.before_request
 def handle_preflight():
     if request.method == 'OPTIONS':
@@ -755,6 +1929,23 @@ def handle_preflight():
         return resp
 
 
+@app.after_request
+def record_request_metrics(response):
+    """Count and time the request; log the span breakdown of slow ones."""
+    trace = tracer.end_trace()
+    if trace is None:
+        return response
+    elapsed = trace.elapsed()
+    # The URL rule (not the path) keeps label cardinality bounded
+    route = request.url_rule.rule if request.url_rule is not None else "<unmatched>"
+    http_requests_total.inc(request.method, route, str(response.status_code))
+    http_request_duration.observe(elapsed, request.method, route)
+    if SLOW_REQUEST_MS > 0 and elapsed * 1000 >= SLOW_REQUEST_MS:
+        slow_requests_total.inc(route)
+        print(f"🐢 Slow request {request.method} {request.path} -> {response.status_code} in {elapsed * 1000:.1f} ms: {trace.breakdown() or 'no spans'}")
+    return response
+
+
 @app.after_request
 def add_cors_headers(response):
     response.headers['Access-Control-Allow-Origin'] = ALLOWED_FRONTEND_ORIGIN
@@ -762,75 +1953,81 @@ def add_cors_headers(response):
     response.headers['Access-Control-Allow-Methods'] = 'GET, POST, OPTIONS'
     return response
 
+def cached_participant_response(user_id, variant, render, deps=()):
+    """Serve a per-participant GET from participant_responses, calling render() only on a miss.
+
+    render() returns what a view would; only 200 responses without Cache-Control: no-store are
+    kept. The ETag is a hash of the body, so it stays valid across restarts, and a matching
+    If-None-Match gets an empty 304.
+    """
+    # Pick up external edits first: a new World clears the cache
+    refresh_ontology()
+    entry = participant_responses.get(user_id, variant, deps)
+    if entry is None:
+        version = participant_responses.version(user_id)
+        resp = app.make_response(render())
+        if resp.status_code != 200 or "no-store" in resp.headers.get("Cache-Control", ""):
+            return resp
+        entry = participant_responses.put(user_id, variant, version, resp.get_data(), resp.status_code, resp.mimetype, deps)
+    if request.if_none_match.contains(entry.etag):
+        resp = app.response_class(status=304)
+    else:
+        resp = app.response_class(entry.body, status=entry.status, mimetype=entry.mimetype)
+    resp.set_etag(entry.etag)
+    resp.headers['Cache-Control'] = 'no-cache'
+    return resp
+
+
 @app.route('/get_previous_result', methods=['GET'])
 def get_previous_result():
-    global onto
     user_id = normalize_user_id(request.args.get('id'))
     if not user_id:
         return jsonify({"found": False, "message": "id is required"}), 400
+    # The response embeds population norms, which move with every submit
+    return cached_participant_response(user_id, "previous_result", lambda: previous_result_response(user_id),
+                                       deps=(population_norms.revision,))
+
 
+def previous_result_response(user_id):
     try:
         # Ensure we read latest ontology state
-        onto = load_ontology(force_reload=True)
-        
-        participant = None
-        
-        # 1. Priority: Search by canonical IRI (Participant_{user_id})
-        # This is the one we write to in submit_assessment
-        participant = find_entity_by_id(onto.Participant, f"Participant_{user_id}")
-        
-        # 2. Fallback: Search by participantID property
-        if not participant and hasattr(onto, "Participant"):
-            print(f"⚠️ Canonical Participant_{user_id} not found. Searching by ID property...")
-            for p in onto.Participant.instances():
-                if hasattr(p, "participantID") and p.participantID and str(p.participantID[0]) == user_id:
-                    participant = p
-                    break
-        
-        if not participant:
-            print(f"❌ Participant_{user_id} not found in ontology.")
-            return jsonify({"found": False, "message": "not found"}), 200
-
-        print(f"✅ Found participant: {participant.name} (IRI: {participant.iri})")
-
-        # Performance scores (stored on participant)
-        # Use the last value in the list if multiple exist, but we expect only one after cleanup
-        job_perf = 0.0
-        if hasattr(participant, 'jobPerformance') and participant.jobPerformance:
-            job_perf = float(participant.jobPerformance[-1]) # Take last added
-            print(f"   JobPerformance: {participant.jobPerformance}")
-
-        acad_perf = 0.0
-        if hasattr(participant, 'academicPerformance') and participant.academicPerformance:
-            acad_perf = float(participant.academicPerformance[-1]) # Take last added
-            print(f"   AcademicPerformance: {participant.academicPerformance}")
-
-        # Try to find assessment and trait scores
-        assessment = find_entity_by_id(onto.Assessment, f"Assessment_{user_id}")
-        scores = {}
-        trait_scores = []
-        if assessment and hasattr(assessment, 'hasScore'):
-            trait_scores = list(assessment.hasScore)
-        else:
-            # fallback: search trait scores by naming pattern
-            trait_scores = [ts for ts in onto.TraitScore.instances() if ts.name.startswith(f"Score_{user_id}_")]
-
-        for ts in trait_scores:
-            val = 0.0
-            if hasattr(ts, 'meanScore') and ts.meanScore:
-                val = float(ts.meanScore[0])
-            trait_name = ts.name.split('_')[-1] if '_' in ts.name else (ts.scoresOnTrait[0].name if hasattr(ts, 'scoresOnTrait') and ts.scoresOnTrait else 'Trait')
-            scores[trait_name] = f"{round(val, 2)}%"
-
-        return jsonify({
-            "found": True,
-            "scores": scores,
-            "performance": {
-                "JobPerformance": round(job_perf, 2),
-                "AcademicPerformance": round(acad_perf, 2)
-            },
-            "analysis": ""  # analysis is not stored; left blank
-        })
+        with ontology_snapshot():
+            participant = None
+
+            # 1. Priority: Search by canonical IRI (Participant_{user_id})
+            # This is the one we write to in submit_assessment
+            participant = find_entity_by_id(onto.Participant, f"Participant_{user_id}")
+
+            # 2. Fallback: Search by participantID property
+            if not participant and hasattr(onto, "Participant"):
+                print(f"⚠️ Canonical Participant_{user_id} not found. Searching by ID property...")
+                participant = entity_index.participant_by_id(user_id)
+
+            if not participant:
+                print(f"❌ Participant_{user_id} not found in ontology.")
+                return jsonify({"found": False, "message": "not found"}), 200
+
+            print(f"✅ Found participant: {participant.name} (IRI: {participant.iri})")
+
+            # Performance literals, analysis and trait scores in one prepared query
+            record = read_participant_record(user_id, participant)
+            job_perf = float(record["job"]) if record["job"] is not None else 0.0
+            acad_perf = float(record["academic"]) if record["academic"] is not None else 0.0
+            print(f"   JobPerformance: {record['job']}  AcademicPerformance: {record['academic']}")
+
+            numeric_scores = record["scores"]
+            scores = {trait: f"{round(val, 2)}%" for trait, val in numeric_scores.items()}
+
+            return jsonify({
+                "found": True,
+                "scores": scores,
+                "norms": population_norms.compare(numeric_scores),
+                "performance": {
+                    "JobPerformance": round(job_perf, 2),
+                    "AcademicPerformance": round(acad_perf, 2)
+                },
+                "analysis": str(record["analysis"]) if record["analysis"] is not None else ""
+            })
     except Exception as e:
         print(f"❌ ERROR reading previous result: {e}")
         return jsonify({"found": False, "message": "internal error"}), 500
@@ -838,56 +2035,131 @@ def get_previous_result():
 
 @app.route('/api/justification/<participant_id>', methods=['GET'])
 def get_justification(participant_id):
-    global onto
     user_id = normalize_user_id(participant_id)
     if not user_id:
         return jsonify({"found": False, "message": "id is required"}), 400
+    return cached_participant_response(user_id, "justification", lambda: justification_response(user_id))
 
+
+def justification_response(user_id):
     try:
-        onto = load_ontology(force_reload=True)
-        ensure_custom_properties(onto)
-        participant = find_entity_by_id(onto.Participant, f"Participant_{user_id}")
+        with ontology_snapshot():
+            participant = find_entity_by_id(onto.Participant, f"Participant_{user_id}")
 
-        if not participant:
-            return jsonify({"found": False, "message": "not found"}), 200
+            if not participant:
+                return jsonify({"found": False, "message": "not found"}), 200
 
-        justification_text = ""
-        if hasattr(participant, 'hasJustificationReport') and participant.hasJustificationReport:
-            justification_text = str(participant.hasJustificationReport[-1])
-            print(f"📤 Returning justification for {participant.name if hasattr(participant,'name') else participant}: {justification_text[:120]}...")
+            justification_text = ""
+            record = ontology_queries.participant_record(participant)
+            if record["justification"]:
+                justification_text = str(record["justification"])
+                print(f"📤 Returning justification for {participant.name if hasattr(participant,'name') else participant}: {justification_text[:120]}...")
 
-        if not justification_text:
-            justification_text = "Justification not available for this participant. Please re-run the assessment."
+            if not justification_text:
+                justification_text = "Justification not available for this participant. Please re-run the assessment."
 
-        return jsonify({"found": True, "justification": justification_text}), 200
+            return jsonify({"found": True, "justification": justification_text}), 200
     except Exception as e:
         print(f"❌ ERROR fetching justification: {e}")
         return jsonify({"found": False, "message": "internal error"}), 500
 
 
-@app.route('/api/career-fit/<participant_id>', methods=['GET'])
-def get_career_fit(participant_id):
-    """Return career role fit scores, explanations, skill gaps, and counterfactual insights."""
-    global onto
+@app.route('/api/analysis/stream/<participant_id>', methods=['GET'])
+def stream_analysis(participant_id):
+    """Stream the AI analysis as Server-Sent Events: token deltas, then done (or error)."""
     user_id = normalize_user_id(participant_id)
     if not user_id:
         return jsonify({"found": False, "message": "id is required"}), 400
 
     try:
-        onto = load_ontology(force_reload=True)
-        ensure_custom_properties(onto)
-        ensure_career_roles_seed(onto)
+        with ontology_snapshot():
+            participant = find_entity_by_id(onto.Participant, f"Participant_{user_id}") or entity_index.participant_by_id(user_id)
+            if not participant:
+                return jsonify({"found": False, "message": "not found"}), 200
+            record = read_participant_record(user_id, participant)
+            scores = record["scores"]
+            if not scores:
+                return jsonify({"found": False, "message": "No trait scores available for this participant."}), 200
+            participant_name = record_display_name(participant, record)
+    except Exception as e:
+        print(f"❌ ERROR preparing analysis stream: {e}")
+        return jsonify({"found": False, "message": "internal error"}), 500
 
-        participant = find_entity_by_id(onto.Participant, f"Participant_{user_id}") if hasattr(onto, "Participant") else None
-        if not participant:
-            return jsonify({"found": False, "message": "not found"}), 200
+    def generate():
+        parts = []
+        try:
+            for delta in stream_groq_suggestions(scores, participant_name, timeout=LLM_DEADLINE_SECONDS):
+                parts.append(delta)
+                yield sse_event("token", {"text": delta})
+        except Exception as exc:
+            print(f"❌ ERROR streaming analysis: {exc}")
+            yield sse_event("error", {"message": f"Error getting suggestions: {exc}"})
+            return
+
+        analysis_text = "".join(parts)
+        if client and analysis_text:
+            try:
+                store_analysis_report(user_id, analysis_text)
+                print(f"💾 Analysis stored for Participant_{user_id} (len={len(analysis_text)})")
+            except Exception as save_err:
+                print(f"⚠️ Could not persist analysis: {save_err}")
+        yield sse_event("done", {"length": len(analysis_text)})
+
+    return app.response_class(
+        stream_with_context(generate()),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.route('/api/career-fit/<participant_id>', methods=['GET'])
+def get_career_fit(participant_id):
+    """Return career role fit scores, explanations, skill gaps, and counterfactual insights.
+
+    Every catalog role is scored; the top_k best (CAREER_FIT_TOP_K, ?top_k=) are explained.
+    Each explained role carries a what_if block: the smallest change that ranks it first, the
+    fit gained or lost per answer point on each trait and, with ?target_score=, the smallest
+    change that reaches that score.
+    """
+    user_id = normalize_user_id(participant_id)
+    if not user_id:
+        return jsonify({"found": False, "message": "id is required"}), 400
+    try:
+        top_k = int(request.args.get("top_k", CAREER_FIT_TOP_K))
+    except ValueError:
+        return jsonify({"found": False, "message": "top_k must be an integer"}), 400
+    if top_k < 1:
+        return jsonify({"found": False, "message": "top_k must be at least 1"}), 400
+    try:
+        target_score = float(request.args["target_score"]) if request.args.get("target_score") else None
+    except ValueError:
+        return jsonify({"found": False, "message": "target_score must be a number"}), 400
+    if target_score is not None and not 0 <= target_score <= 100:
+        return jsonify({"found": False, "message": "target_score must be between 0 and 100"}), 400
+    return cached_participant_response(user_id, ("career_fit", top_k, target_score),
+                                       lambda: career_fit_response(user_id, top_k, target_score))
 
-        trait_scores = extract_trait_percentages_for_participant(user_id)
-        if not trait_scores:
-            return jsonify({"found": False, "message": "Trait scores unavailable for this participant"}), 200
 
-        role_results, ranking = score_role_fit(trait_scores)
-        explanations = generate_role_explanations(get_participant_display_name(participant), trait_scores, role_results)
+def career_fit_response(user_id, top_k, target_score):
+    try:
+        with ontology_snapshot():
+            participant = find_entity_by_id(onto.Participant, f"Participant_{user_id}") if hasattr(onto, "Participant") else None
+            if not participant:
+                return jsonify({"found": False, "message": "not found"}), 200
+
+            record = read_participant_record(user_id, participant)
+            trait_scores = record["scores"]
+            if not trait_scores:
+                return jsonify({"found": False, "message": "Trait scores unavailable for this participant"}), 200
+            participant_name = record_display_name(participant, record)
+            stored_role_fit = set(record["role_fit_scores"])
+
+        # Scoring and the LLM call run without holding the ontology lock
+        role_results, ranking = score_role_fit(trait_scores, top_k)
+        what_if = role_counterfactuals(trait_scores, role_results, target_score)
+        for role, info in role_results.items():
+            info["rank_first"] = what_if[role]["rank_first"]
+        explanations = generate_role_explanations(participant_name, trait_scores, role_results)
 
         # Shape response per role
         response_roles = {}
@@ -899,7 +2171,7 @@ def get_career_fit(participant_id):
             strengths = raw_strengths if isinstance(raw_strengths, list) else ([raw_strengths] if raw_strengths else [])
             raw_challenges = role_expl.get("challenges")
             challenges = raw_challenges if isinstance(raw_challenges, list) else ([raw_challenges] if raw_challenges else [])
-            counterfactual = role_expl.get("counterfactual") or build_counterfactual_insight(info.get("contributions", []))
+            counterfactual = role_expl.get("counterfactual") or build_counterfactual_insight(info.get("contributions", []), info["rank_first"])
             response_roles[role] = {
                 "score": info.get("score", 0),
                 "explanation": role_expl.get("explanation", ""),
@@ -907,57 +2179,293 @@ def get_career_fit(participant_id):
                 "challenges": challenges,
                 "skill_gaps": skill_gaps,
                 "counterfactual": counterfactual,
+                "what_if": what_if[role],
                 "traits": info.get("contributions", []),
             }
 
-        # Persist role fit scores back to ontology
-        try:
-            with onto:
-                persist_role_fit_scores(participant, role_results)
-            onto.save(file=ONTOLOGY_PATH, format="rdfxml")
-        except Exception as save_err:
-            print(f"⚠️ Could not save role fit scores: {save_err}")
+        # Persist role fit scores back to ontology, only when they changed since the last read.
+        # The stored set covers every catalog role whatever top_k was, so in steady state this
+        # GET takes no write lock and schedules no save
+        fit_values = role_fit_score_values(trait_scores)
+        if set(fit_values) != stored_role_fit:
+            try:
+                undo = OntologyUndo(find_entity_by_id, entity_index.forget)
+                with ontology_transaction(undo) as o:
+                    undo.capture(o.Participant, f"Participant_{user_id}")
+                    participant = find_entity_by_id(o.Participant, f"Participant_{user_id}")
+                    if participant:
+                        with o:
+                            changed = persist_role_fit_scores(participant, fit_values)
+                        if changed:
+                            persist_ontology(o)
+            except Exception as save_err:
+                print(f"⚠️ Could not save role fit scores: {save_err}")
 
         ranking_payload = [
             {"role": r, "score": role_results[r]["score"], "position": idx + 1}
             for idx, r in enumerate(ranking)
         ]
 
-        return jsonify({
+        response = jsonify({
             "found": True,
             "roles": response_roles,
             "ranking": ranking_payload,
             "top_recommendation": ranking[0] if ranking else None,
-        }), 200
+        })
+        if any(expl.get("transient") for expl in explanations.values()):
+            response.headers["Cache-Control"] = "no-store"
+        return response, 200
     except Exception as e:
         print(f"❌ ERROR computing career fit: {e}")
         return jsonify({"found": False, "message": "internal error"}), 500
 
 
+@app.route('/api/career-fit/batch', methods=['POST'])
+def get_career_fit_batch():
+    """Role-fit matrix, per-participant rankings and per-role top-k for a cohort.
+
+    Body: {"participants": [{"id": ..., "traits": {trait: pct}}] | "all", "top_k": 10}
+    """
+    data = request.json
+    if not isinstance(data, dict):
+        return jsonify({"error": "Request body is required"}), 400
+
+    try:
+        top_k = int(data.get('top_k', DEFAULT_BATCH_TOP_K))
+    except (ValueError, TypeError):
+        return jsonify({"error": "top_k must be an integer"}), 400
+
+    requested = data.get('participants', 'all')
+    trait_matrix = None
+    if requested == 'all':
+        # Stored trait vectors come from the columnar result store, not an ontology walk
+        refresh_ontology()
+        ids, trait_matrix = result_store.trait_matrix(role_catalog.matrix.traits)
+        rows = None
+    elif isinstance(requested, list):
+        if len(requested) > MAX_BATCH_SCORE:
+            return jsonify({"error": f"At most {MAX_BATCH_SCORE} participants per call"}), 400
+        ids, rows = [], []
+        for idx, item in enumerate(requested):
+            traits = item.get('traits') if isinstance(item, dict) else None
+            if not isinstance(traits, dict):
+                return jsonify({"error": f"participants[{idx}].traits must be an object of trait -> percentage"}), 400
+            try:
+                rows.append({k: float(v) for k, v in traits.items()})
+            except (ValueError, TypeError):
+                return jsonify({"error": f"participants[{idx}].traits must contain numeric values"}), 400
+            ids.append(item.get('id', idx))
+    else:
+        return jsonify({"error": "participants must be a list or \"all\""}), 400
+
+    result = score_role_fit_batch(rows, ids, top_k, trait_matrix=trait_matrix)
+    result["count"] = len(ids)
+    return jsonify(result), 200
+
+
+@app.route('/api/similar/<participant_id>', methods=['GET'])
+def get_similar_participants(participant_id):
+    """The k participants with the closest Big Five vectors.
+
+    Query: k (default 10, max 100); role to keep only neighbours whose best-fitting role it
+    is, or role plus min_fit to keep neighbours whose fit for that role is at least min_fit.
+    """
+    user_id = normalize_user_id(participant_id)
+    try:
+        k = int(request.args.get("k", DEFAULT_SIMILAR_K))
+        min_fit = float(request.args["min_fit"]) if request.args.get("min_fit") else None
+    except ValueError:
+        return jsonify({"error": "k must be an integer and min_fit a number"}), 400
+    if not 1 <= k <= MAX_SIMILAR_K:
+        return jsonify({"error": f"k must be between 1 and {MAX_SIMILAR_K}"}), 400
+    role = request.args.get("role") or None
+    if role is not None and role not in role_catalog.role_index:
+        return jsonify({"error": f"Unknown role '{role}'"}), 400
+    if min_fit is not None and role is None:
+        return jsonify({"error": "min_fit requires role"}), 400
+
+    with ontology_snapshot():
+        neighbors = similarity_index.nearest(user_id, k, role=role, min_fit=min_fit)
+        if neighbors is None:
+            return jsonify({"error": "No stored scores for this participant"}), 404
+        for neighbor in neighbors:
+            participant = export_participant(neighbor["id"])
+            neighbor["name"] = get_participant_display_name(participant) if participant is not None else None
+
+    return jsonify({"id": user_id, "k": k, "role": role, "min_fit": min_fit, "neighbors": neighbors})
+
+
+@app.route('/api/counterfactual/<participant_id>', methods=['GET'])
+def get_counterfactual(participant_id):
+    """Smallest trait changes, in answer points, that rank role first (and reach ?score=).
+
+    Searches with COUNTERFACTUAL_SEARCH_MAX_STATES, so plans too deep for the inline
+    career-fit budget are still found. Also lists how far each answer point moves every role.
+    """
+    user_id = normalize_user_id(participant_id)
+    role = request.args.get("role")
+    if not role:
+        return jsonify({"error": "role is required"}), 400
+    if role not in role_catalog.role_index:
+        return jsonify({"error": f"Unknown role '{role}'"}), 400
+    try:
+        score = float(request.args["score"]) if request.args.get("score") else None
+    except ValueError:
+        return jsonify({"error": "score must be a number"}), 400
+    if score is not None and not 0 <= score <= 100:
+        return jsonify({"error": "score must be between 0 and 100"}), 400
+
+    with ontology_snapshot():
+        trait_scores = extract_trait_percentages_for_participant(user_id)
+    if not trait_scores:
+        return jsonify({"error": "No stored scores for this participant"}), 404
+
+    what_if = role_counterfactuals(trait_scores, [role], score, max_states=COUNTERFACTUAL_SEARCH_MAX_STATES)[role]
+    return jsonify({"id": user_id, "role": role, "traits": trait_scores, **what_if})
+
+
 @app.route('/get_questions', methods=['GET'])
 def get_questions():
-    questions_data = []
-    if not hasattr(onto, "AssessmentQuestion"):
+    """Serve the precompiled question catalog, honouring If-None-Match and gzip negotiation."""
+    catalog = question_catalog
+    if catalog is None:
         return jsonify([])
 
-    for q in onto.AssessmentQuestion.instances():
-        try:
-            questions_data.append(get_question_details(q))
-        except Exception:
-            pass
+    use_gzip = "gzip" in request.accept_encodings
+    etag = catalog.gzip_etag if use_gzip else catalog.etag
+    if request.if_none_match.contains(etag):
+        resp = app.response_class(status=304)
+    else:
+        resp = app.response_class(catalog.gzip_body if use_gzip else catalog.body, mimetype="application/json")
+        if use_gzip:
+            resp.headers['Content-Encoding'] = 'gzip'
+    resp.set_etag(etag)
+    resp.headers['Vary'] = 'Accept-Encoding'
+    resp.headers['Cache-Control'] = 'no-cache'
+    return resp
+
+@app.route('/api/score-batch', methods=['POST'])
+def score_batch():
+    """Score many answer sets in one call without storing anything."""
+    data = request.json
+    responses = data.get('responses') if isinstance(data, dict) else data
+    if not isinstance(responses, list):
+        return jsonify({"error": "responses must be a list of {id, answers} objects"}), 400
+    if len(responses) > MAX_BATCH_SCORE:
+        return jsonify({"error": f"At most {MAX_BATCH_SCORE} response sets per call"}), 400
+
+    answer_sets = [r.get('answers') if isinstance(r, dict) else None for r in responses]
+    errors = {}
+    scored = scoring_engine.score_batch(answer_sets, errors)
+
+    results = []
+    for idx, (item, result) in enumerate(zip(responses, scored)):
+        record_id = item.get('id') if isinstance(item, dict) else None
+        if result is None:
+            results.append({"id": record_id, "error": errors.get(idx, "Answers are required")})
+            continue
+        raw_scores, numeric_percentages, formatted_scores = result
+        results.append({
+            "id": record_id,
+            "scores": formatted_scores,
+            "percentages": numeric_percentages,
+            "performance": calculate_performance_scores(raw_scores),
+        })
 
-    def sort_key(q):
-        try:
-            return int(''.join(filter(str.isdigit, q['id'])))
-        except Exception:
-            return q['id']
+    return jsonify({"count": len(results), "errors": len(errors), "results": results})
 
-    questions_data.sort(key=sort_key)
-    return jsonify(questions_data)
+@app.route('/api/import-assessments', methods=['POST'])
+def import_assessments_route():
+    """Bulk-import CSV or JSON Lines of {id, name, answers}; the body is parsed as it streams.
+
+    Send the file as the raw body or as multipart field "file". Query: format=csv|jsonl
+    (otherwise guessed from the file name / Content-Type), narratives=true to generate
+    justification reports.
+    """
+    upload = request.files.get("file")
+    stream = upload.stream if upload else request.stream
+    fmt = request.args.get("format") or bulk_import.detect_format(
+        upload.filename if upload else None, upload.content_type if upload else request.content_type
+    )
+    narratives = request.args.get("narratives", "").lower() in ("1", "true", "yes")
+    try:
+        records = bulk_import.iter_records(stream, fmt)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    try:
+        report = import_assessments(records, narratives=narratives)
+    except Exception as e:
+        print(f"❌ ERROR importing assessments: {e}")
+        return jsonify({"error": "internal error"}), 500
+    return jsonify(report), 200
+
+
+@app.route('/api/export/results', methods=['GET'])
+def export_results():
+    """Stream every participant's results as NDJSON (default) or CSV.
+
+    Query: format=ndjson|csv, since=<ISO 8601 or epoch seconds>, cursor=<cursor of the last
+    record already synced>, justification=true to include the justification text.
+    """
+    fmt = (request.args.get("format") or "ndjson").lower()
+    if fmt not in result_export.FORMATS:
+        return jsonify({"error": f"format must be one of {', '.join(result_export.FORMATS)}"}), 400
+    try:
+        since = result_export.parse_since(request.args.get("since"))
+        cursor = result_export.decode_cursor(request.args["cursor"]) if request.args.get("cursor") else None
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    include_justification = request.args.get("justification", "").lower() in ("1", "true", "yes")
+
+    lines = iter_results_export(fmt, since, cursor, include_justification)
+    return app.response_class(
+        stream_with_context(lines),
+        mimetype="text/csv" if fmt == "csv" else "application/x-ndjson",
+        headers={"Cache-Control": "no-store"},
+    )
+
+
+@app.route('/api/results/summary', methods=['GET'])
+def get_results_summary():
+    """Cohort aggregates over every stored result, computed from the columnar result store."""
+    refresh_ontology()
+    summary = result_store.summary()
+    summary["store_bytes"] = result_store.memory_bytes()
+    return jsonify(summary)
+
+
+@app.route('/api/norms', methods=['GET'])
+def get_population_norms():
+    """Per-trait population count, mean and standard deviation behind percentile ranks."""
+    return jsonify({"traits": population_norms.summary()})
+
+
+@app.route('/metrics', methods=['GET'])
+def get_metrics():
+    """Prometheus scrape endpoint: request counters, latency and span histograms."""
+    return app.response_class(metrics_registry.render(), mimetype="text/plain; version=0.0.4; charset=utf-8")
+
+
+@app.route('/api/llm-cache/stats', methods=['GET'])
+def get_llm_cache_stats():
+    """Hit/miss counters and occupancy of the LLM response cache."""
+    return jsonify(llm_cache.stats()), 200
+
+
+@app.route('/api/idempotency/stats', methods=['GET'])
+def get_idempotency_stats():
+    """Stored, replayed and coalesced /submit_assessment responses."""
+    return jsonify(submission_idempotency.stats()), 200
+
+
+@app.route('/api/response-cache/stats', methods=['GET'])
+def get_response_cache_stats():
+    """Hit/miss counters and occupancy of the per-participant response cache."""
+    return jsonify(participant_responses.stats()), 200
 
 @app.route('/validate_user', methods=['POST'])
 def validate_user():
-    global onto
     data = request.json
     if not data:
         return jsonify({"valid": False, "message": "Request body is required"}), 400
@@ -973,26 +2481,25 @@ def validate_user():
 
     try:
         # Ensure we read latest ontology state
-        onto = load_ontology(force_reload=True)
-        
-        participant = find_entity_by_id(onto.Participant, f"Participant_{user_id}")
-        
-        if participant:
-            # Check name
-            stored_name = ""
-            
-            # Determine where the name is stored - logic matches submit_assessment
-            if hasattr(onto, "name") and isinstance(onto.name, DataPropertyClass):
-                if participant.name:
-                    stored_name = str(participant.name[0])
-            elif participant.label:
-                stored_name = str(participant.label[0])
-            
-            # Only validate if we actually found a stored name
-            if stored_name and stored_name.lower() != user_name.lower():
-                 return jsonify({"valid": False, "message": f"ID '{user_id}' is already registered with a different name."}), 200
-        
-        return jsonify({"valid": True}), 200
+        with ontology_snapshot():
+            participant = find_entity_by_id(onto.Participant, f"Participant_{user_id}")
+
+            if participant:
+                # Check name
+                stored_name = ""
+
+                # Determine where the name is stored - logic matches submit_assessment
+                if hasattr(onto, "name") and isinstance(onto.name, DataPropertyClass):
+                    if participant.name:
+                        stored_name = str(participant.name[0])
+                elif participant.label:
+                    stored_name = str(participant.label[0])
+
+                # Only validate if we actually found a stored name
+                if stored_name and stored_name.lower() != user_name.lower():
+                     return jsonify({"valid": False, "message": f"ID '{user_id}' is already registered with a different name."}), 200
+
+            return jsonify({"valid": True}), 200
 
     except Exception as e:
         print(f"❌ ERROR validating user: {e}")
@@ -1000,8 +2507,6 @@ def validate_user():
 
 @app.route('/submit_assessment', methods=['POST'])
 def submit_assessment():
-    global onto
-    
     # Validate request body
     data = request.json
     if not data:
@@ -1010,6 +2515,7 @@ def submit_assessment():
     user_id = normalize_user_id(data.get('id', ''))
     user_name = data.get('name', '').strip()
     answers = data.get('answers', {})
+    stream_analysis = bool(data.get('stream_analysis'))
     
     # Validate required fields
     if not user_id:
@@ -1020,135 +2526,269 @@ def submit_assessment():
         return jsonify({"error": "Answers are required"}), 400
     
     # Validate answer values (must be 1-5)
-    for q_id, value in answers.items():
-        try:
-            val = int(value)
-            if val < 1 or val > 5:
-                return jsonify({"error": f"Answer for question {q_id} must be between 1 and 5"}), 400
-        except (ValueError, TypeError):
-            return jsonify({"error": f"Invalid answer value for question {q_id}"}), 400
-    
-    # Reload ontology to ensure we see existing individuals before creating any
-    onto = load_ontology(force_reload=True)
-    ensure_custom_properties(onto)
-    
-    answered_questions_data = []
-    
-    # 1. Calculate trait totals
-    trait_totals = {}
-    for q in onto.AssessmentQuestion.instances():
-        details = get_question_details(q)
-        q_id = details['id']
-        trait = details['trait'].lower()
-        if trait == "unknown":
-            continue
-        if trait not in trait_totals:
-            trait_totals[trait] = []
-        if q_id in answers:
-            raw_val = int(answers[q_id])
-            final_val = (6 - raw_val) if details['is_reverse'] else raw_val
-            trait_totals[trait].append(final_val)
-            answered_questions_data.append({
-                "question_text": details['text'],
-                "trait": details['trait'],
-                "answer": raw_val,
-                "is_reverse_coded": details['is_reverse'],
-                "effective_score": final_val
-            })
+    answer_error = answer_validation_error(answers)
+    if answer_error:
+        return jsonify({"error": answer_error}), 400
+
+    # Name and streaming mode change the response, so they are part of the submission's identity
+    fingerprint = IdempotencyStore.fingerprint([user_id, user_name, answers, stream_analysis])
+    header_key = request.headers.get("Idempotency-Key", "").strip()
+    key = f"key:{header_key}" if header_key else f"submission:{fingerprint}"
+    try:
+        result, replayed = submission_idempotency.run(
+            key, fingerprint, lambda: process_submission(user_id, user_name, answers, stream_analysis), scope=user_id)
+    except IdempotencyConflict:
+        return jsonify({"error": "Idempotency-Key was already used for a different submission"}), 422
+    except Exception as e:
+        # Nothing was saved and nothing is stored under the key, so a retry runs again
+        print(f"❌ ERROR submitting assessment: {e}")
+        return jsonify({"error": "Your results could not be saved. Please try again."}), 500
+    response = jsonify(result)
+    if replayed:
+        print(f"♻️ Replayed submission for user: {user_id}")
+        response.headers["Idempotent-Replayed"] = "true"
+    return response
 
-    # Aggregate scores
-    raw_scores = {}
-    numeric_percentages = {}
-    formatted_scores = {}
-
-    for t, values in trait_totals.items():
-        trait_key = t.capitalize()
-        if values:
-            mean_val = sum(values) / len(values)
-            raw_scores[trait_key] = mean_val
-            pct_val = round((mean_val / 5) * 100, 2)
-            numeric_percentages[trait_key] = pct_val
-            formatted_scores[trait_key] = f"{pct_val}%"
-        else:
-            raw_scores[trait_key] = 0
-            numeric_percentages[trait_key] = 0.0
-            formatted_scores[trait_key] = "0%"
 
-    # Performance and AI suggestions
-    perf_scores = calculate_performance_scores(raw_scores)
-    suggestions = get_groq_suggestions(numeric_percentages, user_name)
-    justification_report = generate_justification_report(numeric_percentages, perf_scores, answered_questions_data) or "Justification not available."
-    print(f"💾 Attempting to save data for user: {user_name}...")
-    try:
-        with onto:
-            # Find or create participant by name (no wildcard), consolidating duplicates
-            participant = get_or_create_singleton(onto.Participant, f"Participant_{user_id}")
-            participant.participantID = [user_id]
-            
-            # Use label or a specific property for the display name to avoid renaming the entity
-            # If 'name' is a DataProperty in your ontology, this is fine. 
-            # But if it conflicts with owlready2's .name (IRI suffix), it causes issues.
-            # Safest is to use label or ensure we are setting the DataProperty.
-            if hasattr(onto, "name") and isinstance(onto.name, DataPropertyClass):
-                 participant.name = [user_name]
-            else:
-                 participant.label = [user_name]
+def process_submission(user_id, user_name, answers, stream_analysis):
+    """Score, generate reports for and save one validated submission. Returns the response body.
 
-            # Find or create assessment by name (no wildcard), consolidating duplicates
-            assessment = get_or_create_singleton(onto.Assessment, f"Assessment_{user_id}")
-            assessment.completedBy = [participant]
+    Raises when the results could not be saved (after rolling back), so the idempotency store
+    never keeps a response for a submission that is not in the ontology.
+    """
+    global onto
 
-            # Update performance scores
-            if "JobPerformance" in perf_scores:
-                print(f"   🔄 Updating JobPerformance to: {perf_scores['JobPerformance']}")
-                participant.jobPerformance = [] # Clear previous values to ensure update
-                participant.jobPerformance = [float(perf_scores["JobPerformance"])]
-            
-            if "AcademicPerformance" in perf_scores:
-                print(f"   🔄 Updating AcademicPerformance to: {perf_scores['AcademicPerformance']}")
-                participant.academicPerformance = [] # Clear previous values to ensure update
-                participant.academicPerformance = [float(perf_scores["AcademicPerformance"])]
-
-            # Ensure hasScore is a list
-            if not hasattr(assessment, 'hasScore') or assessment.hasScore is None:
-                assessment.hasScore = []
-
-            # Build expected set of trait score individuals, reusing by name
-            expected_scores = []
-            for trait, value in numeric_percentages.items():
-                name = f"Score_{user_id}_{trait}"
-                ts = get_or_create_singleton(onto.TraitScore, name)
-                ts.meanScore = [value]
-
-                trait_obj = onto.search_one(name=trait)
-                if trait_obj:
-                    ts.scoresOnTrait = [trait_obj]
-
-                expected_scores.append(ts)
-
-            # Replace assessment.hasScore with expected set (no destroys) and persist
-            assessment.hasScore = expected_scores
-
-            # Attach justification report
-            participant.hasJustificationReport = []
-            participant.hasJustificationReport = [justification_report]
-            print(f"   📝 Justification attached (len={len(participant.hasJustificationReport)}): {participant.hasJustificationReport[-1][:120]}...")
+    # Pick up external changes so scoring uses the current question catalog
+    refresh_ontology()
+
+    # 1. Score traits with the compiled keying matrix (reverse coding included)
+    raw_scores, numeric_percentages, formatted_scores = scoring_engine.score(answers)
+    answered_questions_data = scoring_engine.answered_questions(answers)
 
-        # Save and reload to make sure state is consistent
-        onto.save(file=ONTOLOGY_PATH, format="rdfxml")
-        print("💾 Ontology saved with justification report")
+    # Performance and AI suggestions
+    perf_scores = calculate_performance_scores(raw_scores)
+    # Both generations are independent, so latency is the slower of the two rather than the sum.
+    # Streaming clients fetch the analysis from /api/analysis/stream instead.
+    llm_calls = {
+        "justification": (generate_justification_report, (numeric_percentages, perf_scores, answered_questions_data), "Justification could not be generated at this time."),
+    }
+    if not stream_analysis:
+        llm_calls["analysis"] = (get_groq_suggestions, (numeric_percentages, user_name), "AI analysis is taking longer than expected. Please try again later.")
+    llm_results = run_llm_calls(llm_calls)
+    suggestions = llm_results.get("analysis", "")
+    justification_report = llm_results["justification"] or "Justification not available."
+    print(f"💾 Attempting to save data for user: {user_name}...")
+    # Writers are serialized and readers wait, so nobody observes a half-written participant
+    with ontology_lock.write_locked():
+        # Reload ontology to ensure we see existing individuals before creating any
         onto = load_ontology(force_reload=True)
-        ensure_custom_properties(onto)
-        print("✅ Data successfully saved to project.rdf")
+        undo = OntologyUndo(find_entity_by_id, entity_index.forget)
+        try:
+            capture_assessment_entities(undo, user_id, numeric_percentages)
+            with onto:
+                store_assessment_result(user_id, user_name, numeric_percentages, perf_scores, justification_report)
 
-    except Exception as e:
-        print(f"❌ ERROR SAVING ONTOLOGY: {str(e)}")
+            # Save and reload to make sure state is consistent
+            persist_ontology(onto)
+            print("💾 Ontology saved with justification report")
+            onto = load_ontology(force_reload=True)
+            print(f"✅ Data successfully saved to {storage_location()}")
 
-    return jsonify({
+        except Exception as e:
+            print(f"❌ ERROR SAVING ONTOLOGY: {str(e)}")
+            try:
+                onto = rollback_ontology(undo)
+            except Exception as reload_err:
+                print(f"⚠️ Could not roll back ontology changes: {reload_err}")
+            raise
+    participant_responses.invalidate(user_id)
+
+    response = {
         "scores": formatted_scores,
+        "norms": population_norms.compare(numeric_percentages),
         "performance": perf_scores,
         "analysis": suggestions
-    })
+    }
+    if stream_analysis:
+        response["analysis_stream"] = f"/api/analysis/stream/{user_id}"
+    return response
+
+# --- CLI COMMANDS ---
+
+@app.cli.command("export-ontology")
+@click.argument("path", required=False)
+def export_ontology_command(path):
+    """Export the live ontology to RDF/XML (defaults to project.rdf)."""
+    target = path or ONTOLOGY_PATH
+    load_ontology().save(file=target, format="rdfxml")
+    print(f"📤 Ontology exported to {target}")
+
+
+@app.cli.command("build-boot-snapshot")
+def build_boot_snapshot_command():
+    """Write the boot snapshot for the current project.rdf (needs ONTOLOGY_BOOT_SNAPSHOT)."""
+    if ONTOLOGY_STORAGE != "rdfxml" or not BOOT_SNAPSHOT_PATH:
+        raise click.ClickException("build-boot-snapshot requires ONTOLOGY_STORAGE=rdfxml and ONTOLOGY_BOOT_SNAPSHOT")
+    with ontology_lock.write_locked():
+        ontology_writer.flush()
+        write_boot_snapshot(onto, boot_snapshot.file_digest(ONTOLOGY_PATH))
+    print(f"📸 Boot snapshot written to {BOOT_SNAPSHOT_PATH}")
+
+
+@app.cli.command("compact-ontology")
+@click.option("--output", "-o", type=click.Path(dir_okay=False), help="Write the compacted ontology here and leave the live one untouched.")
+@click.option("--dry-run", is_flag=True, help="Report what would change without writing anything.")
+def compact_ontology_command(output, dry_run):
+    """Collapse duplicate individuals, drop orphaned TraitScores and stale literals in one pass."""
+    global onto
+    with ontology_lock.write_locked():
+        ontology_writer.flush()
+        onto = load_ontology(force_reload=True)
+        before = compaction.rdfxml_bytes(onto)
+        try:
+            with onto:
+                report = compaction.compact(onto)
+            after = compaction.rdfxml_bytes(onto)
+        except Exception:
+            onto = rollback_ontology()
+            raise
+
+        if dry_run or output:
+            if output:
+                with open(output, "wb") as fh:
+                    fh.write(after)
+            onto = rollback_ontology()
+        else:
+            entity_index.build(onto)
+            rebuild_population_norms()
+            rebuild_similarity_index(onto)
+            rebuild_result_store(onto)
+            if ONTOLOGY_STORAGE == "sqlite":
+                onto.world.save()
+                save_population_norms(onto)
+            else:
+                save_ontology_file(onto)
+
+    merged = ", ".join(f"{count} {kind}" for kind, count in sorted(report["duplicates_merged"].items())) or "none"
+    print(f"🧹 Duplicates merged: {merged}")
+    for group in report["participants_collapsed"]:
+        print(f"   👤 {group['id']}: kept {group['kept']}, removed {', '.join(group['removed'])}")
+    print(f"🧹 Orphaned TraitScores dropped: {len(report['orphaned_trait_scores_dropped'])}")
+    print(f"🧹 Stale literals dropped: {report['stale_literals_dropped']}")
+    load_before = compaction.parse_milliseconds(before, onto.base_iri)
+    load_after = compaction.parse_milliseconds(after, onto.base_iri)
+    print(f"📦 RDF/XML size: {len(before)} -> {len(after)} bytes ({(len(after) - len(before)) / max(len(before), 1) * 100:+.1f}%)")
+    print(f"⏱️ Parse time: {load_before} -> {load_after} ms")
+    if dry_run:
+        print("ℹ️ Dry run: nothing was written")
+    elif output:
+        print(f"📤 Compacted ontology written to {output}")
+    else:
+        print(f"✅ Compacted ontology saved to {storage_location()}")
+
+
+@app.cli.command("rebuild-norms")
+def rebuild_norms_command():
+    """Recompute the population norms from every stored result and save them."""
+    with ontology_lock.write_locked():
+        ontology_writer.flush()
+        started = time.perf_counter()
+        rebuild_population_norms()
+        save_population_norms(onto)
+    for trait, stats in population_norms.summary().items():
+        print(f"   {trait}: n={stats['count']} mean={stats['mean']} std={stats['std']}")
+    print(f"📊 Population norms rebuilt in {(time.perf_counter() - started) * 1000:.1f} ms and saved to {POPULATION_NORMS_PATH}")
+
+
+@app.cli.command("import-roles")
+@click.argument("path", type=click.Path(exists=True, dir_okay=False))
+def import_roles_command(path):
+    """Add or update career roles from a JSON file shaped like ROLE_BLUEPRINTS.
+
+    Each role may also carry "skill_gaps": {trait: [skills]}.
+    """
+    global onto
+    try:
+        with open(path, encoding="utf-8") as fh:
+            blueprints, skill_gaps = blueprints_from_json(json.load(fh))
+    except ValueError as e:
+        raise click.ClickException(str(e))
+    with ontology_lock.write_locked():
+        ontology_writer.flush()
+        onto = load_ontology(force_reload=True)
+        with onto:
+            written = write_roles(onto, blueprints, skill_gaps)
+        compile_role_catalog(onto)
+        rebuild_similarity_index(onto)
+        result_store.rescore(role_catalog.matrix)
+        persist_ontology(onto)
+        ontology_writer.flush()
+    print(f"💼 {written} roles written; the catalog now has {len(role_catalog)} roles")
+
+
+@app.cli.command("import-assessments")
+@click.argument("path", type=click.Path(exists=True, dir_okay=False))
+@click.option("--format", "fmt", type=click.Choice(bulk_import.FORMATS), help="Defaults to the file extension.")
+@click.option("--narratives/--no-narratives", default=False, help="Generate justification reports with Groq.")
+@click.option("--chunk-size", type=int, default=None, help="Records scored and written per batch.")
+def import_assessments_command(path, fmt, narratives, chunk_size):
+    """Bulk-import assessments from a CSV or JSON Lines file."""
+    with open(path, "rb") as fh:
+        records = bulk_import.iter_records(fh, fmt or bulk_import.detect_format(path))
+        report = import_assessments(records, chunk_size=chunk_size, narratives=narratives)
+    ontology_writer.flush()
+    for err in report["errors"]:
+        print(f"   ⚠️ line {err['line']} ({err['id']}): {err['error']}")
+    print(f"✅ {report['imported']} imported, {report['failed']} failed, "
+          f"{report['records_per_second']} records/s over {report['seconds']} s")
+
+
+@app.cli.command("export-results")
+@click.option("--format", "fmt", type=click.Choice(result_export.FORMATS), default="ndjson")
+@click.option("--since", help="Only participants updated at or after this ISO 8601 time / epoch seconds.")
+@click.option("--cursor", help="Resume after the record carrying this cursor.")
+@click.option("--justification/--no-justification", default=False, help="Include justification text.")
+@click.option("--output", "-o", type=click.Path(dir_okay=False), help="Write to a file instead of stdout.")
+def export_results_command(fmt, since, cursor, justification, output):
+    """Stream participant results as NDJSON or CSV."""
+    try:
+        since = result_export.parse_since(since)
+        cursor = result_export.decode_cursor(cursor) if cursor else None
+    except ValueError as e:
+        raise click.ClickException(str(e))
+    lines = iter_results_export(fmt, since, cursor, justification)
+    if output:
+        count = 0
+        with open(output, "w", encoding="utf-8", newline="") as fh:
+            for line in lines:
+                fh.write(line)
+                count += 1
+        print(f"📤 Exported {count - (fmt == 'csv')} participants to {output}")
+    else:
+        for line in lines:
+            click.echo(line, nl=False)
+
+
+@app.cli.command("import-ontology")
+@click.argument("path", required=False)
+def import_ontology_command(path):
+    """Rebuild the SQLite quadstore from an RDF/XML file (defaults to project.rdf)."""
+    global onto, onto_world
+    if ONTOLOGY_STORAGE != "sqlite":
+        raise click.ClickException("import-ontology requires ONTOLOGY_STORAGE=sqlite")
+    source = path or ONTOLOGY_PATH
+    if onto_world is not None:
+        onto_world.close()
+        onto_world = None
+    if os.path.exists(QUADSTORE_PATH):
+        os.remove(QUADSTORE_PATH)
+    world = World(filename=QUADSTORE_PATH, exclusive=False)
+    world.get_ontology(source).load()
+    world.save()
+    world.close()
+    onto = load_ontology()
+    print(f"📥 Imported {source} into quadstore {QUADSTORE_PATH}")
+
 
 if __name__ == '__main__':
     app.run(debug=True, port=5000)
@@ -0,0 +1,431 @@
+"""Microbenchmarks for the backend hot paths against synthetic ontologies of growing size.
+
+For every size a synthetic copy of project.rdf is generated with that many scored
+participants (through app.import_assessments, so the individuals have exactly the shape a
+real submit writes), then a fresh interpreter boots the app against it and times
+- load_ontology, find_entity_by_id, the participant record read through the prepared SPARQL
+  query and through the attribute walk it replaced, get_question_details over the question set, trait
+  scoring, score_role_fit, calculate_performance_scores, the nearest-neighbour
+  query and onto.save in isolation,
+- the memory a participant's results take as materialized owlready2 individuals and as a row
+  of the columnar result store (a separate interpreter, measured with tracemalloc),
+- every Flask route through the test client, with Groq replaced by an in-process stub; the
+  per-participant GETs are timed on a response-cache hit, a miss and a 304 revalidation.
+
+--roles adds that many synthetic career roles to the catalog, to check that per-request cost
+stays flat as the catalog grows. The real project.rdf is never touched. Results are written as JSON; pass a previous run as
+--baseline to print the change of every median.
+
+Usage (from backend/):
+    python benchmarks/hot_paths.py [--sizes 100,10000,100000] [--roles 2000] [--output hot_paths.json]
+                                   [--baseline previous.json] [--cache-dir DIR]
+"""
+
+import argparse
+import contextlib
+import gc
+import io
+import itertools
+import json
+import os
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import types
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ROLES = ("Software Engineer", "Manager", "Researcher")
+
+
+class StubGroq:
+    """Stands in for the Groq client: answers instantly, streams word by word, never hits the network."""
+
+    def __init__(self):
+        self.calls = 0
+        self.chat = types.SimpleNamespace(completions=self)
+
+    def create(self, **kwargs):
+        self.calls += 1
+        if "JSON" in kwargs["messages"][0]["content"]:
+            content = json.dumps([
+                {"role": role, "explanation": "stub", "strengths": ["stub"], "challenges": ["stub"],
+                 "counterfactual": "stub", "skill_gaps": ["stub"]}
+                for role in ROLES
+            ])
+        else:
+            content = "stub generation for benchmarking"
+        if kwargs.get("stream"):
+            return iter([
+                types.SimpleNamespace(choices=[types.SimpleNamespace(delta=types.SimpleNamespace(content=token + " "))])
+                for token in content.split(" ")
+            ])
+        return types.SimpleNamespace(choices=[types.SimpleNamespace(message=types.SimpleNamespace(content=content))])
+
+
+def synthetic_answers(question_ids, seed):
+    rng = random.Random(seed)
+    return {q_id: rng.randint(1, 5) for q_id in question_ids}
+
+
+def child_env(ontology_path):
+    env = dict(os.environ, ONTOLOGY_PATH=ontology_path, ONTOLOGY_STORAGE="rdfxml", GROQ_API_KEY="", LLM_CACHE_MAX_ENTRIES="0")
+    for key in ("ONTOLOGY_BOOT_SNAPSHOT", "LLM_CACHE_PATH"):
+        env.pop(key, None)
+    return env
+
+
+def run_child(mode, ontology_path, *extra):
+    out = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), mode, ontology_path, *map(str, extra)],
+        cwd=BACKEND_DIR, env=child_env(ontology_path), check=True, capture_output=True, text=True,
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def boot_app():
+    sys.path.insert(0, BACKEND_DIR)
+    with contextlib.redirect_stdout(io.StringIO()):
+        import app
+    return app
+
+
+def synthetic_roles(count, traits):
+    """count random career roles in the ROLE_BLUEPRINTS shape (plus per-trait skill gaps)."""
+    rng = random.Random("roles")
+    blueprints, skill_gaps = {}, {}
+    for i in range(count):
+        role = f"Bench Role {i}"
+        blueprints[role] = {
+            "trait_targets": {t: {"target": rng.randint(10, 95), "weight": round(rng.uniform(0.05, 0.4), 2)} for t in traits},
+            "skills": [f"Bench Skill {rng.randrange(count)}" for _ in range(3)],
+        }
+        skill_gaps[role] = {t: [f"Bench Gap {rng.randrange(count)}"] for t in traits}
+    return blueprints, skill_gaps
+
+
+def generate(ontology_path, participants, roles=0):
+    """Child process: add `participants` scored synthetic participants (and `roles` career roles) to ontology_path."""
+    started = time.perf_counter()
+    app = boot_app()
+    if roles:
+        with app.onto:
+            app.write_roles(app.onto, *synthetic_roles(roles, app.scoring_engine.traits))
+        app.compile_role_catalog(app.onto)
+    question_ids = [q.id for q in app.scoring_engine.questions]
+    records = (
+        (i + 1, {"id": f"bench{i}", "name": f"Bench User {i}", "answers": synthetic_answers(question_ids, i)}, None)
+        for i in range(participants)
+    )
+    with contextlib.redirect_stdout(io.StringIO()):
+        report = app.import_assessments(records)
+        app.ontology_writer.flush()
+    return {
+        "participants": participants,
+        "roles": len(app.role_catalog),
+        "imported": report["imported"],
+        "seconds": round(time.perf_counter() - started, 3),
+        "file_bytes": os.path.getsize(ontology_path),
+    }
+
+
+def attribute_walk_record(app, onto, user_id):
+    """The per-participant read as it was before the prepared SPARQL layer: one probe per property."""
+    participant = app.find_entity_by_id(onto.Participant, f"Participant_{user_id}")
+    assessment = app.find_entity_by_id(onto.Assessment, f"Assessment_{user_id}")
+    trait_scores = list(assessment.hasScore) if assessment is not None else list(app.entity_index.trait_scores(user_id).values())
+    return {
+        "job": participant.jobPerformance[-1] if participant.jobPerformance else None,
+        "academic": participant.academicPerformance[-1] if participant.academicPerformance else None,
+        "analysis": participant.hasAnalysisReport[-1] if participant.hasAnalysisReport else None,
+        "justification": participant.hasJustificationReport[-1] if participant.hasJustificationReport else None,
+        "label": str(participant.label[0]) if participant.label else None,
+        "scores": app.trait_percentages(trait_scores),
+    }
+
+
+def stored_trait_rows_walk(app):
+    """Stored trait vectors as /api/career-fit/batch read them before the result store: one query each."""
+    user_ids, rows = [], []
+    for user_id in app.entity_index.scored_user_ids():
+        trait_scores = app.extract_trait_percentages_for_participant(user_id)
+        if trait_scores:
+            user_ids.append(user_id)
+            rows.append(trait_scores)
+    return user_ids, rows
+
+
+def memory(ontology_path):
+    """Child process: bytes per participant of materialized owlready2 results vs the result store.
+
+    The World is parsed first; tracemalloc then counts what reading every participant's results
+    allocates (the individuals and their list-valued properties), and separately what a
+    ResultStore built from the same values holds. The quadstore's own SQLite memory is not
+    traced, so the owlready2 figure is a lower bound.
+    """
+    sys.path.insert(0, BACKEND_DIR)
+    from owlready2 import World
+    from ontology_queries import score_trait_name
+    from result_store import ResultStore
+    from role_catalog import RoleCatalog
+
+    onto = World().get_ontology(ontology_path).load()
+    matrix = RoleCatalog.from_ontology(onto).matrix
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    held = []
+    for participant in onto.search(type=onto.Participant):
+        user_id = participant.name[len("Participant_"):]
+        assessment = onto.world[f"{onto.base_iri}Assessment_{user_id}"]
+        scores = list(assessment.hasScore) if assessment is not None else []
+        held.append((user_id, participant, scores, [ts.meanScore for ts in scores], participant.jobPerformance,
+                     participant.academicPerformance, participant.resultUpdatedAt))
+    owlready_bytes = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+
+    items = [
+        (user_id, {score_trait_name(ts): float(means[0]) for ts, means in zip(scores, mean_lists) if means},
+         {"JobPerformance": job[-1] if job else None, "AcademicPerformance": academic[-1] if academic else None},
+         stamps[-1] if stamps else None)
+        for user_id, _, scores, mean_lists, job, academic, stamps in held if scores
+    ]
+    count = len(items)
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    store = ResultStore(matrix)
+    store.rebuild(items)
+    store_bytes = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return {
+        "participants": count,
+        "owlready_bytes_per_participant": round(owlready_bytes / max(count, 1)),
+        "result_store_bytes_per_participant": round(store_bytes / max(count, 1)),
+        "result_store": store.memory_bytes(),
+        "ratio": round(store_bytes / owlready_bytes, 4) if owlready_bytes else None,
+    }
+
+
+def timed(fn, repeat, number=1):
+    """Run fn number times per sample, repeat samples; per-call milliseconds."""
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(number):
+            fn()
+        samples.append((time.perf_counter() - started) * 1000 / number)
+    return {
+        "median_ms": round(statistics.median(samples), 4),
+        "min_ms": round(min(samples), 4),
+        "max_ms": round(max(samples), 4),
+        "samples": repeat,
+        "calls_per_sample": number,
+    }
+
+
+def measure(ontology_path, participants, repeat):
+    """Child process: time the hot paths and routes against ontology_path."""
+    app = boot_app()
+    app.client = StubGroq()
+    onto = app.onto
+    question_ids = [q.id for q in app.scoring_engine.questions]
+    answers = synthetic_answers(question_ids, "measure")
+    raw_scores, percentages, _ = app.scoring_engine.score(answers)
+    rng = random.Random(0)
+    user_ids = [f"bench{rng.randrange(participants)}" for _ in range(100)] if participants else ["1"]
+    heavy = max(1, min(repeat, 3))  # whole-ontology parses and saves at 100k take seconds each
+    save_path = os.path.join(os.path.dirname(ontology_path), "save-target.rdf")
+
+    functions = {}
+    with contextlib.redirect_stdout(io.StringIO()):
+        # Clearing the signature forces the full reload path: parse, schema check, index and catalog
+        functions["load_ontology"] = timed(lambda: (setattr(app, "onto_file_signature", None), app.load_ontology(force_reload=True)), heavy)
+        # What most requests pay: force_reload is skipped while the file is unchanged
+        functions["load_ontology_unchanged"] = timed(lambda: app.load_ontology(force_reload=True), repeat)
+        onto = app.onto = app.load_ontology(force_reload=True)
+        # The reload bound a new World; prepare its queries here rather than inside a route timing
+        functions["prepare_sparql_queries"] = timed(lambda: app.ontology_queries.bind(onto).warm(), heavy)
+    questions = list(onto.search(type=onto.AssessmentQuestion))
+    functions["find_entity_by_id_hit"] = timed(
+        lambda: [app.find_entity_by_id(onto.Participant, f"Participant_{u}") for u in user_ids], repeat)
+    functions["find_entity_by_id_miss"] = timed(
+        lambda: app.find_entity_by_id(onto.Participant, "Participant_missing"), repeat, 10)
+    # Same record through the prepared SPARQL query and through the attribute walk it replaced
+    functions["participant_record_sparql"] = timed(
+        lambda: [app.read_participant_record(u, app.find_entity_by_id(onto.Participant, f"Participant_{u}")) for u in user_ids], repeat)
+    functions["participant_record_attribute_walk"] = timed(
+        lambda: [attribute_walk_record(app, onto, u) for u in user_ids], repeat)
+    functions["get_question_details_all"] = timed(lambda: [app.get_question_details(q) for q in questions], repeat)
+    functions["score_traits"] = timed(lambda: app.scoring_engine.score(answers), repeat, 100)
+    functions["score_role_fit"] = timed(lambda: app.score_role_fit(percentages), repeat, 100)
+    functions["score_role_fit_top10"] = timed(lambda: app.score_role_fit(percentages, 10), repeat, 100)
+    top_roles = list(app.score_role_fit(percentages, 10)[0])
+    functions["role_counterfactuals_top10"] = timed(lambda: app.role_counterfactuals(percentages, top_roles, 90.0), repeat, 10)
+    # Stored trait vectors walked out of the ontology vs read from the columnar result store
+    functions["stored_trait_rows_walk"] = timed(lambda: stored_trait_rows_walk(app), heavy)
+    functions["result_store_trait_matrix"] = timed(lambda: app.result_store.trait_matrix(app.role_catalog.matrix.traits), repeat)
+    functions["result_store_summary"] = timed(app.result_store.summary, repeat)
+    functions["export_sort_keys"] = timed(app.export_sort_keys, repeat)
+    with contextlib.redirect_stdout(io.StringIO()):
+        functions["rebuild_result_store"] = timed(lambda: app.rebuild_result_store(onto), heavy)
+    functions["calculate_performance_scores"] = timed(lambda: app.calculate_performance_scores(raw_scores), repeat, 100)
+    functions["similarity_nearest"] = timed(lambda: app.similarity_index.nearest(user_ids[0], 10), repeat, 10)
+    functions["onto_save"] = timed(lambda: onto.save(file=save_path, format="rdfxml"), heavy)
+    functions["question_count"] = len(questions)
+    if os.path.exists(save_path):
+        os.unlink(save_path)
+
+    client = app.app.test_client()
+    user = user_ids[0]
+    submit_keys = itertools.count()
+
+    def uncached(call):
+        """Time a per-participant route on a response-cache miss."""
+        def run():
+            app.participant_responses.invalidate(user)
+            return call()
+        return run
+
+    def revalidated(path):
+        """Time a conditional GET that comes back 304."""
+        etag = client.get(path).headers.get("ETag")
+        return lambda: client.get(path, headers={"If-None-Match": etag})
+
+    routes = {
+        "GET /get_questions": lambda: client.get("/get_questions"),
+        "GET /get_previous_result": lambda: client.get(f"/get_previous_result?id={user}"),
+        "GET /get_previous_result (uncached)": uncached(lambda: client.get(f"/get_previous_result?id={user}")),
+        "GET /get_previous_result (304)": revalidated(f"/get_previous_result?id={user}"),
+        "GET /api/justification/<id>": lambda: client.get(f"/api/justification/{user}"),
+        "GET /api/justification/<id> (uncached)": uncached(lambda: client.get(f"/api/justification/{user}")),
+        "GET /api/career-fit/<id>": lambda: client.get(f"/api/career-fit/{user}"),
+        "GET /api/career-fit/<id> (uncached)": uncached(lambda: client.get(f"/api/career-fit/{user}")),
+        "GET /api/career-fit/<id> (304)": revalidated(f"/api/career-fit/{user}"),
+        "GET /api/analysis/stream/<id>": lambda: client.get(f"/api/analysis/stream/{user}").get_data(),
+        "POST /validate_user": lambda: client.post("/validate_user", json={"id": user, "name": "Bench User"}),
+        "POST /api/score-batch": lambda: client.post("/api/score-batch", json={"responses": [{"id": "a", "answers": answers}] * 10}),
+        "POST /api/career-fit/batch": lambda: client.post("/api/career-fit/batch", json={"participants": "all"}),
+        "GET /api/similar/<id>": lambda: client.get(f"/api/similar/{user}"),
+        "GET /api/counterfactual/<id>": lambda: client.get(f"/api/counterfactual/{user}", query_string={"role": top_roles[-1], "score": 90}),
+        "GET /api/export/results": lambda: client.get("/api/export/results").get_data(),
+        "GET /api/results/summary": lambda: client.get("/api/results/summary"),
+        "GET /api/llm-cache/stats": lambda: client.get("/api/llm-cache/stats"),
+        # A fresh Idempotency-Key per call times the full submit; the replay reuses a stored response
+        "POST /submit_assessment": lambda: client.post(
+            "/submit_assessment", json={"id": "bench-submit", "name": "Bench Submit", "answers": answers},
+            headers={"Idempotency-Key": f"bench-{next(submit_keys)}"}),
+        "POST /submit_assessment (replay)": lambda: client.post(
+            "/submit_assessment", json={"id": "bench-submit", "name": "Bench Submit", "answers": answers},
+            headers={"Idempotency-Key": "bench-replay"}),
+    }
+    # Count persist_ontology calls per route: read routes should not write in steady state
+    persist_calls = [0]
+    persist_ontology = app.persist_ontology
+
+    def counting_persist(o):
+        persist_calls[0] += 1
+        return persist_ontology(o)
+
+    app.persist_ontology = counting_persist
+    route_timings = {}
+    with contextlib.redirect_stdout(io.StringIO()):
+        for name, call in routes.items():
+            status = call().status_code if not name.startswith(("GET /api/analysis", "GET /api/export")) else 200
+            persist_calls[0] = 0
+            route_timings[name] = dict(timed(call, repeat), status=status)
+            route_timings[name]["persists_per_call"] = round(persist_calls[0] / repeat, 2)
+        app.ontology_writer.flush()
+    app.persist_ontology = persist_ontology
+
+    return {"participants": participants, "roles": len(app.role_catalog), "functions": functions, "routes": route_timings, "groq_stub_calls": app.client.calls}
+
+
+def compare(results, baseline):
+    """Print the median change of every timing present in both runs."""
+    for size, current in results["sizes"].items():
+        previous = baseline.get("sizes", {}).get(size)
+        if not previous:
+            continue
+        for group in ("functions", "routes"):
+            for name, timing in current.get(group, {}).items():
+                before = previous.get(group, {}).get(name)
+                if not isinstance(timing, dict) or not isinstance(before, dict) or not before.get("median_ms"):
+                    continue
+                change = (timing["median_ms"] - before["median_ms"]) / before["median_ms"] * 100
+                print(f"{size:>7} {name:<40} {before['median_ms']:>11.3f} -> {timing['median_ms']:>11.3f} ms ({change:+.1f}%)")
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR, capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] in ("--generate-child", "--measure-child", "--memory-child"):
+        mode, ontology_path, participants = sys.argv[1], sys.argv[2], int(sys.argv[3])
+        if mode == "--generate-child":
+            result = generate(ontology_path, participants, int(sys.argv[4]))
+        elif mode == "--memory-child":
+            result = memory(ontology_path)
+        else:
+            result = measure(ontology_path, participants, int(sys.argv[4]))
+        print(json.dumps(result))
+        return 0
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="100,10000,100000", help="comma-separated participant counts")
+    parser.add_argument("--roles", type=int, default=0, help="synthetic career roles to add to the catalog")
+    parser.add_argument("--repeat", type=int, default=5, help="samples per timing")
+    parser.add_argument("--cache-dir", help="keep generated ontologies here and reuse them on later runs")
+    parser.add_argument("--output", help="also write the results to this JSON file")
+    parser.add_argument("--baseline", help="previous results JSON to compare medians against")
+    args = parser.parse_args()
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+
+    workdir = tempfile.mkdtemp(prefix="hot-paths-")
+    cache_dir = args.cache_dir or workdir
+    os.makedirs(cache_dir, exist_ok=True)
+    results = {"python": sys.version.split()[0], "revision": git_revision(), "repeat": args.repeat, "sizes": {}}
+    try:
+        for size in sizes:
+            # The generated file depends on the seed ontology and the schema, so cache per both
+            with open(os.path.join(BACKEND_DIR, "project.rdf"), "rb") as fh:
+                seed_size = len(fh.read())
+            roles_tag = f"-roles{args.roles}" if args.roles else ""
+            cached = os.path.join(cache_dir, f"synthetic-{size}-{seed_size}{roles_tag}.rdf")
+            entry = {}
+            if not os.path.exists(cached):
+                shutil.copyfile(os.path.join(BACKEND_DIR, "project.rdf"), cached + ".partial")
+                entry["generate"] = run_child("--generate-child", cached + ".partial", size, args.roles)
+                os.replace(cached + ".partial", cached)
+            # Measure on a scratch copy: the submit route writes to it
+            scratch = os.path.join(workdir, f"measure-{size}", "project.rdf")
+            os.makedirs(os.path.dirname(scratch), exist_ok=True)
+            shutil.copyfile(cached, scratch)
+            entry.update(run_child("--measure-child", scratch, size, args.repeat))
+            entry["memory"] = run_child("--memory-child", cached, size)
+            entry["file_bytes"] = os.path.getsize(cached)
+            results["sizes"][str(size)] = entry
+            print(f"⏱️ {size} participants measured", file=sys.stderr)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    print(json.dumps(results, indent=2))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fh:
+            json.dump(results, fh, indent=2)
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as fh:
+            compare(results, json.load(fh))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,76 @@
+"""Measure backend boot time, with and without the ontology boot snapshot.
+
+Each run starts a fresh interpreter that imports app.py against a temporary copy of
+project.rdf and reports the wall time of the import plus app.startup_timings. The first
+run of each mode is a warm-up (it stamps the schema and, in snapshot mode, writes the
+snapshot) and is not counted.
+
+Usage (from backend/): python benchmarks/startup_time.py [--runs 5] [--output startup.json]
+"""
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = """
+import contextlib, io, json, time
+started = time.perf_counter()
+with contextlib.redirect_stdout(io.StringIO()):
+    import app
+timings = dict(app.startup_timings, import_ms=round((time.perf_counter() - started) * 1000, 1))
+print(json.dumps(timings))
+"""
+
+
+def boot_once(env):
+    out = subprocess.run(
+        [sys.executable, "-c", PROBE], cwd=BACKEND_DIR, env=env, check=True, capture_output=True, text=True,
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def measure(mode, runs, workdir):
+    env = dict(os.environ, ONTOLOGY_PATH=os.path.join(workdir, "project.rdf"), ONTOLOGY_STORAGE="rdfxml", GROQ_API_KEY="")
+    env.pop("ONTOLOGY_BOOT_SNAPSHOT", None)
+    if mode == "snapshot":
+        env["ONTOLOGY_BOOT_SNAPSHOT"] = os.path.join(workdir, "boot.sqlite3")
+    boot_once(env)
+    samples = [boot_once(env) for _ in range(runs)]
+    summary = {"mode": mode, "runs": runs, "ontology_source": samples[-1].get("ontology_source")}
+    for key in ("import_ms", "startup_ms", "ontology_load_ms"):
+        values = [s[key] for s in samples if key in s]
+        if values:
+            summary[f"{key}_median"] = round(statistics.median(values), 1)
+            summary[f"{key}_min"] = min(values)
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--output", help="also write the results to this JSON file")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="startup-")
+    try:
+        shutil.copyfile(os.path.join(BACKEND_DIR, "project.rdf"), os.path.join(workdir, "project.rdf"))
+        results = {"python": sys.version.split()[0], "modes": [measure(m, args.runs, workdir) for m in ("rdfxml", "snapshot")]}
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    print(json.dumps(results, indent=2))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fh:
+            json.dump(results, fh, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
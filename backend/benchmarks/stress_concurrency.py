@@ -0,0 +1,162 @@
+"""Concurrency stress test: parallel submits and reads against a threaded server.
+
+The app runs on a temporary copy of project.rdf (the real file is never touched) and the
+script checks that
+- every read returns a complete score set from one of the user's submits (no torn reads),
+- each participant ends with the scores of its last submit (no lost updates),
+- the saved file reloads with exactly one Participant and one Assessment per user.
+
+Usage (from backend/): python benchmarks/stress_concurrency.py [--users 16] [--rounds 4] [--readers 8]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import logging
+import os
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def http_json(base, path, payload=None):
+    data = json.dumps(payload).encode("utf-8") if payload is not None else None
+    req = urllib.request.Request(base + path, data=data, headers={"Content-Type": "application/json"})
+    with urllib.request.urlopen(req, timeout=120) as resp:
+        return json.loads(resp.read())
+
+
+def answers_for(question_ids, user, round_no):
+    rng = random.Random(f"{user}:{round_no}")
+    return {q_id: rng.randint(1, 5) for q_id in question_ids}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=16)
+    parser.add_argument("--rounds", type=int, default=4, help="submits per user, run sequentially per user")
+    parser.add_argument("--readers", type=int, default=8, help="threads issuing reads while submits run")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="stress-")
+    ontology_path = os.path.join(workdir, "project.rdf")
+    shutil.copyfile(os.path.join(BACKEND_DIR, "project.rdf"), ontology_path)
+    os.environ["ONTOLOGY_PATH"] = ontology_path
+    os.environ["ONTOLOGY_STORAGE"] = "rdfxml"
+    os.environ["GROQ_API_KEY"] = ""  # no network calls; load_dotenv does not override it
+    os.environ.pop("LLM_CACHE_PATH", None)
+    sys.path.insert(0, BACKEND_DIR)
+
+    from werkzeug.serving import make_server
+    from owlready2 import World
+
+    logging.getLogger("werkzeug").setLevel(logging.ERROR)
+    log = io.StringIO()
+    with contextlib.redirect_stdout(log):
+        import app as backend
+
+        server = make_server("127.0.0.1", 0, backend.app, threaded=True)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        base = f"http://127.0.0.1:{server.server_port}"
+
+        question_ids = [q["id"] for q in http_json(base, "/get_questions")]
+        users = [f"stress{i}" for i in range(args.users)]
+        versions = {
+            user: [backend.scoring_engine.score(answers_for(question_ids, user, r))[2] for r in range(args.rounds)]
+            for user in users
+        }
+
+        errors = []
+        stats = {"submits": 0, "reads": 0}
+        stats_lock = threading.Lock()
+        writers_done = threading.Event()
+
+        def writer(user):
+            for r in range(args.rounds):
+                body = {"id": user, "name": user.title(), "answers": answers_for(question_ids, user, r)}
+                try:
+                    result = http_json(base, "/submit_assessment", body)
+                    if result["scores"] != versions[user][r]:
+                        errors.append(f"{user} round {r}: submit returned {result['scores']}")
+                except Exception as exc:
+                    errors.append(f"{user} round {r}: submit failed: {exc}")
+                with stats_lock:
+                    stats["submits"] += 1
+
+        def reader(seed):
+            rng = random.Random(seed)
+            while not writers_done.is_set():
+                user = rng.choice(users)
+                try:
+                    prev = http_json(base, f"/get_previous_result?id={user}")
+                    if prev.get("found") and prev["scores"] not in versions[user]:
+                        errors.append(f"{user}: torn read {prev['scores']}")
+                    fit = http_json(base, f"/api/career-fit/{user}")
+                    if fit.get("message") == "internal error":
+                        errors.append(f"{user}: career-fit failed")
+                except Exception as exc:
+                    errors.append(f"{user}: read failed: {exc}")
+                with stats_lock:
+                    stats["reads"] += 2
+
+        started = time.perf_counter()
+        threads = [threading.Thread(target=writer, args=(u,)) for u in users]
+        readers = [threading.Thread(target=reader, args=(i,)) for i in range(args.readers)]
+        for t in threads + readers:
+            t.start()
+        for t in threads:
+            t.join()
+        writers_done.set()
+        for t in readers:
+            t.join()
+        elapsed = time.perf_counter() - started
+
+        for user in users:
+            final = http_json(base, f"/get_previous_result?id={user}")
+            if final.get("scores") != versions[user][-1]:
+                errors.append(f"{user}: lost update, final scores {final.get('scores')}")
+
+        server.shutdown()
+        backend.ontology_writer.flush()
+
+        reloaded = World().get_ontology(ontology_path).load()
+        names = [p.name for p in reloaded.Participant.instances()] + [a.name for a in reloaded.Assessment.instances()]
+        for user in users:
+            for prefix in ("Participant_", "Assessment_"):
+                count = names.count(f"{prefix}{user}")
+                if count != 1:
+                    errors.append(f"{prefix}{user}: {count} individuals on disk")
+            stored = {
+                ts.name.rsplit("_", 1)[-1]: f"{round(float(ts.meanScore[0]), 2)}%"
+                for ts in reloaded.TraitScore.instances()
+                if ts.name.startswith(f"Score_{user}_") and ts.meanScore
+            }
+            if stored != versions[user][-1]:
+                errors.append(f"{user}: saved scores {stored} differ from last submit")
+
+    report = {
+        "users": args.users,
+        "rounds": args.rounds,
+        "readers": args.readers,
+        "submits": stats["submits"],
+        "reads": stats["reads"],
+        "seconds": round(elapsed, 3),
+        "requests_per_second": round((stats["submits"] + stats["reads"]) / elapsed, 1) if elapsed else None,
+        "writer": backend.ontology_writer.stats(),
+        "errors": errors[:20],
+        "error_count": len(errors),
+    }
+    print(json.dumps(report, indent=2))
+    shutil.rmtree(workdir, ignore_errors=True)
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,92 @@
+"""Prebuilt SQLite copy of a parsed owlready2 World, so a worker can boot without parsing RDF/XML."""
+
+import hashlib
+import os
+import shutil
+import sqlite3
+import tempfile
+
+from owlready2 import World
+
+META_TABLE = "boot_snapshot_meta"
+
+
+def file_digest(path):
+    """SHA-256 of a file's bytes, or None when it cannot be read."""
+    digest = hashlib.sha256()
+    try:
+        with open(path, "rb") as fh:
+            for block in iter(lambda: fh.read(1 << 20), b""):
+                digest.update(block)
+    except OSError:
+        return None
+    return digest.hexdigest()
+
+
+def write_snapshot(world, path, meta):
+    """Back the World's quadstore up into path (atomically) with a small key/value meta table.
+
+    The World's open transaction is committed first so the copy contains everything loaded
+    into it.
+    """
+    world.save()
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix=".boot_snapshot.", suffix=".tmp", dir=directory)
+    os.close(fd)
+    try:
+        target = sqlite3.connect(tmp_path)
+        try:
+            world.graph.db.backup(target)
+            # A World booted from a snapshot already carries the table
+            target.execute(f"DROP TABLE IF EXISTS {META_TABLE}")
+            target.execute(f"CREATE TABLE {META_TABLE} (key TEXT PRIMARY KEY, value TEXT)")
+            target.executemany(f"INSERT INTO {META_TABLE} VALUES (?, ?)", [(str(k), str(v)) for k, v in meta.items()])
+            target.commit()
+        finally:
+            target.close()
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def read_meta(path):
+    """Return the snapshot's meta table as a dict, or None when there is no usable snapshot."""
+    if not os.path.exists(path):
+        return None
+    try:
+        conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+        try:
+            return dict(conn.execute(f"SELECT key, value FROM {META_TABLE}").fetchall())
+        finally:
+            conn.close()
+    except sqlite3.Error:
+        return None
+
+
+def open_snapshot(path):
+    """Open a private copy of the snapshot as a World; returns (world, copy_path).
+
+    Working on a copy keeps the snapshot pristine while the process mutates its World, and
+    lets several workers boot from the same file.
+    """
+    fd, copy_path = tempfile.mkstemp(prefix="ontology-boot-", suffix=".sqlite3")
+    os.close(fd)
+    shutil.copyfile(path, copy_path)
+    return World(filename=copy_path, exclusive=False), copy_path
+
+
+def discard_snapshot_copy(world, copy_path):
+    """Close a World opened by open_snapshot and delete its private copy."""
+    try:
+        world.close()
+    except Exception:
+        pass
+    for suffix in ("", "-journal", "-wal", "-shm"):
+        try:
+            os.unlink(copy_path + suffix)
+        except OSError:
+            pass
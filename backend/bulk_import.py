@@ -0,0 +1,75 @@
+"""Streaming parsers for bulk assessment imports (CSV or JSON Lines of {id, name, answers})."""
+
+import csv
+import io
+import json
+from itertools import islice
+
+FORMATS = ("jsonl", "csv")
+
+
+def detect_format(filename=None, content_type=None, default="jsonl"):
+    """Guess the import format from a file name or Content-Type header."""
+    hint = f"{filename or ''} {content_type or ''}".lower()
+    if "csv" in hint:
+        return "csv"
+    if "jsonl" in hint or "ndjson" in hint or "json" in hint:
+        return "jsonl"
+    return default
+
+
+def iter_jsonl(lines):
+    """Yield (line_no, record, error) for each non-blank JSON line."""
+    for line_no, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as exc:
+            yield line_no, None, f"Invalid JSON: {exc}"
+            continue
+        if not isinstance(record, dict):
+            yield line_no, None, "Each line must be a JSON object"
+            continue
+        yield line_no, record, None
+
+
+def iter_csv(lines):
+    """Yield (line_no, record, error) for each CSV row.
+
+    The header must contain id and name, plus either an answers column holding a JSON object
+    or one column per question id (Q1, Q2, ...). Empty answer cells are treated as unanswered.
+    """
+    reader = csv.DictReader(lines)
+    for row in reader:
+        line_no = reader.line_num
+        row = {(k or "").strip(): v for k, v in row.items()}
+        record = {"id": row.pop("id", None), "name": row.pop("name", None)}
+        if "answers" in row:
+            try:
+                record["answers"] = json.loads(row["answers"] or "{}")
+            except ValueError as exc:
+                yield line_no, None, f"Invalid answers JSON: {exc}"
+                continue
+        else:
+            record["answers"] = {q_id: value.strip() for q_id, value in row.items() if q_id and value and value.strip()}
+        yield line_no, record, None
+
+
+def iter_records(stream, fmt):
+    """Yield (line_no, record, error) from a binary or text stream without reading it all."""
+    if fmt not in FORMATS:
+        raise ValueError(f"Unsupported import format '{fmt}' (expected one of {', '.join(FORMATS)})")
+    if not isinstance(stream, io.TextIOBase):
+        stream = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    return iter_csv(stream) if fmt == "csv" else iter_jsonl(stream)
+
+
+def chunked(iterable, size):
+    """Yield lists of up to size items."""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
@@ -0,0 +1,142 @@
+"""One-pass maintenance of the ontology: collapse duplicates, drop orphans and stale literals."""
+
+import io
+import time
+
+from owlready2 import World, destroy_entity
+
+from entity_index import EntityIndex, SCORE_PREFIX
+
+# Properties the app treats as single-valued, with the position it reads ([-1] = newest
+# write, [0] = first). Extra values are left behind by older write paths and never read.
+SINGLE_VALUED_PROPERTIES = {
+    "jobPerformance": -1,
+    "academicPerformance": -1,
+    "hasJustificationReport": -1,
+    "hasAnalysisReport": -1,
+    "resultUpdatedAt": -1,
+    "meanScore": 0,
+}
+
+
+def incoming_references(world, entity):
+    """(subject, property) pairs whose value list contains entity."""
+    return [(s, p) for s, p in world.sparql("SELECT ?s ?p WHERE { ?s ?p ?? }", [entity]) if hasattr(p, "python_name")]
+
+
+def redirect_references(world, old, new):
+    """Point every reference to old at new instead (without duplicating new in a value list)."""
+    for subject, prop in incoming_references(world, old):
+        values = list(getattr(subject, prop.python_name, None) or [])
+        replaced = []
+        for value in values:
+            value = new if value is old else value
+            if value not in replaced:
+                replaced.append(value)
+        setattr(subject, prop.python_name, replaced)
+
+
+def merge_into(world, keeper, duplicates, index):
+    """Redirect references from duplicates to keeper, then destroy the duplicates."""
+    for dup in duplicates:
+        redirect_references(world, dup, keeper)
+        index.forget(dup)
+        destroy_entity(dup)
+    return len(duplicates)
+
+
+def collapse_duplicates(onto, index, report):
+    """Merge individuals sharing a name, then participants sharing a participantID.
+
+    The keeper is the individual the app already resolves (EntityIndex lookup order, which
+    prefers the canonical Participant_<id>), so reads return the same data afterwards.
+    """
+    world = onto.world
+    for name, group in list(index.duplicate_groups()):
+        keeper = index.lookup(name)
+        kind = type(keeper).__name__
+        report["duplicates_merged"][kind] = report["duplicates_merged"].get(kind, 0) + merge_into(
+            world, keeper, [e for e in group if e is not keeper], index)
+
+    by_participant_id = {}
+    for participant in onto.search(type=onto.Participant):
+        ids = {str(pid) for pid in getattr(participant, "participantID", None) or []}
+        if len(ids) == 1:  # participants carrying several ids are ambiguous; leave them alone
+            by_participant_id.setdefault(ids.pop(), []).append(participant)
+    for participant_id, group in by_participant_id.items():
+        keeper = index.participant_by_id(participant_id)
+        if len(group) > 1 and keeper is not None:
+            dups = [p for p in group if p is not keeper]
+            report["duplicates_merged"]["Participant"] = report["duplicates_merged"].get("Participant", 0) + merge_into(
+                world, keeper, dups, index)
+            report["participants_collapsed"].append({"id": participant_id, "kept": keeper.name, "removed": [p.name for p in dups]})
+
+    # Assessment score lists may now name the same TraitScore twice
+    for assessment in onto.search(type=onto.Assessment):
+        scores = list(getattr(assessment, "hasScore", None) or [])
+        unique = list(dict.fromkeys(scores))
+        if len(unique) != len(scores):
+            assessment.hasScore = unique
+
+
+def drop_orphaned_trait_scores(onto, index, report):
+    """Destroy app-written Score_<id>_<Trait> individuals nothing references and no user owns.
+
+    A score whose participant still exists is kept even when detached, because the app reads
+    per-user scores by name. Hand-authored TraitScores (e.g. the schema's examples) are never
+    touched.
+    """
+    world = onto.world
+    referenced = {row[0] for row in world.sparql("SELECT DISTINCT ?o WHERE { ?s ?p ?o . ?o a ?? }", [onto.TraitScore])}
+    for ts in list(onto.search(type=onto.TraitScore)):
+        if ts in referenced or not ts.name.startswith(SCORE_PREFIX) or "_" not in ts.name[len(SCORE_PREFIX):]:
+            continue
+        user_id = ts.name[len(SCORE_PREFIX):].rsplit("_", 1)[0]
+        if index.participant(user_id) or index.participant_by_id(user_id) or index.assessment(user_id):
+            continue
+        report["orphaned_trait_scores_dropped"].append(ts.name)
+        index.forget(ts)
+        destroy_entity(ts)
+
+
+def drop_stale_literals(onto, report):
+    """Trim single-valued properties to the one value the app reads."""
+    classes = [getattr(onto, name, None) for name in ("Participant", "TraitScore")]
+    for cls in [c for c in classes if c is not None]:
+        for individual in onto.search(type=cls):
+            for prop_name, position in SINGLE_VALUED_PROPERTIES.items():
+                values = getattr(individual, prop_name, None)
+                if values and len(values) > 1:
+                    report["stale_literals_dropped"] += len(values) - 1
+                    setattr(individual, prop_name, [values[position]])
+
+
+def compact(onto):
+    """Run every pass on onto (call inside `with onto:`); returns what was changed."""
+    report = {
+        "duplicates_merged": {},
+        "participants_collapsed": [],
+        "orphaned_trait_scores_dropped": [],
+        "stale_literals_dropped": 0,
+    }
+    index = EntityIndex().build(onto)
+    collapse_duplicates(onto, index, report)
+    drop_orphaned_trait_scores(onto, index, report)
+    drop_stale_literals(onto, report)
+    return report
+
+
+def rdfxml_bytes(onto):
+    buf = io.BytesIO()
+    onto.save(file=buf, format="rdfxml")
+    return buf.getvalue()
+
+
+def parse_milliseconds(data, base_iri):
+    """Time a cold parse of serialized RDF/XML into a throwaway World."""
+    started = time.perf_counter()
+    world = World()
+    world.get_ontology(base_iri).load(fileobj=io.BytesIO(data))
+    elapsed = (time.perf_counter() - started) * 1000
+    world.close()
+    return round(elapsed, 1)
@@ -0,0 +1,278 @@
+"""Exact role-fit counterfactuals: marginal gains, cheapest score targets and rank-first search."""
+
+import math
+
+import numpy as np
+
+
+class CounterfactualEngine:
+    """What-if analysis of one participant's trait vector against every role of a RoleFitMatrix.
+
+    A role's fit is 100 * sum(w * max(0, 1 - |trait - target| / 100)) / sum(w), so each trait adds
+    a piecewise-linear term with one kink at its target: moving toward the target gains w / sum(w)
+    fit points per trait point, moving away loses as much. Changes are counted in answer points:
+    one Likert point on one item moves a trait by steps[t] percentage points (100 / (5 * items)),
+    the smallest change a participant can actually make, within [low, high].
+
+    Per-trait contribution vectors (one value per role) are cached per grid position, so every
+    query against the same participant shares them.
+    """
+
+    def __init__(self, matrix, trait_scores, steps, low=20.0, high=100.0):
+        self.matrix = matrix
+        self.roles = matrix.roles
+        self.role_index = {role: r for r, role in enumerate(self.roles)}
+        self.traits = matrix.traits
+        T = len(self.traits)
+        self.x = matrix.trait_matrix([trait_scores])[0]
+        self.steps = np.array([float(steps.get(t, 0.0)) for t in self.traits], dtype=np.float64)
+        self.low, self.high = float(low), float(high)
+        # Dense (R, T) targets and per-point rates (w / sum(w)); traits a role ignores get rate 0
+        self.targets = np.zeros((len(self.roles), T), dtype=np.float64)
+        self.rates = np.zeros((len(self.roles), T), dtype=np.float64)
+        rows = np.arange(len(self.roles))
+        for k in range(matrix.targets.shape[1]):
+            columns = matrix.trait_columns[:, k]
+            weighted = matrix.weights[:, k] != 0
+            self.targets[rows[weighted], columns[weighted]] = matrix.targets[weighted, k]
+            self.rates[rows[weighted], columns[weighted]] = matrix.weights[weighted, k] / matrix.total_weight[weighted]
+        movable = (self.steps > 0) & (self.x >= self.low - 1e-9) & (self.x <= self.high + 1e-9)
+        # Offsets (in answer points) each trait can move down / up without leaving [low, high]
+        self.min_offset = np.where(movable, -np.floor((self.x - self.low) / np.where(movable, self.steps, 1) + 1e-9), 0).astype(int)
+        self.max_offset = np.where(movable, np.floor((self.high - self.x) / np.where(movable, self.steps, 1) + 1e-9), 0).astype(int)
+        self._contributions = {}
+        self._gains = None
+        self.current = self.displayed(np.zeros(T, dtype=int))
+
+    def _contribution(self, t, offset):
+        """(R,) fit points trait t adds to every role at the given answer-point offset."""
+        key = (t, offset)
+        vector = self._contributions.get(key)
+        if vector is None:
+            value = self.x[t] + offset * self.steps[t]
+            vector = 100.0 * self.rates[:, t] * np.maximum(0.0, 1.0 - np.abs(value - self.targets[:, t]) / 100.0)
+            self._contributions[key] = vector
+        return vector
+
+    def displayed(self, offsets):
+        """(R,) fit scores exactly as score_role_fit reports them, after moving by offsets."""
+        return self.matrix.scores(self.x + np.asarray(offsets) * self.steps)[0]
+
+    def raw_scores(self, offsets):
+        """(R,) unrounded fit scores after moving by offsets, summed from the cached contributions."""
+        total = np.zeros(len(self.roles), dtype=np.float64)
+        for t, offset in enumerate(offsets):
+            total = total + self._contribution(t, int(offset))
+        return np.clip(total, 0.0, 100.0)
+
+    def changes(self, offsets):
+        return {self.traits[t]: round(float(o * self.steps[t]), 2) for t, o in enumerate(offsets) if o}
+
+    def marginal_gains(self):
+        """(up, down): (R, T) exact fit change of every role for one answer point up / down per trait.
+
+        Zero where the trait is already at the edge of its range.
+        """
+        T = len(self.traits)
+        here = np.stack([self._contribution(t, 0) for t in range(T)], axis=1)
+        up = np.stack([self._contribution(t, 1) if self.max_offset[t] >= 1 else self._contribution(t, 0) for t in range(T)], axis=1)
+        down = np.stack([self._contribution(t, -1) if self.min_offset[t] <= -1 else self._contribution(t, 0) for t in range(T)], axis=1)
+        return up - here, down - here
+
+    def trait_gains(self, role):
+        """{trait: {"up", "down"}} change in role's fit for one answer point each way, per weighted trait."""
+        if self._gains is None:
+            self._gains = self.marginal_gains()
+        r = self.role_index[role]
+        up, down = self._gains
+        return {
+            self.traits[t]: {"up": round(float(up[r, t]), 4), "down": round(float(down[r, t]), 4)}
+            for t in np.flatnonzero(self.rates[r] > 0).tolist()
+        }
+
+    def _step_groups(self, roles):
+        """Per role and trait, the gains of answer points moved toward the target, best first.
+
+        Every trait offers `full` points at rate * step each, then possibly one point that crosses
+        the target and gains less; after that every point loses. The gains along a trait never
+        increase, so the best k points overall are the k largest group values (exchange argument).
+        Returns (values, counts, traits, directions), each (len(roles), 2T), sorted by value.
+        """
+        tau, rate = self.targets[roles], self.rates[roles]
+        gap = tau - self.x
+        direction = np.where(gap >= 0, 1, -1)
+        room = np.where(direction > 0, self.max_offset, -self.min_offset)
+        step = np.where(self.steps > 0, self.steps, np.inf)
+        full = np.minimum(np.floor(np.abs(gap) / step + 1e-9), room)
+        remainder = np.abs(gap) - full * self.steps
+        crossing_ok = (remainder > 1e-9) & (full < room)
+        crossing = np.where(crossing_ok, rate * (2 * remainder - self.steps), 0.0)
+        values = np.concatenate([rate * self.steps, crossing], axis=1)
+        counts = np.concatenate([full, (crossing > 1e-12).astype(float)], axis=1)
+        counts = np.where(values > 1e-12, counts, 0)
+        T = len(self.traits)
+        trait_of = np.tile(np.arange(2 * T) % T, (len(roles), 1))
+        dirs = np.concatenate([direction, direction], axis=1)
+        order = np.argsort(-values, axis=1, kind="stable")
+        pick = lambda a: np.take_along_axis(a, order, axis=1)
+        return pick(values), pick(counts), pick(trait_of), pick(dirs)
+
+    def points_to_score(self, score, roles=None):
+        """(len(roles),) fewest answer points that lift each role's fit to at least score (inf if never)."""
+        roles = np.arange(len(self.roles)) if roles is None else np.asarray(roles, dtype=np.intp)
+        current = self.raw_scores(np.zeros(len(self.traits), dtype=int))[roles]
+        need = score - current - 1e-9
+        values, counts, _, _ = self._step_groups(roles)
+        gained = np.cumsum(values * counts, axis=1)
+        used = np.cumsum(counts, axis=1)
+        reached = gained >= need[:, None]
+        first = np.argmax(reached, axis=1)
+        rows = np.arange(len(roles))
+        prev_gain = np.where(first > 0, gained[rows, first - 1], 0.0)
+        prev_used = np.where(first > 0, used[rows, first - 1], 0.0)
+        value = values[rows, first]
+        extra = np.ceil(np.maximum(0.0, need - prev_gain) / np.where(value > 0, value, 1) - 1e-9)
+        points = np.where(reached.any(axis=1), prev_used + np.maximum(extra, 0), np.inf)
+        return np.where(need <= 0, 0, points)
+
+    def plan_score(self, role, score):
+        """Cheapest answer-point changes lifting role's fit to at least score, or None if out of reach."""
+        r = self.role_index[role]
+        current = self.raw_scores(np.zeros(len(self.traits), dtype=int))[r]
+        need = score - current - 1e-9
+        offsets = np.zeros(len(self.traits), dtype=int)
+        if need > 0:
+            values, counts, traits, dirs = (a[0] for a in self._step_groups(np.array([r])))
+            for value, count, t, direction in zip(values.tolist(), counts.tolist(), traits.tolist(), dirs.tolist()):
+                if need <= 0 or value <= 0:
+                    break
+                take = int(min(count, math.ceil(need / value - 1e-9)))
+                offsets[t] += direction * take
+                need -= take * value
+            if need > 0:
+                return None
+        return self._plan(r, offsets, "score", target_score=score)
+
+    @staticmethod
+    def _is_first(rounded, r):
+        """Row r ranks first under the displayed (rounded) scores; ties go to the earlier role."""
+        return rounded[r] > np.max(rounded[:r], initial=-np.inf) and rounded[r] >= np.max(rounded[r + 1:], initial=-np.inf)
+
+    def plan_rank_first(self, role, max_states=5000):
+        """Fewest answer-point changes after which role ranks first, or None if impossible / not found.
+
+        Competitors are added lazily (constraint generation): the search runs against the roles
+        that currently beat role, the result is checked against the whole catalog, and any role
+        that would still come first joins the set for the next round. A search over fewer
+        competitors can only be cheaper, so the first plan that survives the full check is
+        optimal, and each round starts from the previous round's cost. max_states bounds the
+        search nodes visited over all rounds.
+        """
+        r = self.role_index[role]
+        current = self.current
+        competitors = set(np.flatnonzero(current >= current[r]).tolist()) - {r}
+        budget, cost = max_states, 0
+        while True:
+            offsets, visited = self._search(r, sorted(competitors | {r}), budget, cost)
+            budget -= visited
+            if offsets is None:
+                return None
+            after = self.displayed(offsets)
+            if self._is_first(after, r):
+                return self._plan(r, offsets, "rank_first")
+            cost = int(np.abs(offsets).sum())
+            competitors |= set(np.flatnonzero(after >= after[r]).tolist()) - {r}
+
+    def _search(self, r, subset, max_states, min_cost=0):
+        """Cheapest offsets after which role r ranks first among subset (catalog indices).
+
+        Fit is separable per trait, so r's lead over each competitor is a sum of per-trait terms.
+        reach[t][j, b] is the largest lead over competitor j that traits t.. can produce with at
+        most b answer points (a max-plus dynamic programme). The search deepens the total number
+        of answer points from the best single-competitor bound, assigns traits one at a time and
+        drops every branch where some competitor can no longer be caught with the points left,
+        so the first plan found is optimal. Rounding to 0.01 is checked exactly at the leaves.
+        Returns (offsets or None, nodes visited).
+        """
+        T = len(self.traits)
+        sub = np.asarray(subset, dtype=np.intp)
+        pos = int(np.searchsorted(sub, r))
+        others = np.delete(np.arange(len(sub)), pos)
+        rates, targets = self.rates[sub], self.targets[sub]
+        zero = -self.min_offset
+        span = np.maximum(zero, self.max_offset)
+        most = int(span.sum())
+        # leads[t][i, j]: r's fit minus competitor j's from trait t at offset min_offset[t] + i
+        leads = []
+        for t in range(T):
+            values = self.x[t] + np.arange(self.min_offset[t], self.max_offset[t] + 1) * self.steps[t]
+            table = 100.0 * rates[:, t] * np.maximum(0.0, 1.0 - np.abs(values[:, None] - targets[:, t]) / 100.0)
+            leads.append(table[:, pos:pos + 1] - table[:, others])
+        reach = [None] * T + [np.zeros((len(others), most + 1))]
+        for t in reversed(range(T)):
+            below = reach[t + 1]
+            table = np.full_like(below, -np.inf)
+            for k in range(int(span[t]) + 1):
+                rows = [zero[t] + d for d in {k, -k} if 0 <= zero[t] + d < len(leads[t])]
+                if rows:
+                    gain = leads[t][rows].max(axis=0)
+                    table[:, k:] = np.maximum(table[:, k:], gain[:, None] + below[:, :most + 1 - k])
+            reach[t] = table
+        # A raw lead of -0.01 or less can never round to a tie
+        floor = -0.01 - 1e-9
+        possible = reach[0] >= floor
+        if not possible[:, -1].all():
+            return None, 0
+        lower = int(np.max(np.argmax(possible, axis=1), initial=0))
+
+        visited = 0
+        offsets = np.zeros(T, dtype=int)
+
+        def assign(t, lead, points):
+            """Place exactly `points` answer points on traits t.. given the lead built so far."""
+            nonlocal visited
+            visited += 1
+            if t == T - 1:
+                for d in sorted({points, -points}):
+                    i = zero[t] + d
+                    if 0 <= i < len(leads[t]) and np.all(lead + leads[t][i] >= floor):
+                        offsets[t] = d
+                        if self._is_first(self.matrix.scores(self.x + offsets * self.steps, roles=sub)[0], pos):
+                            return True
+                offsets[t] = 0
+                return False
+            for d in sorted(range(-min(points, zero[t]), min(points, self.max_offset[t]) + 1), key=abs):
+                rest = lead + leads[t][zero[t] + d]
+                if np.all(rest + reach[t + 1][:, points - abs(d)] >= floor):
+                    offsets[t] = d
+                    if assign(t + 1, rest, points - abs(d)):
+                        return True
+                    if visited >= max_states:
+                        return False
+            offsets[t] = 0
+            return False
+
+        for points in range(max(lower, min_cost), most + 1):
+            if assign(0, np.zeros(len(others)), points):
+                return offsets.copy(), visited
+            if visited >= max_states:
+                break
+        return None, visited
+
+    def _plan(self, r, offsets, goal, target_score=None):
+        after = self.displayed(offsets)
+        ranking = self.matrix.top_roles(after, 2).tolist()
+        plan = {
+            "role": self.roles[r],
+            "goal": goal,
+            "answer_points": int(np.abs(offsets).sum()),
+            "total_change": round(float(np.abs(offsets * self.steps).sum()), 2),
+            "changes": self.changes(offsets),
+            "score_before": float(self.current[r]),
+            "score_after": float(after[r]),
+            "rank_after": int(np.sum(after > after[r]) + np.sum(after[:r] == after[r]) + 1),
+            "top_role_after": self.roles[ranking[0]] if ranking else None,
+        }
+        if target_score is not None:
+            plan["target_score"] = target_score
+        return plan
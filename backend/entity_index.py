@@ -0,0 +1,117 @@
+"""In-process index of Participant, Assessment and TraitScore individuals keyed by user id."""
+
+PARTICIPANT_PREFIX = "Participant_"
+ASSESSMENT_PREFIX = "Assessment_"
+SCORE_PREFIX = "Score_"
+
+
+class EntityIndex:
+    """Name and participantID lookups for per-user individuals.
+
+    The index is rebuilt in one pass whenever a World is loaded and kept current by the write
+    path through register(), so per-user reads never scan class instances.
+    """
+
+    def __init__(self):
+        self.world = None
+        self.participant_class = None
+        self.indexed_classes = ()
+        self._by_name = {}
+        self._by_participant_id = {}
+        self._scores_by_user = {}
+
+    def build(self, onto):
+        """Index every Participant, Assessment and TraitScore individual of the ontology."""
+        self.world = onto.world
+        self._by_name = {}
+        self._by_participant_id = {}
+        self._scores_by_user = {}
+        self.participant_class = getattr(onto, "Participant", None)
+        classes = [getattr(onto, class_name, None) for class_name in ("Participant", "Assessment", "TraitScore")]
+        self.indexed_classes = tuple(cls for cls in classes if cls is not None)
+        for cls in self.indexed_classes:
+            for inst in onto.search(type=cls):
+                self.register(inst)
+        return self
+
+    def covers(self, cls):
+        """True when every individual of cls is known to the index, so a miss is authoritative."""
+        return cls in self.indexed_classes
+
+    def register(self, entity):
+        """Add an individual (new or updated) to the name, participantID and trait-score maps."""
+        name = entity.name
+        bucket = self._by_name.setdefault(name, [])
+        if entity not in bucket:
+            bucket.append(entity)
+
+        if name.startswith(SCORE_PREFIX) and "_" in name[len(SCORE_PREFIX):]:
+            user_id, trait = name[len(SCORE_PREFIX):].rsplit("_", 1)
+            self._scores_by_user.setdefault(user_id, {}).setdefault(trait, entity)
+
+        if self.participant_class is not None and isinstance(entity, self.participant_class):
+            for pid in getattr(entity, "participantID", None) or []:
+                self.register_participant_id(str(pid), entity)
+
+    def register_participant_id(self, participant_id, participant):
+        """Map a participantID literal to its participant, preferring the canonical Participant_<id>."""
+        current = self._by_participant_id.get(participant_id)
+        if current is None or participant.name == f"{PARTICIPANT_PREFIX}{participant_id}":
+            self._by_participant_id[participant_id] = participant
+
+    def forget(self, entity):
+        """Drop an individual that is about to be destroyed."""
+        name = entity.name
+        bucket = self._by_name.get(name, [])
+        if entity in bucket:
+            bucket.remove(entity)
+        if not bucket:
+            self._by_name.pop(name, None)
+
+        if name.startswith(SCORE_PREFIX) and "_" in name[len(SCORE_PREFIX):]:
+            user_id, trait = name[len(SCORE_PREFIX):].rsplit("_", 1)
+            scores = self._scores_by_user.get(user_id, {})
+            if scores.get(trait) is entity:
+                replacement = self.lookup(name)
+                if replacement is not None:
+                    scores[trait] = replacement
+                else:
+                    scores.pop(trait, None)
+
+        if self.participant_class is not None and isinstance(entity, self.participant_class):
+            for pid in getattr(entity, "participantID", None) or []:
+                if self._by_participant_id.get(str(pid)) is entity:
+                    del self._by_participant_id[str(pid)]
+
+    def lookup(self, name):
+        """Return the canonical individual registered under name, or None."""
+        bucket = self._by_name.get(name)
+        return bucket[0] if bucket else None
+
+    def duplicates(self, name, keeper):
+        """Return other individuals sharing keeper's name (e.g. same suffix under a different IRI)."""
+        return [e for e in self._by_name.get(name, []) if e is not keeper]
+
+    def duplicate_groups(self):
+        """Yield (name, [individuals]) for every name shared by more than one individual."""
+        for name, bucket in self._by_name.items():
+            if len(bucket) > 1:
+                yield name, list(bucket)
+
+    def participant(self, user_id):
+        return self.lookup(f"{PARTICIPANT_PREFIX}{user_id}")
+
+    def participant_by_id(self, participant_id):
+        """Resolve a participant through its participantID literal."""
+        return self._by_participant_id.get(participant_id)
+
+    def assessment(self, user_id):
+        return self.lookup(f"{ASSESSMENT_PREFIX}{user_id}")
+
+    def scored_user_ids(self):
+        """User ids that have at least one Score_<id>_<Trait> individual, in index order."""
+        return [user_id for user_id, scores in self._scores_by_user.items() if scores]
+
+    def trait_scores(self, user_id):
+        """Return {trait_name: TraitScore} for the user's Score_<id>_<Trait> individuals."""
+        return dict(self._scores_by_user.get(user_id, {}))
@@ -0,0 +1,127 @@
+"""Idempotency keys for POST routes: replay a stored response, coalesce concurrent duplicates."""
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+
+
+class IdempotencyConflict(Exception):
+    """The key was already used for a request with a different body."""
+
+
+class _InFlight:
+    def __init__(self, fingerprint):
+        self.fingerprint = fingerprint
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class IdempotencyStore:
+    """Thread-safe store of completed responses by idempotency key, with in-flight coalescing.
+
+    The first request for a key runs compute(); a duplicate that arrives while it runs waits
+    for that result instead of starting a second computation, and one that arrives within
+    ttl_seconds afterwards gets the stored value. Failures are handed to the waiters but never
+    stored, so the next retry computes again. Like LLMCache, the least recently used entry is
+    evicted once max_entries is exceeded.
+
+    A scope (the participant) keeps only its latest stored response: once a newer request in
+    the scope completes, replaying an older one would return results that are no longer saved.
+    """
+
+    def __init__(self, max_entries=1024, ttl_seconds=600):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.computed = 0
+        self.replayed = 0
+        self.coalesced = 0
+        self._entries = OrderedDict()  # key -> (expires_at, fingerprint, value, scope)
+        self._in_flight = {}  # key -> _InFlight
+        self._scopes = {}  # scope -> key of its latest stored response
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def fingerprint(payload):
+        """Stable hash of a JSON-compatible request payload (dict key order ignored)."""
+        encoded = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+        return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+    def run(self, key, fingerprint, compute, scope=None):
+        """Return (value, replayed) for key, calling compute() only if no result is stored or pending.
+
+        Raises IdempotencyConflict when key is stored or in flight for a different fingerprint.
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= now:
+                self._drop(key)
+                entry = None
+            if entry is not None:
+                if entry[1] != fingerprint:
+                    raise IdempotencyConflict(key)
+                self._entries.move_to_end(key)
+                self.replayed += 1
+                return entry[2], True
+            call = self._in_flight.get(key)
+            leader = call is None
+            if leader:
+                call = self._in_flight[key] = _InFlight(fingerprint)
+            elif call.fingerprint != fingerprint:
+                raise IdempotencyConflict(key)
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value, True
+
+        try:
+            call.value = compute()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+                if call.error is None:
+                    if scope is not None:
+                        previous = self._scopes.get(scope)
+                        if previous is not None and previous != key:
+                            self._drop(previous)
+                        self._scopes[scope] = key
+                    self._entries[key] = (time.time() + self.ttl_seconds, fingerprint, call.value, scope)
+                    self._entries.move_to_end(key)
+                    while len(self._entries) > self.max_entries:
+                        self._drop(next(iter(self._entries)))
+                    self.computed += 1
+            call.done.set()
+        return call.value, False
+
+    def _drop(self, key):
+        """Remove a stored entry and its scope pointer. Call with _lock held."""
+        entry = self._entries.pop(key, None)
+        if entry is not None and self._scopes.get(entry[3]) == key:
+            del self._scopes[entry[3]]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._scopes.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "in_flight": len(self._in_flight),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "computed": self.computed,
+                "replayed": self.replayed,
+                "coalesced": self.coalesced,
+            }
@@ -0,0 +1,136 @@
+"""LRU + TTL cache for LLM generations, optionally persisted to a JSON file."""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+from write_behind import WriteBehindSaver
+
+
+class LLMCache:
+    """Thread-safe cache keyed by prompt template version plus normalized prompt inputs.
+
+    Entries expire after ttl_seconds and the least recently used entry is evicted once
+    max_entries is exceeded. When a path is given the cache is loaded from it at startup and
+    rewritten (atomically) by a write-behind saver at most every save_interval seconds, so
+    inserts never pay for the file write and generations survive restarts once close() runs.
+    """
+
+    def __init__(self, max_entries=1024, ttl_seconds=7 * 24 * 3600, path=None, save_interval=5.0):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+        self._saver = None
+        if path:
+            self.load()
+            self._saver = WriteBehindSaver(self._save, interval=save_interval, name="llm-cache-writer")
+
+    @staticmethod
+    def make_key(kind, version, inputs):
+        """Stable hash of the call kind, its prompt template version and the normalized inputs."""
+        payload = json.dumps([kind, version, inputs], sort_keys=True, separators=(",", ":"), default=str)
+        return f"{kind}:{hashlib.sha256(payload.encode('utf-8')).hexdigest()}"
+
+    def get(self, key):
+        """Return the cached value or None, counting the hit or miss."""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.time() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        if self._saver is not None:
+            self._saver.mark_dirty(self)
+
+    def get_or_create(self, kind, version, inputs, generate):
+        """Return the cached generation for these inputs, calling generate() on a miss.
+
+        Exceptions from generate() propagate and nothing is stored, so failures and fallbacks
+        are never cached.
+        """
+        key = self.make_key(kind, version, inputs)
+        cached = self.get(key)
+        if cached is not None:
+            return cached
+        value = generate()
+        if value is not None:
+            self.set(key, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+        if self._saver is not None:
+            self._saver.mark_dirty(self)
+
+    def flush(self):
+        """Write pending inserts to the cache file now; returns True when a write happened."""
+        return self._saver.flush() if self._saver is not None else False
+
+    def close(self):
+        """Stop the background writer after a final flush."""
+        if self._saver is not None:
+            self._saver.close()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "persistent": bool(self.path),
+            }
+
+    def load(self):
+        """Load unexpired entries from the cache file, ignoring a missing or corrupt file."""
+        try:
+            with open(self.path, "r", encoding="utf-8") as fh:
+                rows = json.load(fh)
+        except (OSError, ValueError):
+            return
+        now = time.time()
+        with self._lock:
+            for key, expires_at, value in rows:
+                if expires_at > now:
+                    self._entries[key] = (expires_at, value)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _save(self, _target):
+        with self._lock:
+            rows = [[key, expires_at, value] for key, (expires_at, value) in self._entries.items()]
+        directory = os.path.dirname(os.path.abspath(self.path))
+        try:
+            fd, tmp_path = tempfile.mkstemp(prefix=".llm_cache.", dir=directory)
+            with os.fdopen(fd, "w", encoding="utf-8") as fh:
+                json.dump(rows, fh)
+            os.replace(tmp_path, self.path)
+        except OSError as exc:
+            print(f"⚠️ Could not persist LLM cache: {exc}")
@@ -0,0 +1,212 @@
+"""In-process request timing spans plus counters and histograms in Prometheus text format."""
+
+import bisect
+import functools
+import threading
+import time
+from contextlib import contextmanager
+
+# Latency buckets (seconds): sub-millisecond index lookups up to multi-second parses and LLM calls
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def escape_label(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def format_labels(names, values, extra=()):
+    pairs = [f'{n}="{escape_label(v)}"' for n, v in zip(names, values)] + list(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def format_value(value):
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Counter:
+    """Monotonic counter with a fixed set of label names."""
+
+    kind = "counter"
+
+    def __init__(self, name, help_text, labelnames=()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels, amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def samples(self):
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{format_labels(self.labelnames, labels)} {format_value(v)}" for labels, v in items]
+
+
+class Histogram:
+    """Cumulative-bucket histogram; observe() is a bisect plus two additions under a lock."""
+
+    kind = "histogram"
+
+    def __init__(self, name, help_text, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}  # labels -> [bucket counts..., +Inf count, sum]
+        self._lock = threading.Lock()
+
+    def observe(self, value, *labels):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [0] * (len(self.buckets) + 2)
+            series[index] += 1
+            series[-1] += value
+
+    def samples(self):
+        with self._lock:
+            items = sorted((labels, list(series)) for labels, series in self._series.items())
+        lines = []
+        for labels, series in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), series[:-1]):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else format_value(bound)
+                bucket_label = 'le="%s"' % le
+                lines.append(f"{self.name}_bucket{format_labels(self.labelnames, labels, [bucket_label])} {cumulative}")
+            lines.append(f"{self.name}_sum{format_labels(self.labelnames, labels)} {format_value(series[-1])}")
+            lines.append(f"{self.name}_count{format_labels(self.labelnames, labels)} {cumulative}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = []
+
+    def counter(self, name, help_text, labelnames=()):
+        metric = Counter(name, help_text, labelnames)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(self, name, help_text, labelnames=(), buckets=DEFAULT_BUCKETS):
+        metric = Histogram(name, help_text, labelnames, buckets)
+        self._metrics.append(metric)
+        return metric
+
+    def render(self):
+        """Prometheus text exposition format (version 0.0.4)."""
+        lines = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+
+class RequestTrace:
+    """Per-request span totals: {span name: [calls, seconds]}. Spans may nest, so they need not sum."""
+
+    __slots__ = ("started", "spans", "_lock")
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.spans = {}
+        self._lock = threading.Lock()  # LLM calls record from pool threads
+
+    def add(self, name, seconds):
+        with self._lock:
+            entry = self.spans.get(name)
+            if entry is None:
+                self.spans[name] = [1, seconds]
+            else:
+                entry[0] += 1
+                entry[1] += seconds
+
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+    def breakdown(self):
+        """Spans sorted by total time, e.g. 'llm:analysis=812.4ms find_entity_by_id=1.9ms(x6)'."""
+        with self._lock:
+            items = sorted(self.spans.items(), key=lambda kv: kv[1][1], reverse=True)
+        return " ".join(
+            f"{name}={seconds * 1000:.1f}ms" + (f"(x{calls})" if calls > 1 else "")
+            for name, (calls, seconds) in items
+        )
+
+
+class Tracer:
+    """Records named spans into a histogram and into the trace of the request being served.
+
+    The current trace lives in a thread local; bind() carries it into worker threads. When
+    disabled, span() and timed() cost one attribute check.
+    """
+
+    def __init__(self, histogram, enabled=True):
+        self.histogram = histogram
+        self.enabled = enabled
+        self._local = threading.local()
+
+    def start_trace(self):
+        trace = self._local.trace = RequestTrace() if self.enabled else None
+        return trace
+
+    def current_trace(self):
+        return getattr(self._local, "trace", None)
+
+    def end_trace(self):
+        trace = self.current_trace()
+        self._local.trace = None
+        return trace
+
+    def record(self, name, seconds, trace=None):
+        self.histogram.observe(seconds, name)
+        trace = trace or self.current_trace()
+        if trace is not None:
+            trace.add(name, seconds)
+
+    @contextmanager
+    def span(self, name):
+        if not self.enabled:
+            yield
+            return
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - started)
+
+    def timed(self, name):
+        """Decorator form of span()."""
+        def decorate(fn):
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return fn(*args, **kwargs)
+                started = time.perf_counter()
+                try:
+                    return fn(*args, **kwargs)
+                finally:
+                    self.record(name, time.perf_counter() - started)
+            return wrapper
+        return decorate
+
+    def bind(self, fn):
+        """Wrap fn so spans it records in another thread land in the caller's request trace."""
+        trace = self.current_trace()
+        if trace is None:
+            return fn
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            previous = self.current_trace()
+            self._local.trace = trace
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self._local.trace = previous
+        return wrapper
@@ -0,0 +1,168 @@
+"""Prepared SPARQL reads of per-participant results, compiled once per World.
+
+Each read is one parameterized query over owlready2's native SPARQL engine, so a participant's
+performance literals, reports, label and trait scores come back in a single round trip instead
+of one property probe each. Only owlready2's public prepare_sparql()/execute() API is used:
+rows arrive as entities and Python values, and the predicate column is mapped to its record
+field by IRI.
+"""
+
+import threading
+
+RDFS_LABEL = "http://www.w3.org/2000/01/rdf-schema#label"
+
+# Record field of each participant property read by the result routes
+PARTICIPANT_FIELDS = {
+    "jobPerformance": "job",
+    "academicPerformance": "academic",
+    "hasAnalysisReport": "analysis",
+    "hasJustificationReport": "justification",
+    "roleFitScore": "role_fit_scores",
+}
+
+# Fields that keep every value rather than the last one
+LIST_FIELDS = {"role_fit_scores"}
+
+_PARTICIPANT_BRANCH = (
+    "VALUES ?p { " + " ".join(f":{prop}" for prop in PARTICIPANT_FIELDS) + " rdfs:label } ??1 ?p ?value"
+)
+
+# ??1 is the Participant, ??2 its Assessment
+RECORD_QUERY = """
+PREFIX : <{base}>
+PREFIX rdfs: <http://www.w3.org/2000/01/rdf-schema#>
+SELECT ?p ?key ?value ?trait WHERE {{
+  {{ %s }} UNION
+  {{ ??2 :hasScore ?key .
+     OPTIONAL {{ ?key :meanScore ?value }}
+     OPTIONAL {{ ?key :scoresOnTrait ?trait }}
+     BIND(:hasScore AS ?p) }}
+}}
+""" % _PARTICIPANT_BRANCH.replace("{", "{{").replace("}", "}}")
+
+# Same record for a participant without an Assessment individual
+PARTICIPANT_QUERY = """
+PREFIX : <{base}>
+PREFIX rdfs: <http://www.w3.org/2000/01/rdf-schema#>
+SELECT ?p ?value WHERE {{ %s }}
+""" % _PARTICIPANT_BRANCH.replace("{", "{{").replace("}", "}}")
+
+SCORES_QUERY = """
+PREFIX : <{base}>
+SELECT ?key ?value ?trait WHERE {{
+  ??1 :hasScore ?key .
+  OPTIONAL {{ ?key :meanScore ?value }}
+  OPTIONAL {{ ?key :scoresOnTrait ?trait }}
+}}
+"""
+
+QUERIES = {"record": RECORD_QUERY, "participant": PARTICIPANT_QUERY, "scores": SCORES_QUERY}
+
+
+def score_trait_name(score, trait=None):
+    """Trait of a TraitScore: the Score_<id>_<Trait> suffix, else its scoresOnTrait individual."""
+    name = score.name
+    if "_" in name:
+        return name.split("_")[-1]
+    return trait.name if trait is not None else "Trait"
+
+
+class OntologyQueries:
+    """Prepared queries bound to one World, like EntityIndex.world.
+
+    The first prepare in a process initialises owlready2's SPARQL engine (about 200 ms; a
+    reloaded World re-prepares in a few ms), so queries are prepared on first use or by warm(),
+    never while a World is being loaded.
+    """
+
+    def __init__(self):
+        self.world = None
+        self.base_iri = None
+        self._prepared = {}
+        self._fields = {}
+        self._lock = threading.Lock()
+
+    def bind(self, onto):
+        """Point at a newly loaded World; its queries are prepared again on first use."""
+        with self._lock:
+            self.world = onto.world
+            self.base_iri = onto.base_iri
+            self._prepared = {}
+            self._fields = {}
+        return self
+
+    def prepared(self, name):
+        query = self._prepared.get(name)
+        if query is None:
+            with self._lock:
+                query = self._prepared.get(name)
+                if query is None:
+                    query = self.world.prepare_sparql(QUERIES[name].format(base=self.base_iri))
+                    if not self._fields:
+                        self._fields = self._field_iris()
+                    self._prepared[name] = query
+        return query
+
+    def _field_iris(self):
+        """{predicate IRI: record field} for the query rows."""
+        fields = {RDFS_LABEL: "label", f"{self.base_iri}hasScore": "score"}
+        for prop, field in PARTICIPANT_FIELDS.items():
+            fields[f"{self.base_iri}{prop}"] = field
+        return fields
+
+    def warm(self):
+        """Prepare every query now. Returns the number prepared."""
+        for name in QUERIES:
+            self.prepared(name)
+        return len(QUERIES)
+
+    def _scores(self, rows):
+        """{trait: mean} from (score, mean, trait) rows, in hasScore order.
+
+        The OPTIONAL branches repeat a score once per extra value; the first row wins, as the
+        meanScore[0] read did. Scores without a meanScore count as 0.0, unreadable ones are skipped.
+        """
+        scores = {}
+        seen = set()
+        for key, mean, trait in rows:
+            if key in seen:
+                continue
+            seen.add(key)
+            try:
+                scores[score_trait_name(key, trait)] = float(mean) if mean is not None else 0.0
+            except (TypeError, ValueError):
+                continue
+        return scores
+
+    def participant_record(self, participant, assessment=None):
+        """Everything the result routes read about one participant, in one query.
+
+        Returns {"job", "academic", "analysis", "justification"} (the last value of each, as the
+        list reads took [-1]), "label" (the first), "role_fit_scores" (every stored "role:score"
+        value) and "scores", a {trait: mean} dict; "scores" is None when there is no assessment.
+        """
+        if assessment is not None:
+            rows = self.prepared("record").execute((participant, assessment))
+        else:
+            rows = ((p, None, value, None) for p, value in self.prepared("participant").execute((participant,)))
+        record = {"job": None, "academic": None, "analysis": None, "justification": None, "label": None,
+                  "role_fit_scores": [], "scores": None}
+        score_rows = []
+        for predicate, key, value, trait in rows:
+            field = self._fields.get(getattr(predicate, "iri", None))
+            if field == "score":
+                score_rows.append((key, value, trait))
+            elif field == "label":
+                if record["label"] is None:
+                    record["label"] = str(value)
+            elif field in LIST_FIELDS:
+                record[field].append(value)
+            elif field is not None:
+                record[field] = value
+        if assessment is not None:
+            record["scores"] = self._scores(score_rows)
+        return record
+
+    def trait_scores(self, assessment):
+        """{trait: mean} for an Assessment's hasScore individuals, in one query."""
+        return self._scores(self.prepared("scores").execute((assessment,)))
@@ -0,0 +1,47 @@
+"""Undo journal for the individuals one write touches, for when the World cannot be re-parsed."""
+
+from owlready2 import destroy_entity
+
+
+class OntologyUndo:
+    """Property values of named individuals as they were before a write.
+
+    capture() runs before the write, under the same write lock, for every individual the write
+    may create or change. revert() puts the recorded values back and destroys the individuals
+    that did not exist yet, so one failed write can be taken back without dropping other
+    writers' unsaved changes. Individuals the write destroyed (duplicate clean-up) stay gone.
+    """
+
+    def __init__(self, lookup, forget=None):
+        self.lookup = lookup  # (cls, name) -> individual or None
+        self.forget = forget  # called before a created individual is destroyed
+        self._before = {}  # (cls, name) -> None when absent, else {property: [values]}
+
+    def __len__(self):
+        return len(self._before)
+
+    def capture(self, cls, name):
+        key = (cls, name)
+        if key in self._before:
+            return
+        entity = self.lookup(cls, name)
+        self._before[key] = None if entity is None else {prop: list(prop[entity]) for prop in entity.get_properties()}
+
+    def revert(self):
+        """Restore every captured individual; returns the ones that were restored (not destroyed)."""
+        restored, created = [], []
+        for (cls, name), values in self._before.items():
+            entity = self.lookup(cls, name)
+            if entity is None:
+                continue
+            if values is None:
+                created.append(entity)
+                continue
+            for prop in set(entity.get_properties()) | set(values):
+                prop[entity] = values.get(prop, [])
+            restored.append(entity)
+        for entity in created:
+            if self.forget is not None:
+                self.forget(entity)
+            destroy_entity(entity)
+        return restored
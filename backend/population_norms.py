@@ -0,0 +1,195 @@
+"""Running per-trait population statistics: Welford mean/variance plus a fixed-bin histogram."""
+
+import json
+import math
+import os
+import tempfile
+import threading
+
+# Trait percentages live in [0, 100]; 0.1-point bins keep percentile ranks exact to the bin
+BINS_PER_POINT = 10
+BIN_COUNT = 100 * BINS_PER_POINT + 1
+
+
+class TraitDistribution:
+    """Count, mean and M2 (Welford) with removal, plus a Fenwick tree over the histogram bins.
+
+    add/remove and percentile_rank are O(log BIN_COUNT), i.e. constant in the population size.
+    """
+
+    __slots__ = ("count", "mean", "m2", "_tree")
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self._tree = [0] * (BIN_COUNT + 1)  # 1-based Fenwick tree of bin counts
+
+    @staticmethod
+    def bin_of(value):
+        return min(BIN_COUNT - 1, max(0, int(round(float(value) * BINS_PER_POINT))))
+
+    def _bump(self, index, delta):
+        i = index + 1
+        while i <= BIN_COUNT:
+            self._tree[i] += delta
+            i += i & -i
+
+    def _prefix(self, index):
+        """Number of values in bins [0, index]."""
+        total = 0
+        i = index + 1
+        while i > 0:
+            total += self._tree[i]
+            i -= i & -i
+        return total
+
+    def add(self, value):
+        value = float(value)
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        self._bump(self.bin_of(value), 1)
+
+    def remove(self, value):
+        value = float(value)
+        if self.count <= 1:
+            self.count, self.mean, self.m2 = 0, 0.0, 0.0
+        else:
+            delta = value - self.mean
+            self.count -= 1
+            self.mean -= delta / self.count
+            self.m2 = max(0.0, self.m2 - delta * (value - self.mean))
+        self._bump(self.bin_of(value), -1)
+
+    def std(self):
+        return math.sqrt(self.m2 / self.count) if self.count > 1 else 0.0
+
+    def percentile_rank(self, value):
+        """Percent of the population scoring below value, counting ties as half."""
+        if not self.count:
+            return None
+        index = self.bin_of(value)
+        below = self._prefix(index - 1) if index else 0
+        same = self._prefix(index) - below
+        return round((below + 0.5 * same) / self.count * 100, 1)
+
+    def z_score(self, value):
+        std = self.std()
+        return round((float(value) - self.mean) / std, 3) if std > 0 else None
+
+    def bins(self):
+        """Plain per-bin counts (for persistence)."""
+        return [self._prefix(i) - (self._prefix(i - 1) if i else 0) for i in range(BIN_COUNT)]
+
+    def load_bins(self, counts):
+        self._tree = [0] * (BIN_COUNT + 1)
+        for index, count in enumerate(counts[:BIN_COUNT]):
+            if count:
+                self._bump(index, count)
+
+
+class PopulationNorms:
+    """Thread-safe {trait: TraitDistribution} kept in step with the stored results.
+
+    replace(previous, current) moves one participant from their old scores to their new ones,
+    so a re-submit does not count twice. `world` and `source` record what the norms were
+    computed from, like EntityIndex.world; `revision` goes up on every change, so responses
+    that embed norms can tell when they are stale.
+    """
+
+    def __init__(self):
+        self.world = None
+        self.source = None
+        self.revision = 0
+        self._traits = {}
+        self._lock = threading.Lock()
+
+    def reset(self, rows=()):
+        """Recompute from scratch out of an iterable of {trait: percentage} dicts."""
+        self.source = None
+        traits = {}
+        for row in rows:
+            for trait, value in row.items():
+                traits.setdefault(trait, TraitDistribution()).add(value)
+        with self._lock:
+            self._traits = traits
+            self.revision += 1
+
+    def replace(self, previous, current):
+        with self._lock:
+            self.revision += 1
+            for trait, value in (previous or {}).items():
+                dist = self._traits.get(trait)
+                if dist is not None and dist.count:
+                    dist.remove(value)
+            for trait, value in (current or {}).items():
+                self._traits.setdefault(trait, TraitDistribution()).add(value)
+
+    def compare(self, scores):
+        """{trait: {"percentile": p, "z": z}} for a {trait: percentage} dict."""
+        with self._lock:
+            result = {}
+            for trait, value in scores.items():
+                dist = self._traits.get(trait)
+                if dist is None or not dist.count:
+                    result[trait] = {"percentile": None, "z": None}
+                else:
+                    result[trait] = {"percentile": dist.percentile_rank(value), "z": dist.z_score(value)}
+            return result
+
+    def summary(self):
+        with self._lock:
+            return {
+                trait: {"count": d.count, "mean": round(d.mean, 3), "std": round(d.std(), 3)}
+                for trait, d in sorted(self._traits.items())
+            }
+
+    def save(self, path, source=None):
+        """Write the norms as JSON (atomically) tagged with the source they describe."""
+        with self._lock:
+            payload = {
+                "source": source,
+                "bins_per_point": BINS_PER_POINT,
+                "traits": {
+                    trait: {"count": d.count, "mean": d.mean, "m2": d.m2, "bins": d.bins()}
+                    for trait, d in self._traits.items()
+                },
+            }
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, tmp_path = tempfile.mkstemp(prefix=".population_norms.", suffix=".tmp", dir=directory)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as fh:
+                json.dump(payload, fh, separators=(",", ":"))
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+
+    def load(self, path, source):
+        """Load norms saved for exactly this source; returns False when missing or stale."""
+        try:
+            with open(path, encoding="utf-8") as fh:
+                payload = json.load(fh)
+        except (OSError, ValueError):
+            return False
+        if source is None or payload.get("source") != source or payload.get("bins_per_point") != BINS_PER_POINT:
+            return False
+        traits = {}
+        for trait, data in payload.get("traits", {}).items():
+            dist = TraitDistribution()
+            dist.count, dist.mean, dist.m2 = int(data["count"]), float(data["mean"]), float(data["m2"])
+            dist.load_bins(data["bins"])
+            traits[trait] = dist
+        with self._lock:
+            self._traits = traits
+            self.revision += 1
+        self.source = source
+        return True
+
+    def source_matches(self, source):
+        return source is not None and self.source == source
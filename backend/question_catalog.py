@@ -0,0 +1,56 @@
+"""Immutable, pre-serialized catalog of assessment questions."""
+
+import gzip
+import hashlib
+import json
+from collections import namedtuple
+
+CompiledQuestion = namedtuple("CompiledQuestion", ["id", "text", "trait", "is_reverse"])
+
+
+def question_sort_key(question_id):
+    """Order questions by the digits in their id (Q1, Q2, ... Q10), falling back to the raw id.
+
+    Ties keep ontology order because sorted() is stable.
+    """
+    digits = "".join(filter(str.isdigit, question_id))
+    return (0, int(digits), "") if digits else (1, 0, question_id)
+
+
+class QuestionCatalog:
+    """Questions compiled once per ontology load, plus the /get_questions payload.
+
+    The JSON body, its gzip encoding and the strong ETag are computed up front so the endpoint
+    only has to pick a representation. The ETag is a content hash, so reloading an ontology
+    whose questions did not change keeps client caches valid.
+    """
+
+    __slots__ = ("world", "questions", "by_id", "by_trait", "body", "gzip_body", "etag", "gzip_etag")
+
+    def __init__(self, questions, world=None):
+        ordered = tuple(sorted(questions, key=lambda q: question_sort_key(q.id)))
+        by_trait = {}
+        for q in ordered:
+            if q.trait != "Unknown":
+                by_trait.setdefault(q.trait, []).append(q)
+
+        body = json.dumps([q._asdict() for q in ordered], sort_keys=True, separators=(",", ":")).encode("utf-8")
+        digest = hashlib.sha256(body).hexdigest()[:32]
+
+        self.world = world
+        self.questions = ordered
+        self.by_id = {q.id: q for q in ordered}
+        self.by_trait = {trait: tuple(items) for trait, items in by_trait.items()}
+        self.body = body
+        # mtime=0 keeps the compressed bytes (and therefore the gzip ETag) deterministic
+        self.gzip_body = gzip.compress(body, compresslevel=9, mtime=0)
+        self.etag = digest
+        self.gzip_etag = f"{digest}-gz"
+
+    @classmethod
+    def from_details(cls, details, world=None):
+        """Build a catalog from get_question_details() dictionaries."""
+        return cls([CompiledQuestion(d["id"], d["text"], d["trait"], d["is_reverse"]) for d in details], world=world)
+
+    def __len__(self):
+        return len(self.questions)
@@ -0,0 +1,103 @@
+"""Read-through cache of per-participant GET responses, with strong ETags for conditional GETs."""
+
+import hashlib
+import threading
+from collections import OrderedDict
+
+
+class CachedResponse:
+    __slots__ = ("body", "status", "mimetype", "etag", "deps")
+
+    def __init__(self, body, status, mimetype, deps):
+        self.body = body
+        self.status = status
+        self.mimetype = mimetype
+        self.etag = hashlib.sha256(body).hexdigest()[:32]
+        self.deps = deps
+
+
+class ParticipantResponseCache:
+    """Rendered response bodies by participant and route variant, dropped when the participant changes.
+
+    A participant's results only change when they submit (or their analysis finishes), so the
+    write paths call invalidate(user_id) and every cached variant for that participant goes.
+    clear() drops everything, for changes that touch all participants (a new World, a bulk
+    import, a new role catalog). Each entry also records the deps it was rendered against
+    (e.g. the population-norms revision) and is a miss once they differ.
+
+    Fills are guarded by version(): a response computed from data that was invalidated while
+    it was being computed is returned to its caller but not stored. `world` records the World
+    the entries were read from, like EntityIndex.world. Participants are evicted least
+    recently used first beyond max_participants, and so are their invalidation versions; an
+    evicted version raises the floor every participant without one starts from, so a fill
+    that was in flight across the eviction still cannot be stored.
+    """
+
+    def __init__(self, max_participants=4096):
+        self.max_participants = max_participants
+        self.world = None
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._participants = OrderedDict()  # user_id -> {variant: CachedResponse}
+        self._versions = OrderedDict()  # user_id -> sequence number of its last invalidate()
+        self._sequence = 0
+        self._floor = 0  # version of participants absent from _versions
+        self._epoch = 0
+        self._lock = threading.Lock()
+
+    def version(self, user_id):
+        """Token to pass to put(); take it before reading the data the response is built from."""
+        with self._lock:
+            return self._epoch, self._versions.get(user_id, self._floor)
+
+    def get(self, user_id, variant, deps=()):
+        with self._lock:
+            entries = self._participants.get(user_id)
+            entry = entries.get(variant) if entries else None
+            if entry is not None and entry.deps == deps:
+                self._participants.move_to_end(user_id)
+                self.hits += 1
+                return entry
+            self.misses += 1
+            return None
+
+    def put(self, user_id, variant, version, body, status, mimetype, deps=()):
+        """Wrap a rendered body in a CachedResponse, storing it unless user_id changed since version."""
+        entry = CachedResponse(body, status, mimetype, deps)
+        with self._lock:
+            if version != (self._epoch, self._versions.get(user_id, self._floor)):
+                return entry
+            self._participants.setdefault(user_id, {})[variant] = entry
+            self._participants.move_to_end(user_id)
+            while len(self._participants) > self.max_participants:
+                self._participants.popitem(last=False)
+        return entry
+
+    def invalidate(self, user_id):
+        with self._lock:
+            self._sequence += 1
+            self._versions[user_id] = self._sequence
+            self._versions.move_to_end(user_id)
+            while len(self._versions) > self.max_participants:
+                self._floor = self._versions.popitem(last=False)[1]
+            self._participants.pop(user_id, None)
+            self.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self._epoch += 1
+            self._versions.clear()
+            self._participants.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "participants": len(self._participants),
+                "responses": sum(len(entries) for entries in self._participants.values()),
+                "max_participants": self.max_participants,
+                "hits": self.hits,
+                "misses": self.misses,
+                "invalidations": self.invalidations,
+                "tracked_versions": len(self._versions),
+            }
@@ -0,0 +1,81 @@
+"""Line formatting and cursors for the streaming results export (NDJSON or CSV)."""
+
+import base64
+import csv
+import datetime
+import io
+import json
+
+FORMATS = ("ndjson", "csv")
+TIMESTAMP_FORMAT = "%Y-%m-%dT%H:%M:%S.%f"
+
+
+def format_timestamp(value):
+    """Fixed-width naive-UTC timestamp string, so string order is time order ("" when unknown)."""
+    if isinstance(value, datetime.datetime):
+        if value.tzinfo is not None:
+            value = value.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+        return value.strftime(TIMESTAMP_FORMAT)
+    return ""
+
+
+def parse_since(value):
+    """Parse a since filter (ISO 8601 date/datetime or epoch seconds) into a timestamp string."""
+    value = (value or "").strip()
+    if not value:
+        return None
+    try:
+        return format_timestamp(datetime.datetime.fromtimestamp(float(value), datetime.timezone.utc))
+    except ValueError:
+        pass
+    try:
+        return format_timestamp(datetime.datetime.fromisoformat(value.replace("Z", "+00:00")))
+    except ValueError:
+        raise ValueError(f"Invalid since value '{value}' (expected ISO 8601 or epoch seconds)")
+
+
+def encode_cursor(sort_key):
+    """Opaque resume token for a (timestamp, user_id) sort key."""
+    return base64.urlsafe_b64encode(json.dumps(list(sort_key)).encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(token):
+    try:
+        timestamp, user_id = json.loads(base64.urlsafe_b64decode(token.encode("ascii")))
+        return str(timestamp), str(user_id)
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+
+def ndjson_line(record):
+    return json.dumps(record, separators=(",", ":")) + "\n"
+
+
+def csv_columns(traits, roles, include_justification):
+    columns = ["id", "name", "updated_at"]
+    columns += [f"score_{trait}" for trait in traits]
+    columns += ["JobPerformance", "AcademicPerformance"]
+    columns += [f"fit_{role}" for role in roles]
+    if include_justification:
+        columns.append("justification")
+    columns.append("cursor")
+    return columns
+
+
+def csv_line(values):
+    buf = io.StringIO()
+    csv.writer(buf).writerow(["" if v is None else v for v in values])
+    return buf.getvalue()
+
+
+def csv_row(record, traits, roles, include_justification):
+    """Flatten one export record into the csv_columns order."""
+    performance = record.get("performance") or {}
+    values = [record["id"], record.get("name"), record.get("updated_at")]
+    values += [record["scores"].get(trait) for trait in traits]
+    values += [performance.get("JobPerformance"), performance.get("AcademicPerformance")]
+    values += [record["role_fit"].get(role) for role in roles]
+    if include_justification:
+        values.append(record.get("justification"))
+    values.append(record["cursor"])
+    return csv_line(values)
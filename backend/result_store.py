@@ -0,0 +1,225 @@
+"""Compact columnar mirror of stored participant results for aggregation and export."""
+
+import datetime
+import sys
+import threading
+
+import numpy as np
+
+PERFORMANCE = ("JobPerformance", "AcademicPerformance")
+EPOCH = datetime.datetime(1970, 1, 1)
+NO_TIMESTAMP = -1
+
+
+def timestamp_micros(value):
+    """Naive-UTC datetime -> integer microseconds since the epoch (NO_TIMESTAMP for None)."""
+    if value is None:
+        return NO_TIMESTAMP
+    if value.tzinfo is not None:
+        value = value.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+    return (value - EPOCH) // datetime.timedelta(microseconds=1)
+
+
+class ResultStore:
+    """One row per scored participant in preallocated numpy columns that double when full.
+
+    Trait percentages are float64, so role fit scored from them is identical to score_role_fit;
+    performance scores are float32 (both NaN when missing). Each row's top_k best roles are an
+    int32 index column plus a float32 fit column (-1/NaN past the catalog size), and
+    resultUpdatedAt is int64 microseconds, so the export can order and filter rows without
+    touching an individual. Trait columns are added on first sight.
+    Rows are never removed; a World that drops participants is mirrored by rebuild().
+    `world` and `role_fit_matrix` record what the rows were built from, like
+    TraitVectorIndex.
+    """
+
+    __slots__ = ("world", "role_fit_matrix", "top_k", "traits", "_trait_col", "_ids", "_row_of",
+                 "_traits", "_performance", "_fit_roles", "_fit_scores", "_updated", "_lock")
+
+    def __init__(self, role_fit_matrix, top_k=10, capacity=1024):
+        self.world = None
+        self.role_fit_matrix = role_fit_matrix
+        self.top_k = top_k
+        self._lock = threading.Lock()
+        self._allocate(list(role_fit_matrix.traits), capacity)
+
+    def _allocate(self, traits, capacity):
+        self.traits = traits
+        self._trait_col = {trait: c for c, trait in enumerate(traits)}
+        self._ids = []
+        self._row_of = {}
+        self._traits = np.full((capacity, len(traits)), np.nan, dtype=np.float64)
+        self._performance = np.full((capacity, len(PERFORMANCE)), np.nan, dtype=np.float32)
+        self._fit_roles = np.full((capacity, self.top_k), -1, dtype=np.int32)
+        self._fit_scores = np.full((capacity, self.top_k), np.nan, dtype=np.float32)
+        self._updated = np.full(capacity, NO_TIMESTAMP, dtype=np.int64)
+
+    def __len__(self):
+        return len(self._ids)
+
+    def __contains__(self, user_id):
+        return user_id in self._row_of
+
+    def _grow(self, needed):
+        capacity = self._traits.shape[0]
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+        n = len(self._ids)
+        for name, fill in (("_traits", np.nan), ("_performance", np.nan), ("_fit_roles", -1),
+                           ("_fit_scores", np.nan), ("_updated", NO_TIMESTAMP)):
+            old = getattr(self, name)
+            new = np.full((capacity,) + old.shape[1:], fill, dtype=old.dtype)
+            new[:n] = old[:n]
+            setattr(self, name, new)
+
+    def _column(self, trait):
+        col = self._trait_col.get(trait)
+        if col is None:
+            col = self._trait_col[trait] = len(self.traits)
+            self.traits.append(trait)
+            extra = np.full((self._traits.shape[0], 1), np.nan, dtype=np.float64)
+            self._traits = np.hstack([self._traits, extra])
+        return col
+
+    def _row(self, user_id):
+        row = self._row_of.get(user_id)
+        if row is None:
+            row = len(self._ids)
+            self._grow(row + 1)
+            self._ids.append(user_id)
+            self._row_of[user_id] = row
+        return row
+
+    def _set(self, user_id, traits, performance, updated):
+        row = self._row(user_id)
+        self._traits[row] = np.nan
+        for trait, value in (traits or {}).items():
+            # _column may replace self._traits, so resolve it before indexing
+            col = self._column(trait)
+            self._traits[row, col] = value
+        performance = performance or {}
+        self._performance[row] = [np.nan if performance.get(p) is None else performance[p] for p in PERFORMANCE]
+        self._updated[row] = timestamp_micros(updated)
+        return row
+
+    def _trait_block(self, rows, traits):
+        """float64 (len(rows), len(traits)) block, missing traits 0 like RoleFitMatrix.trait_matrix."""
+        block = np.zeros((len(rows), len(traits)), dtype=np.float64)
+        for c, trait in enumerate(traits):
+            col = self._trait_col.get(trait)
+            if col is not None:
+                block[:, c] = self._traits[rows, col]
+        return np.nan_to_num(block, nan=0.0)
+
+    def _score_rows(self, rows, chunk_size=4096):
+        """Refill the role-fit columns of rows against role_fit_matrix, chunk_size rows at a time."""
+        matrix = self.role_fit_matrix
+        k = min(self.top_k, len(matrix.roles))
+        self._fit_roles[rows] = -1
+        self._fit_scores[rows] = np.nan
+        if not k:
+            return
+        for start in range(0, len(rows), chunk_size):
+            chunk = rows[start:start + chunk_size]
+            scores = matrix.scores(self._trait_block(chunk, matrix.traits))
+            if scores.shape[1] <= 4 * k:
+                # Small catalogs: one stable sort of the block keeps ties in catalog order
+                best = np.argsort(-scores, axis=1, kind="stable")[:, :k]
+            else:
+                best = np.array([matrix.top_roles(row, k) for row in scores])
+            self._fit_roles[chunk, :k] = best
+            self._fit_scores[chunk, :k] = np.take_along_axis(scores, best, axis=1)
+
+    def rebuild(self, items, role_fit_matrix=None):
+        """Replace the contents with (user_id, {trait: pct}, {performance: score}, updated_at) tuples."""
+        items = list(items)
+        with self._lock:
+            if role_fit_matrix is not None:
+                self.role_fit_matrix = role_fit_matrix
+            self._allocate(list(self.role_fit_matrix.traits), max(1024, len(items)))
+            for user_id, traits, performance, updated in items:
+                self._set(user_id, traits, performance, updated)
+            self._score_rows(np.arange(len(self._ids)))
+
+    def upsert(self, user_id, traits, performance, updated=None):
+        """Insert or overwrite one participant's row and rescore its role fit."""
+        with self._lock:
+            row = self._set(user_id, traits, performance, updated)
+            self._score_rows(np.array([row]))
+
+    def rescore(self, role_fit_matrix):
+        """Recompute every row's role-fit columns for a new role catalog."""
+        with self._lock:
+            self.role_fit_matrix = role_fit_matrix
+            self._score_rows(np.arange(len(self._ids)))
+
+    def trait_matrix(self, traits):
+        """(user_ids, float64 (N, len(traits)) matrix) of the rows with at least one trait score."""
+        with self._lock:
+            n = len(self._ids)
+            rows = np.flatnonzero(~np.isnan(self._traits[:n]).all(axis=1))
+            return [self._ids[r] for r in rows.tolist()], self._trait_block(rows, traits)
+
+    def updated_keys(self):
+        """[(timestamp string, user_id)] for every row, in insertion order.
+
+        The strings match result_export.format_timestamp ("" when unknown) but are formatted in
+        one numpy pass instead of one strftime per row.
+        """
+        with self._lock:
+            stamps = self._updated[:len(self._ids)].copy()
+            ids = list(self._ids)
+        text = np.datetime_as_string(stamps.astype("datetime64[us]"), unit="us")
+        text[stamps == NO_TIMESTAMP] = ""
+        return list(zip(text.tolist(), ids))
+
+    @staticmethod
+    def _describe(column):
+        values = column[~np.isnan(column)].astype(np.float64)
+        if not values.size:
+            return {"count": 0}
+        p25, median, p75 = np.percentile(values, [25, 50, 75]).tolist()
+        return {
+            "count": int(values.size),
+            "mean": round(float(values.mean()), 2),
+            "std": round(float(values.std()), 2),
+            "min": round(float(values.min()), 2),
+            "p25": round(p25, 2),
+            "median": round(median, 2),
+            "p75": round(p75, 2),
+            "max": round(float(values.max()), 2),
+        }
+
+    def summary(self):
+        """Cohort aggregates straight from the columns: trait and performance distributions plus
+        how many participants have each role as their best fit (and their mean fit)."""
+        with self._lock:
+            n = len(self._ids)
+            roles = self.role_fit_matrix.roles
+            best_roles = self._fit_roles[:n, 0]
+            best_scores = self._fit_scores[:n, 0]
+            top_roles = []
+            for r, count in zip(*np.unique(best_roles[best_roles >= 0], return_counts=True)):
+                top_roles.append({
+                    "role": roles[r],
+                    "participants": int(count),
+                    "mean_fit": round(float(best_scores[best_roles == r].astype(np.float64).mean()), 2),
+                })
+            return {
+                "participants": n,
+                "traits": {trait: self._describe(self._traits[:n, c]) for trait, c in self._trait_col.items()},
+                "performance": {name: self._describe(self._performance[:n, c]) for c, name in enumerate(PERFORMANCE)},
+                "top_roles": sorted(top_roles, key=lambda item: (-item["participants"], item["role"])),
+            }
+
+    def memory_bytes(self):
+        """Bytes held: the used part of every column plus the id list and id -> row map."""
+        with self._lock:
+            n = len(self._ids)
+            columns = (self._traits, self._performance, self._fit_roles, self._fit_scores, self._updated)
+            array_bytes = sum(col[:n].nbytes for col in columns)
+            index_bytes = sys.getsizeof(self._ids) + sys.getsizeof(self._row_of) + sum(sys.getsizeof(i) for i in self._ids)
+            return {"participants": n, "columns": array_bytes, "index": index_bytes, "total": array_bytes + index_bytes,
+                    "allocated": sum(col.nbytes for col in columns) + index_bytes}
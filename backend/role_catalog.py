@@ -0,0 +1,298 @@
+"""Career-role catalog read from the ontology and compiled into a RoleFitMatrix.
+
+Each CareerRole carries one TraitRequirement individual per scored trait (requiresTrait,
+traitTarget, traitWeight and the developsSkill recommendations for that trait) plus its
+requiresSkill list. A role-level list of traitWeight values could not be paired back with
+its traits: RDF value lists are unordered sets, so equal weights would collapse. For the
+same reason roles and requirements record their skills' blueprint order in skillOrder.
+"""
+
+import hashlib
+import json
+
+from owlready2 import destroy_entity
+
+from role_fit import RoleFitMatrix
+
+DEFAULT_TARGET = 70
+DEFAULT_WEIGHT = 0.1
+ROLE_PREFIX = "Role_"
+SKILL_PREFIX = "Skill_"
+REQUIREMENT_PREFIX = "Req_"
+
+
+def safe_name(label):
+    return "_".join(label.split()).replace("/", "_").replace("-", "_")
+
+
+def entity_label(entity):
+    labels = getattr(entity, "label", None)
+    return str(labels[0]) if labels else entity.name
+
+
+def first_value(entity, prop_name, default=None):
+    values = getattr(entity, prop_name, None)
+    return values[0] if values else default
+
+
+def ordered_skill_labels(entity, prop_name):
+    """Labels of entity's prop_name skills in its skillOrder; unlisted skills follow by label."""
+    try:
+        order = json.loads(first_value(entity, "skillOrder", "[]"))
+    except (TypeError, ValueError):
+        order = []
+    rank = {label: i for i, label in enumerate(order)}
+    labels = [entity_label(s) for s in getattr(entity, prop_name, None) or []]
+    return sorted(labels, key=lambda label: (rank.get(label, len(rank)), label))
+
+
+def whole_number(value):
+    """Targets are whole percentages in the seed; keep them ints so responses do not change."""
+    value = float(value)
+    return int(value) if value.is_integer() else value
+
+
+class RoleCatalog:
+    """Roles with trait targets/weights, skills and per-trait skill gaps, compiled for scoring.
+
+    blueprints has the ROLE_BLUEPRINTS shape and skill_gaps the ROLE_TRAIT_SKILL_GAPS shape,
+    so a catalog can come from the ontology or from the built-in defaults. `world` records the
+    World it was read from, like EntityIndex.world.
+    """
+
+    def __init__(self, blueprints, skill_gaps=None, world=None):
+        self.blueprints = blueprints
+        self.skill_gaps = skill_gaps or {}
+        self.matrix = RoleFitMatrix(blueprints)
+        self.roles = self.matrix.roles
+        self.role_index = {role: r for r, role in enumerate(self.roles)}
+        self.world = world
+
+    def __len__(self):
+        return len(self.roles)
+
+    @classmethod
+    def from_ontology(cls, o):
+        """Read every CareerRole with at least one TraitRequirement, in catalogPosition order."""
+        if not hasattr(o, "CareerRole"):
+            return cls({}, world=o.world)
+        entries = []
+        for role in o.search(type=o.CareerRole):
+            requirements = []
+            for req in getattr(role, "hasTraitRequirement", None) or []:
+                trait = first_value(req, "requiresTrait")
+                if trait is None:
+                    continue
+                requirements.append((first_value(req, "catalogPosition", 0), trait.name, req))
+            if not requirements:
+                continue
+            requirements.sort(key=lambda item: (item[0], item[1]))
+            trait_targets, gaps = {}, {}
+            for _, trait_name, req in requirements:
+                trait_targets[trait_name] = {
+                    "target": whole_number(first_value(req, "traitTarget", DEFAULT_TARGET)),
+                    "weight": float(first_value(req, "traitWeight", DEFAULT_WEIGHT)),
+                }
+                skills = ordered_skill_labels(req, "developsSkill")
+                if skills:
+                    gaps[trait_name] = skills
+            label = entity_label(role)
+            position = first_value(role, "catalogPosition")
+            entries.append((position is None, position or 0, label, trait_targets, gaps, role))
+
+        blueprints, skill_gaps = {}, {}
+        for _, _, label, trait_targets, gaps, role in sorted(entries, key=lambda e: e[:3]):
+            if label in blueprints:
+                continue
+            blueprints[label] = {
+                "trait_targets": trait_targets,
+                "skills": ordered_skill_labels(role, "requiresSkill"),
+            }
+            if gaps:
+                skill_gaps[label] = gaps
+        return cls(blueprints, skill_gaps, world=o.world)
+
+    def fit(self, trait_scores, top_k=None):
+        """({role: {"score", "contributions"}}, ranking) for one {trait: percentage} dict.
+
+        Every role is scored in one vectorized pass; contributions are only built for the
+        roles returned (all of them, or the top_k best), so the per-request cost barely grows
+        with the catalog. role_results keeps catalog order, ranking is best first.
+        """
+        if not self.roles:
+            return {}, []
+        row = self.score_row(trait_scores)
+        ranked = self.matrix.top_roles(row, top_k).tolist()
+        role_results = {}
+        for r in sorted(ranked):
+            role_name = self.roles[r]
+            contributions = []
+            for trait_label, meta in self.blueprints[role_name].get("trait_targets", {}).items():
+                target = meta.get("target", DEFAULT_TARGET)
+                actual = float(trait_scores.get(trait_label, 0.0))
+                proximity = max(0.0, 1.0 - abs(actual - target) / 100.0)
+                contributions.append({
+                    "trait": trait_label,
+                    "actual": round(actual, 2),
+                    "target": target,
+                    "weight": meta.get("weight", DEFAULT_WEIGHT),
+                    "closeness": round(proximity * 100, 2),
+                })
+            role_results[role_name] = {
+                "score": float(row[r]),
+                "contributions": sorted(contributions, key=lambda c: c["closeness"], reverse=True),
+            }
+        return role_results, [self.roles[r] for r in ranked]
+
+    def score_row(self, trait_scores):
+        """(R,) fit scores of every role for one {trait: percentage} dict, in catalog order."""
+        return self.matrix.scores(self.matrix.trait_matrix([trait_scores]))[0]
+
+    def suggest_skill_gaps(self, role_name, contributions, limit=2):
+        """Skills for the weakest contributing traits, topped up with the role's own skills."""
+        skills = []
+        for item in sorted(contributions, key=lambda c: c["closeness"]):
+            for skill in self.skill_gaps.get(role_name, {}).get(item.get("trait"), []):
+                if skill not in skills:
+                    skills.append(skill)
+                if len(skills) >= limit:
+                    return skills[:limit]
+        for skill in self.blueprints.get(role_name, {}).get("skills", []):
+            if skill not in skills:
+                skills.append(skill)
+            if len(skills) >= limit:
+                break
+        return skills[:limit]
+
+
+def find_named(o, name):
+    """The entity called name in o (any base-IRI separator), or None.
+
+    search_one(name=...) does not match the punned trait classes, so resolve by IRI.
+    """
+    base = o.base_iri.rstrip("#/")
+    for iri in (f"{base}#{name}", f"{base}/{name}", name):
+        found = o.search_one(iri=iri)
+        if found is not None:
+            return found
+    return None
+
+
+def get_or_create(o, cls, name, label):
+    entity = find_named(o, name) or cls(name)
+    entity.label = [label]
+    return entity
+
+
+def seed_digest(blueprint, gaps=None):
+    """Fingerprint of one built-in role (blueprint plus skill gaps), stored as its seedDigest."""
+    return hashlib.sha256(json.dumps([blueprint, gaps or {}], sort_keys=True).encode("utf-8")).hexdigest()[:12]
+
+
+def seed_roles(o, blueprints, skill_gaps=None):
+    """Write the built-in roles nobody has taken over; returns the labels written.
+
+    A built-in role is (re)written when it is missing, still in the pre-catalog format (no
+    TraitRequirement) or carries the seedDigest of an older blueprint. write_roles clears
+    seedDigest, so roles edited through `flask import-roles` are never overwritten; a role
+    without one that already matches its blueprint is adopted by stamping the digest.
+    Call inside `with o:`.
+    """
+    skill_gaps = skill_gaps or {}
+    current = RoleCatalog.from_ontology(o)
+    digests = {}
+    for label, blueprint in blueprints.items():
+        gaps = skill_gaps.get(label, {})
+        digest = seed_digest(blueprint, gaps)
+        role = find_named(o, f"{ROLE_PREFIX}{safe_name(label)}")
+        stored = first_value(role, "seedDigest") if role is not None else None
+        if role is None or not getattr(role, "hasTraitRequirement", None) or stored not in (None, digest):
+            digests[label] = digest
+        elif stored is None and current.blueprints.get(label) == blueprint and current.skill_gaps.get(label, {}) == gaps:
+            role.seedDigest = [digest]
+    write_roles(o, {label: blueprints[label] for label in digests}, skill_gaps, digests)
+    return list(digests)
+
+
+def write_roles(o, blueprints, skill_gaps=None, seed_digests=None):
+    """Upsert roles given in the ROLE_BLUEPRINTS shape as CareerRole/TraitRequirement individuals.
+
+    Roles already in the catalog keep their catalogPosition; new ones are appended. Requirements
+    for traits a role no longer lists are destroyed, and so are role-level requiresTrait and
+    traitWeight values left by older seeds. Skill lists keep their given order in skillOrder.
+    Each role gets its seed_digests entry as seedDigest, or none (operator-owned) when absent.
+    Call inside `with o:`. Returns the number of roles written.
+    """
+    seed_digests = seed_digests or {}
+    skill_gaps = skill_gaps or {}
+    roles = list(o.search(type=o.CareerRole))
+    next_position = max((first_value(r, "catalogPosition", -1) for r in roles), default=-1) + 1
+    trait_entities = {}
+    written = 0
+    for role_label, cfg in blueprints.items():
+        role_name = f"{ROLE_PREFIX}{safe_name(role_label)}"
+        role = get_or_create(o, o.CareerRole, role_name, role_label)
+        if first_value(role, "catalogPosition") is None:
+            role.catalogPosition = [next_position]
+            next_position += 1
+
+        requirements = []
+        for position, (trait_label, meta) in enumerate(cfg.get("trait_targets", {}).items()):
+            if trait_label not in trait_entities:
+                trait_entities[trait_label] = find_named(o, trait_label)
+            trait = trait_entities[trait_label]
+            if trait is None:
+                continue
+            req = get_or_create(o, o.TraitRequirement, f"{REQUIREMENT_PREFIX}{safe_name(role_label)}_{trait_label}",
+                                f"{role_label}: {trait_label}")
+            req.requiresTrait = [trait]
+            req.traitTarget = [float(meta.get("target", DEFAULT_TARGET))]
+            req.traitWeight = [float(meta.get("weight", DEFAULT_WEIGHT))]
+            req.catalogPosition = [position]
+            gap_skills = skill_gaps.get(role_label, {}).get(trait_label, [])
+            req.developsSkill = [get_or_create(o, o.Skill, f"{SKILL_PREFIX}{safe_name(s)}", s) for s in gap_skills]
+            req.skillOrder = [json.dumps(list(gap_skills))]
+            requirements.append(req)
+        for stale in set(getattr(role, "hasTraitRequirement", None) or []) - set(requirements):
+            destroy_entity(stale)
+        role.hasTraitRequirement = requirements
+        for prop_name in ("requiresTrait", "traitWeight"):
+            if getattr(role, prop_name, None):
+                setattr(role, prop_name, [])
+        skills = cfg.get("skills", [])
+        role.requiresSkill = [get_or_create(o, o.Skill, f"{SKILL_PREFIX}{safe_name(s)}", s) for s in skills]
+        role.skillOrder = [json.dumps(list(skills))]
+        if getattr(o, "seedDigest", None) is not None:
+            role.seedDigest = [seed_digests[role_label]] if role_label in seed_digests else []
+        written += 1
+    return written
+
+
+def blueprints_from_json(payload):
+    """Split an import document ({role: {"trait_targets", "skills", "skill_gaps"}}) for write_roles.
+
+    Raises ValueError when a role has no usable trait targets.
+    """
+    if not isinstance(payload, dict):
+        raise ValueError("expected a JSON object of roles")
+    blueprints, skill_gaps = {}, {}
+    for role_label, cfg in payload.items():
+        targets = (cfg or {}).get("trait_targets") if isinstance(cfg, dict) else None
+        if not isinstance(targets, dict) or not targets:
+            raise ValueError(f"role '{role_label}' needs a non-empty trait_targets object")
+        trait_targets = {}
+        for trait, meta in targets.items():
+            try:
+                trait_targets[trait] = {
+                    "target": float(meta.get("target", DEFAULT_TARGET)),
+                    "weight": float(meta.get("weight", DEFAULT_WEIGHT)),
+                }
+            except (AttributeError, TypeError, ValueError):
+                raise ValueError(f"role '{role_label}': trait '{trait}' needs numeric target and weight")
+        gaps = cfg.get("skill_gaps", {})
+        if not isinstance(gaps, dict):
+            raise ValueError(f"role '{role_label}': skill_gaps must be an object of trait -> skills")
+        blueprints[str(role_label)] = {"trait_targets": trait_targets, "skills": [str(s) for s in cfg.get("skills", [])]}
+        if gaps:
+            skill_gaps[str(role_label)] = {t: [str(s) for s in skills] for t, skills in gaps.items()}
+    return blueprints, skill_gaps
@@ -0,0 +1,117 @@
+"""Vectorized career-role fit scoring for many participants at once."""
+
+import numpy as np
+
+
+def exact_round(values, ndigits=2):
+    """Round an array exactly like Python's round(x, ndigits).
+
+    np.round scales by 10**ndigits before rounding, which can land on the other side of a .5
+    boundary; only those near-tie elements are re-rounded with the builtin.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    rounded = np.round(values, ndigits)
+    scaled = values * (10 ** ndigits)
+    near_tie = np.abs(np.abs(scaled - np.trunc(scaled)) - 0.5) < 1e-6
+    if near_tie.any():
+        rounded[near_tie] = [round(v, ndigits) for v in values[near_tie].tolist()]
+    return rounded
+
+
+class RoleFitMatrix:
+    """Role blueprints compiled into per-role target and weight matrices.
+
+    Column k of targets/weights holds the k-th trait of each role in blueprint order, and
+    trait_columns maps it back to a column of the participant trait matrix. Keeping the
+    blueprint order lets the weighted sum accumulate in the same order as score_role_fit, so
+    the scores are bit-for-bit identical.
+    """
+
+    def __init__(self, blueprints, traits=None):
+        self.roles = tuple(blueprints.keys())
+        ordered_traits = list(traits or [])
+        for cfg in blueprints.values():
+            for trait_label in cfg.get("trait_targets", {}):
+                if trait_label not in ordered_traits:
+                    ordered_traits.append(trait_label)
+        self.traits = tuple(ordered_traits)
+        self.trait_index = {t: i for i, t in enumerate(self.traits)}
+
+        width = max((len(cfg.get("trait_targets", {})) for cfg in blueprints.values()), default=0)
+        shape = (len(self.roles), width)
+        self.targets = np.zeros(shape, dtype=np.float64)
+        self.weights = np.zeros(shape, dtype=np.float64)
+        self.trait_columns = np.zeros(shape, dtype=np.intp)
+        self.total_weight = np.ones(len(self.roles), dtype=np.float64)
+
+        for r, cfg in enumerate(blueprints.values()):
+            trait_targets = cfg.get("trait_targets", {})
+            self.total_weight[r] = sum(meta.get("weight", 0.0) for meta in trait_targets.values()) or 1.0
+            for k, (trait_label, meta) in enumerate(trait_targets.items()):
+                self.targets[r, k] = meta.get("target", 70)
+                self.weights[r, k] = meta.get("weight", 0.1)
+                self.trait_columns[r, k] = self.trait_index[trait_label]
+
+    def trait_matrix(self, trait_rows):
+        """Convert a list of {trait: percentage} dicts into an (N, T) matrix (missing traits are 0)."""
+        matrix = np.zeros((len(trait_rows), len(self.traits)), dtype=np.float64)
+        for i, row in enumerate(trait_rows):
+            for trait_label, value in row.items():
+                col = self.trait_index.get(trait_label)
+                if col is not None:
+                    matrix[i, col] = float(value)
+        return matrix
+
+    def raw_scores(self, trait_matrix, roles=None):
+        """Unrounded (N, R) fit scores in percent; roles (indices) restricts the columns."""
+        X = np.atleast_2d(np.asarray(trait_matrix, dtype=np.float64))
+        rows = slice(None) if roles is None else np.asarray(roles, dtype=np.intp)
+        targets, weights, columns = self.targets[rows], self.weights[rows], self.trait_columns[rows]
+        weighted_sum = np.zeros((X.shape[0], targets.shape[0]), dtype=np.float64)
+        for k in range(targets.shape[1]):
+            actual = X[:, columns[:, k]]
+            proximity = np.maximum(0.0, 1.0 - np.abs(actual - targets[:, k]) / 100.0)
+            weighted_sum = weighted_sum + proximity * weights[:, k]
+        return np.clip((weighted_sum / self.total_weight[rows]) * 100, 0.0, 100.0)
+
+    def scores(self, trait_matrix, roles=None):
+        """(N, R) fit scores rounded to 2 decimals, identical to score_role_fit."""
+        return exact_round(self.raw_scores(trait_matrix, roles), 2)
+
+    def best_roles(self, trait_matrix, chunk_size=4096):
+        """(N,) index of each row's best-fitting role (first in catalog order on ties).
+
+        Scored chunk_size rows at a time so an (N, R) matrix is never held for large catalogs.
+        """
+        X = np.atleast_2d(np.asarray(trait_matrix, dtype=np.float64))
+        best = np.zeros(X.shape[0], dtype=np.intp)
+        if not len(self.roles):
+            return best
+        for start in range(0, X.shape[0], chunk_size):
+            best[start:start + chunk_size] = np.argmax(self.scores(X[start:start + chunk_size]), axis=1)
+        return best
+
+    def top_roles(self, score_row, k=None):
+        """Role indices of the k best scores in one (R,) row, best first; ties keep catalog order.
+
+        An O(R) partition finds the k-th best score, so only the roles at or above it are sorted.
+        """
+        score_row = np.asarray(score_row)
+        n = score_row.shape[0]
+        if k is None or k >= n:
+            return np.argsort(-score_row, kind="stable")
+        if k <= 0:
+            return np.zeros(0, dtype=np.intp)
+        kth = np.partition(score_row, n - k)[n - k]
+        candidates = np.flatnonzero(score_row >= kth)
+        return candidates[np.argsort(-score_row[candidates], kind="stable")][:k]
+
+    def rankings(self, scores):
+        """(N, R) role indices per participant, best first; ties keep blueprint order."""
+        return np.argsort(-scores, axis=1, kind="stable")
+
+    def top_participants(self, scores, k):
+        """{role: [row indices]} of the k best-fitting participants per role; ties keep input order."""
+        k = max(0, min(int(k), scores.shape[0]))
+        order = np.argsort(-scores, axis=0, kind="stable")[:k]
+        return {role: order[:, r].tolist() for r, role in enumerate(self.roles)}
@@ -0,0 +1,145 @@
+"""Vectorized Big Five scoring: a question x trait keying matrix applied to one or many answer sets."""
+
+import numpy as np
+
+LIKERT_MIN = 1
+LIKERT_MAX = 5
+
+
+class ScoringEngine:
+    """Instrument compiled from the question catalog.
+
+    keying[q, t] is 1 when question q measures trait t and reverse[q] flags reverse-coded items
+    (scored as 6 - answer). Answer sets are encoded into an (N, Q) matrix of raw answers where 0
+    means "not answered", so scoring N participants is two matrix products.
+    """
+
+    def __init__(self, questions):
+        scored = [q for q in questions if q.trait.lower() != "unknown"]
+        traits = []
+        for q in scored:
+            trait_key = q.trait.lower().capitalize()
+            if trait_key not in traits:
+                traits.append(trait_key)
+
+        self.questions = tuple(scored)
+        self.traits = tuple(traits)
+        self.column = {q.id: idx for idx, q in enumerate(scored)}
+        self.keying = np.zeros((len(scored), len(traits)), dtype=np.float64)
+        for idx, q in enumerate(scored):
+            self.keying[idx, traits.index(q.trait.lower().capitalize())] = 1.0
+        self.reverse = np.array([bool(q.is_reverse) for q in scored], dtype=bool)
+
+    @classmethod
+    def from_catalog(cls, catalog):
+        return cls(catalog.questions)
+
+    def encode(self, answers, out=None):
+        """Turn an {question_id: answer} mapping into a raw-answer row (0 = unanswered).
+
+        Unknown question ids are ignored; answers outside 1-5 raise ValueError.
+        """
+        row = out if out is not None else np.zeros(len(self.questions), dtype=np.float64)
+        for q_id, value in answers.items():
+            col = self.column.get(q_id)
+            if col is None:
+                continue
+            try:
+                val = int(value)
+            except (ValueError, TypeError):
+                raise ValueError(f"Invalid answer value for question {q_id}")
+            if val < LIKERT_MIN or val > LIKERT_MAX:
+                raise ValueError(f"Answer for question {q_id} must be between {LIKERT_MIN} and {LIKERT_MAX}")
+            row[col] = val
+        return row
+
+    def encode_batch(self, answer_sets, errors=None):
+        """Encode a sequence of answer mappings into an (N, Q) raw-answer matrix.
+
+        When an errors dict is passed, invalid rows are recorded there by index (and left empty)
+        instead of aborting the whole batch.
+        """
+        matrix = np.zeros((len(answer_sets), len(self.questions)), dtype=np.float64)
+        for i, answers in enumerate(answer_sets):
+            try:
+                if not isinstance(answers, dict):
+                    raise ValueError("Answers must be an object of question id -> value")
+                self.encode(answers, out=matrix[i])
+            except ValueError as exc:
+                if errors is None:
+                    raise
+                matrix[i] = 0
+                errors[i] = str(exc)
+        return matrix
+
+    def score_matrix(self, raw):
+        """Return (means, percentages) arrays of shape (N, T) for an (N, Q) raw-answer matrix.
+
+        Traits with no answered items get a mean of 0, matching the per-participant loop.
+        """
+        raw = np.atleast_2d(np.asarray(raw, dtype=np.float64))
+        answered = raw > 0
+        effective = np.where(self.reverse & answered, (LIKERT_MAX + LIKERT_MIN) - raw, raw)
+        sums = effective @ self.keying
+        counts = answered.astype(np.float64) @ self.keying
+        means = np.divide(sums, counts, out=np.zeros_like(sums), where=counts > 0)
+        return means, (means / LIKERT_MAX) * 100
+
+    def score(self, answers):
+        """Score one answer mapping; returns (raw_scores, numeric_percentages, formatted_scores) dicts."""
+        means, _ = self.score_matrix(self.encode(answers))
+        return self.to_dicts(means[0])
+
+    def score_batch(self, answer_sets, errors=None):
+        """Score many answer mappings at once; returns a list of (raw, numeric, formatted) tuples.
+
+        With an errors dict, invalid answer sets are reported there and yield None in the result.
+        """
+        if not answer_sets:
+            return []
+        means, _ = self.score_matrix(self.encode_batch(answer_sets, errors))
+        failed = errors or {}
+        return [None if i in failed else self.to_dicts(row) for i, row in enumerate(means)]
+
+    def to_dicts(self, mean_row):
+        """Shape one row of trait means exactly like submit_assessment always has."""
+        raw_scores = {}
+        numeric_percentages = {}
+        formatted_scores = {}
+        for trait_key, mean_val in zip(self.traits, mean_row.tolist()):
+            if mean_val:
+                raw_scores[trait_key] = mean_val
+                # Python round() on the same float keeps percentages identical to the scalar path
+                pct_val = round((mean_val / LIKERT_MAX) * 100, 2)
+                numeric_percentages[trait_key] = pct_val
+                formatted_scores[trait_key] = f"{pct_val}%"
+            else:
+                raw_scores[trait_key] = 0
+                numeric_percentages[trait_key] = 0.0
+                formatted_scores[trait_key] = "0%"
+        return raw_scores, numeric_percentages, formatted_scores
+
+    def trait_steps(self):
+        """{trait: percentage points one answer point moves it} when every item is answered."""
+        items = self.keying.sum(axis=0)
+        return {t: 100.0 / (LIKERT_MAX * n) for t, n in zip(self.traits, items.tolist()) if n}
+
+    def percentage_range(self):
+        """(lowest, highest) trait percentage a complete answer set can produce."""
+        return 100.0 * LIKERT_MIN / LIKERT_MAX, 100.0
+
+    def answered_questions(self, answers):
+        """Per-question evidence (text, answer, reverse coding) used by the justification prompt."""
+        evidence = []
+        for q in self.questions:
+            if q.id not in answers:
+                continue
+            raw_val = int(answers[q.id])
+            evidence.append({
+                "question_text": q.text,
+                "trait": q.trait,
+                "answer": raw_val,
+                "is_reverse_coded": q.is_reverse,
+                "effective_score": (LIKERT_MAX + LIKERT_MIN - raw_val) if q.is_reverse else raw_val,
+            })
+        return evidence
@@ -0,0 +1,126 @@
+"""In-memory nearest-neighbour index over participants' Big Five trait vectors."""
+
+import threading
+
+import numpy as np
+
+
+class TraitVectorIndex:
+    """Vectorized brute-force block of trait vectors with each row's best-fitting role.
+
+    Rows live in preallocated float64 arrays that double when full, so upsert() is O(1)
+    amortized and a query is one pass of numpy arithmetic over an (N, T) block: at 100k
+    participants and 5 traits that is a few milliseconds, with exact distances and no tree
+    to rebalance on every submit. Only the best role is kept per row (an (N, R) fit matrix
+    would not fit in memory for a large role catalog); a min_fit filter scores its one role
+    column on demand.
+    """
+
+    def __init__(self, role_fit_matrix, capacity=1024):
+        self.world = None
+        self._lock = threading.Lock()
+        self._use_matrix(role_fit_matrix)
+        self._allocate(capacity)
+
+    def _use_matrix(self, role_fit_matrix):
+        self.role_fit_matrix = role_fit_matrix
+        self.traits = role_fit_matrix.traits
+        self.roles = role_fit_matrix.roles
+
+    def _allocate(self, capacity):
+        self._vectors = np.zeros((capacity, len(self.traits)), dtype=np.float64)
+        self._best = np.zeros(capacity, dtype=np.intp)
+        self._ids = []
+        self._row_of = {}
+
+    def __len__(self):
+        return len(self._ids)
+
+    def _grow(self, needed):
+        capacity = self._vectors.shape[0]
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+        vectors = np.zeros((capacity, len(self.traits)), dtype=np.float64)
+        best = np.zeros(capacity, dtype=np.intp)
+        vectors[:len(self._ids)] = self._vectors[:len(self._ids)]
+        best[:len(self._ids)] = self._best[:len(self._ids)]
+        self._vectors, self._best = vectors, best
+
+    def rebuild(self, items, role_fit_matrix=None):
+        """Replace the contents with (user_id, {trait: percentage}) pairs (and the role catalog)."""
+        matrix = role_fit_matrix or self.role_fit_matrix
+        items = [(user_id, scores) for user_id, scores in items if scores]
+        vectors = matrix.trait_matrix([scores for _, scores in items])
+        best = matrix.best_roles(vectors)
+        with self._lock:
+            self._use_matrix(matrix)
+            self._allocate(max(1024, len(items)))
+            self._vectors[:len(items)] = vectors
+            self._best[:len(items)] = best
+            self._ids = [user_id for user_id, _ in items]
+            self._row_of = {user_id: row for row, user_id in enumerate(self._ids)}
+
+    def upsert(self, user_id, scores):
+        """Insert or update one participant's vector (and best role)."""
+        with self._lock:
+            vector = self.role_fit_matrix.trait_matrix([scores])
+            best = self.role_fit_matrix.best_roles(vector)[0]
+            row = self._row_of.get(user_id)
+            if row is None:
+                row = len(self._ids)
+                self._grow(row + 1)
+                self._ids.append(user_id)
+                self._row_of[user_id] = row
+            self._vectors[row] = vector[0]
+            self._best[row] = best
+
+    def vector(self, user_id):
+        with self._lock:
+            row = self._row_of.get(user_id)
+            return None if row is None else dict(zip(self.traits, self._vectors[row].tolist()))
+
+    def nearest(self, user_id, k=10, role=None, min_fit=None, fit_roles=3):
+        """The k participants closest to user_id (Euclidean, percentage points), self excluded.
+
+        role alone keeps neighbours whose best-fitting role is role; with min_fit it keeps
+        neighbours whose fit for role is at least min_fit. Each neighbour carries its fit for
+        its fit_roles best roles (and role, when given). Returns None for an unknown user.
+        """
+        with self._lock:
+            row = self._row_of.get(user_id)
+            if row is None:
+                return None
+            matrix = self.role_fit_matrix
+            n = len(self._ids)
+            vectors = self._vectors[:n]
+            distances = np.sqrt(((vectors - vectors[row]) ** 2).sum(axis=1))
+
+            candidates = np.ones(n, dtype=bool)
+            candidates[row] = False
+            r = None
+            if role is not None:
+                r = self.roles.index(role)
+                if min_fit is not None:
+                    candidates &= matrix.scores(vectors, roles=[r])[:, 0] >= min_fit
+                else:
+                    candidates &= self._best[:n] == r
+            pool = np.flatnonzero(candidates)
+            if k < len(pool):
+                pool = pool[np.argpartition(distances[pool], k)[:k]]
+            # Stable order: distance, then insertion order
+            pool = pool[np.lexsort((pool, distances[pool]))]
+            fit = matrix.scores(vectors[pool]) if len(pool) else np.zeros((0, len(self.roles)))
+            neighbors = []
+            for i, fit_row in zip(pool.tolist(), fit):
+                shown = set(matrix.top_roles(fit_row, fit_roles).tolist())
+                if r is not None:
+                    shown.add(r)
+                neighbors.append({
+                    "id": self._ids[i],
+                    "distance": round(float(distances[i]), 3),
+                    "scores": dict(zip(self.traits, vectors[i].tolist())),
+                    "role_fit": {self.roles[j]: float(fit_row[j]) for j in sorted(shown)},
+                })
+            return neighbors
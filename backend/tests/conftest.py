@@ -0,0 +1,85 @@
+"""Boot the app once per session against a temporary copy of project.rdf, with Groq stubbed."""
+
+import contextlib
+import io
+import json
+import os
+import random
+import shutil
+import sys
+import types
+
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class StubStream:
+    """Stands in for the Groq client: streams `text` word by word, or raises after `fail_after` chunks."""
+
+    def __init__(self, text="Stub analysis streamed in several chunks.", fail_after=None):
+        self.text = text
+        self.fail_after = fail_after
+        self.calls = []
+        self.chat = types.SimpleNamespace(completions=self)
+
+    def create(self, **kwargs):
+        self.calls.append(kwargs)
+        if not kwargs.get("stream"):
+            return types.SimpleNamespace(choices=[types.SimpleNamespace(message=types.SimpleNamespace(content=self.text))])
+        return self._chunks()
+
+    def _chunks(self):
+        words = self.text.split(" ")
+        for i, word in enumerate(words):
+            if self.fail_after is not None and i == self.fail_after:
+                raise RuntimeError("stub stream failed")
+            delta = word if i == len(words) - 1 else word + " "
+            yield types.SimpleNamespace(choices=[types.SimpleNamespace(delta=types.SimpleNamespace(content=delta))])
+
+
+def parse_sse(body):
+    """[(event, payload)] out of a text/event-stream body."""
+    events = []
+    for block in body.strip().split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((fields["event"], json.loads(fields["data"])))
+    return events
+
+
+@pytest.fixture(scope="session")
+def app_module(tmp_path_factory):
+    workdir = tmp_path_factory.mktemp("ontology")
+    ontology_path = str(workdir / "project.rdf")
+    shutil.copy(os.path.join(BACKEND_DIR, "project.rdf"), ontology_path)
+    os.environ.update(
+        ONTOLOGY_PATH=ontology_path,
+        ONTOLOGY_STORAGE="rdfxml",
+        ONTOLOGY_SAVE_INTERVAL_SECONDS="0",
+        GROQ_API_KEY="",
+        LLM_CACHE_MAX_ENTRIES="0",
+    )
+    for key in ("ONTOLOGY_BOOT_SNAPSHOT", "LLM_CACHE_PATH", "POPULATION_NORMS_PATH"):
+        os.environ.pop(key, None)
+    sys.path.insert(0, BACKEND_DIR)
+    with contextlib.redirect_stdout(io.StringIO()):
+        import app
+    return app
+
+
+@pytest.fixture
+def client(app_module):
+    return app_module.app.test_client()
+
+
+@pytest.fixture
+def answers(app_module):
+    rng = random.Random("tests")
+    return {q.id: rng.randint(1, 5) for q in app_module.scoring_engine.questions}
+
+
+@pytest.fixture
+def groq_stub(app_module, monkeypatch):
+    stub = StubStream()
+    monkeypatch.setattr(app_module, "client", stub)
+    return stub
@@ -0,0 +1,49 @@
+from owlready2 import World
+
+from conftest import parse_sse
+
+
+def submit(client, user_id, answers):
+    response = client.post("/submit_assessment", json={"id": user_id, "name": "Stream Test", "answers": answers, "stream_analysis": True})
+    assert response.status_code == 200
+    assert response.get_json()["analysis_stream"] == f"/api/analysis/stream/{user_id}"
+
+
+def stored_analysis(app_module, user_id):
+    """hasAnalysisReport as saved to the ontology file, read through a fresh World."""
+    app_module.ontology_writer.flush()
+    onto = World().get_ontology(app_module.ONTOLOGY_PATH).load()
+    participant = onto.world[f"{onto.base_iri}Participant_{user_id}"]
+    return list(participant.hasAnalysisReport)
+
+
+def test_stream_relays_tokens_then_persists_analysis(app_module, client, answers, groq_stub):
+    submit(client, "stream-ok", answers)
+
+    response = client.get("/api/analysis/stream/stream-ok")
+    assert response.mimetype == "text/event-stream"
+    events = parse_sse(response.get_data(as_text=True))
+
+    tokens = [payload["text"] for event, payload in events if event == "token"]
+    assert len(tokens) == len(groq_stub.text.split(" "))
+    assert "".join(tokens) == groq_stub.text
+    assert events[-1] == ("done", {"length": len(groq_stub.text)})
+    assert groq_stub.calls[-1]["stream"] is True
+    assert stored_analysis(app_module, "stream-ok") == [groq_stub.text]
+
+
+def test_stream_error_reports_event_and_persists_nothing(app_module, client, answers, groq_stub):
+    submit(client, "stream-error", answers)
+    groq_stub.fail_after = 2
+
+    events = parse_sse(client.get("/api/analysis/stream/stream-error").get_data(as_text=True))
+
+    assert [event for event, _ in events] == ["token", "token", "error"]
+    assert "stub stream failed" in events[-1][1]["message"]
+    assert stored_analysis(app_module, "stream-error") == []
+
+
+def test_stream_unknown_participant(client, groq_stub):
+    response = client.get("/api/analysis/stream/nobody-here")
+    assert response.get_json() == {"found": False, "message": "not found"}
+    assert groq_stub.calls == []
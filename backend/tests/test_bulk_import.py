@@ -0,0 +1,19 @@
+def import_records(user_ids, answers, between_chunks=None):
+    """(line_no, record, error) tuples; between_chunks() runs before the second record is read."""
+    for line_no, user_id in enumerate(user_ids, start=1):
+        if line_no == 2 and between_chunks is not None:
+            between_chunks()
+        yield line_no, {"id": user_id, "name": f"Imported {user_id}", "answers": answers}, None
+
+
+def test_rollback_between_chunks_keeps_imported_chunks(app_module, answers):
+    def failing_request_rolls_back():
+        with app_module.ontology_lock.write_locked():
+            app_module.onto = app_module.rollback_ontology()
+
+    user_ids = ["import-a", "import-b", "import-c"]
+    report = app_module.import_assessments(import_records(user_ids, answers, failing_request_rolls_back), chunk_size=1)
+
+    assert report["imported"] == 3
+    for user_id in user_ids:
+        assert app_module.extract_trait_percentages_for_participant(user_id)
@@ -0,0 +1,17 @@
+def test_steady_state_career_fit_never_writes(app_module, client, answers, groq_stub, monkeypatch):
+    client.post("/submit_assessment", json={"id": "fit-pure", "name": "Fit Pure", "answers": answers})
+    assert client.get("/api/career-fit/fit-pure?top_k=2").status_code == 200
+
+    transactions = []
+    ontology_transaction = app_module.ontology_transaction
+
+    def counting_transaction():
+        transactions.append(1)
+        return ontology_transaction()
+
+    monkeypatch.setattr(app_module, "ontology_transaction", counting_transaction)
+    for top_k in (1, 3, 2) * 4:
+        app_module.participant_responses.clear()
+        assert client.get(f"/api/career-fit/fit-pure?top_k={top_k}").status_code == 200
+
+    assert transactions == []
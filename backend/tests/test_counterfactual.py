@@ -0,0 +1,103 @@
+import itertools
+import random
+
+import numpy as np
+import pytest
+
+from counterfactual import CounterfactualEngine
+from role_fit import RoleFitMatrix
+
+TRAITS = ("Openness", "Conscientiousness", "Extraversion")
+
+
+def random_case(rng):
+    blueprints = {
+        f"Role {r}": {"trait_targets": {
+            t: {"target": rng.randint(20, 100), "weight": round(rng.uniform(0.05, 0.5), 2)}
+            for t in rng.sample(TRAITS, rng.randint(1, len(TRAITS)))
+        }}
+        for r in range(rng.randint(2, 4))
+    }
+    steps = {t: rng.choice([10.0, 20.0 / 3]) for t in TRAITS}
+    # Trait percentages sit on the answer grid, as they do for fully answered assessments
+    scores = {t: round(20.0 + steps[t] * rng.randint(0, int(80 / steps[t] + 1e-9)), 2) for t in TRAITS}
+    return CounterfactualEngine(RoleFitMatrix(blueprints), scores, steps)
+
+
+def every_offset(engine):
+    """(N, T) every reachable combination of answer-point offsets, and their point counts."""
+    grid = np.array(list(itertools.product(*(range(lo, hi + 1) for lo, hi in zip(engine.min_offset, engine.max_offset)))))
+    return grid, np.abs(grid).sum(axis=1)
+
+
+def brute_rank_first(engine, r):
+    grid, points = every_offset(engine)
+    rounded = engine.matrix.scores(engine.x + grid * engine.steps)
+    first = (rounded[:, r] > rounded[:, :r].max(axis=1, initial=-np.inf)) & (rounded[:, r] >= rounded[:, r + 1:].max(axis=1, initial=-np.inf))
+    return int(points[first].min()) if first.any() else None
+
+
+def brute_reach_score(engine, r, score):
+    grid, points = every_offset(engine)
+    reached = engine.matrix.raw_scores(engine.x + grid * engine.steps)[:, r] >= score - 1e-9
+    return int(points[reached].min()) if reached.any() else None
+
+
+@pytest.mark.parametrize("seed", range(30))
+def test_rank_first_and_reach_score_match_brute_force(seed):
+    rng = random.Random(seed)
+    engine = random_case(rng)
+
+    for r, role in enumerate(engine.roles):
+        plan = engine.plan_rank_first(role, max_states=10 ** 6)
+        assert (plan["answer_points"] if plan else None) == brute_rank_first(engine, r)
+        if plan is not None:
+            assert plan["rank_after"] == 1
+
+        score = round(float(engine.current[r]) + rng.uniform(1, 40), 2)
+        plan = engine.plan_score(role, score)
+        expected = brute_reach_score(engine, r, score)
+        assert (plan["answer_points"] if plan else None) == expected
+        if plan is not None:
+            assert plan["score_after"] >= score - 0.01
+        assert engine.points_to_score(score, [r])[0] == (np.inf if expected is None else expected)
+
+
+def engine_for(blueprints, scores=None):
+    scores = scores or {"Openness": 60.0, "Conscientiousness": 40.0}
+    return CounterfactualEngine(RoleFitMatrix(blueprints), scores, {"Openness": 10.0, "Conscientiousness": 10.0})
+
+
+BLUEPRINTS = {
+    "Leader": {"trait_targets": {"Openness": {"target": 60, "weight": 0.5}, "Conscientiousness": {"target": 40, "weight": 0.5}}},
+    "Planner": {"trait_targets": {"Conscientiousness": {"target": 90, "weight": 1.0}}},
+}
+
+
+def test_already_reached_targets_need_no_change():
+    engine = engine_for(BLUEPRINTS)
+
+    for plan in (engine.plan_rank_first("Leader"), engine.plan_score("Leader", 100.0), engine.plan_score("Planner", 10.0)):
+        assert plan["answer_points"] == 0
+        assert plan["changes"] == {}
+    assert engine.points_to_score(50.0).tolist() == [0, 0]
+
+
+def test_unreachable_targets_have_no_plan():
+    twins = dict(BLUEPRINTS, Twin=BLUEPRINTS["Leader"])
+    engine = engine_for(twins)
+
+    assert engine.plan_score("Planner", 100.01) is None
+    assert engine.points_to_score(100.01, [1])[0] == np.inf
+    # Equal fit always ranks the earlier role first
+    assert engine.plan_rank_first("Twin") is None
+
+
+def test_role_without_trait_targets():
+    engine = engine_for(dict(BLUEPRINTS, Empty={"trait_targets": {}}))
+
+    assert engine.current[engine.role_index["Empty"]] == 0.0
+    assert engine.trait_gains("Empty") == {}
+    assert engine.plan_score("Empty", 0.0)["answer_points"] == 0
+    assert engine.plan_score("Empty", 1.0) is None
+    assert engine.plan_rank_first("Empty") is None
@@ -0,0 +1,17 @@
+from owlready2 import destroy_entity
+
+
+def test_index_miss_falls_back_to_the_ontology_and_backfills(app_module):
+    onto = app_module.onto
+    with app_module.ontology_lock.write_locked():
+        with onto:
+            ghost = onto.Participant("Participant_ghost")  # written behind the index's back
+    try:
+        assert app_module.entity_index.lookup("Participant_ghost") is None
+        assert app_module.find_entity_by_id(onto.Participant, "Participant_ghost") is ghost
+        assert app_module.entity_index.lookup("Participant_ghost") is ghost
+        assert app_module.find_entity_by_id(onto.Participant, "Participant_nobody") is None
+    finally:
+        with app_module.ontology_lock.write_locked():
+            app_module.entity_index.forget(ghost)
+            destroy_entity(ghost)
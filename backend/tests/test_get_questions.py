@@ -0,0 +1,59 @@
+import gzip
+import json
+
+from question_catalog import CompiledQuestion, QuestionCatalog
+
+
+def test_identity_response_and_etag(app_module, client):
+    response = client.get("/get_questions")
+
+    assert response.status_code == 200
+    assert "Content-Encoding" not in response.headers
+    assert response.headers["ETag"] == f'"{app_module.question_catalog.etag}"'
+    assert response.headers["Vary"] == "Accept-Encoding"
+    assert [q["id"] for q in response.get_json()] == [q.id for q in app_module.question_catalog.questions]
+
+
+def test_gzip_response_decodes_to_the_same_body(app_module, client):
+    plain = client.get("/get_questions").get_data()
+    response = client.get("/get_questions", headers={"Accept-Encoding": "gzip, deflate"})
+
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.headers["ETag"] == f'"{app_module.question_catalog.gzip_etag}"'
+    assert gzip.decompress(response.get_data()) == plain
+
+
+def test_accept_encoding_without_gzip_is_served_plain(client):
+    response = client.get("/get_questions", headers={"Accept-Encoding": "br, deflate"})
+
+    assert "Content-Encoding" not in response.headers
+    assert json.loads(response.get_data())
+
+
+def test_matching_if_none_match_is_304(client):
+    for headers in ({}, {"Accept-Encoding": "gzip"}):
+        etag = client.get("/get_questions", headers=headers).headers["ETag"]
+        response = client.get("/get_questions", headers=dict(headers, **{"If-None-Match": etag}))
+
+        assert response.status_code == 304
+        assert response.get_data() == b""
+        assert response.headers["ETag"] == etag
+
+
+def test_etag_of_the_other_encoding_does_not_match(client):
+    gzip_etag = client.get("/get_questions", headers={"Accept-Encoding": "gzip"}).headers["ETag"]
+
+    assert client.get("/get_questions", headers={"If-None-Match": gzip_etag}).status_code == 200
+
+
+def test_changed_catalog_gets_a_new_etag(app_module, client, monkeypatch):
+    old_etag = client.get("/get_questions").headers["ETag"]
+    questions = list(app_module.question_catalog.questions)
+    questions[0] = CompiledQuestion(questions[0].id, questions[0].text + " (reworded)", questions[0].trait, questions[0].is_reverse)
+    monkeypatch.setattr(app_module, "question_catalog", QuestionCatalog(questions))
+
+    response = client.get("/get_questions", headers={"If-None-Match": old_etag})
+
+    assert response.status_code == 200
+    assert response.headers["ETag"] != old_etag
+    assert response.get_json()[0]["text"].endswith("(reworded)")
@@ -0,0 +1,27 @@
+import json
+
+from llm_cache import LLMCache
+
+
+def test_inserts_are_written_behind_and_flushed_on_close(tmp_path):
+    path = tmp_path / "llm_cache.json"
+    cache = LLMCache(path=str(path), save_interval=3600)
+
+    cache.set("analysis:a", "first")
+    cache.set("analysis:b", "second")
+    assert not path.exists()
+
+    cache.close()
+    assert [row[0] for row in json.loads(path.read_text())] == ["analysis:a", "analysis:b"]
+    assert LLMCache(path=str(path)).get("analysis:b") == "second"
+
+
+def test_flush_writes_pending_inserts_once(tmp_path):
+    path = tmp_path / "llm_cache.json"
+    cache = LLMCache(path=str(path), save_interval=3600)
+    cache.set("analysis:a", "first")
+
+    assert cache.flush() is True
+    assert cache.flush() is False
+    assert [p.name for p in tmp_path.iterdir()] == ["llm_cache.json"]
+    cache.close()
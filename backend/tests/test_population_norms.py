@@ -0,0 +1,115 @@
+import json
+import os
+import shutil
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+from conftest import BACKEND_DIR
+from population_norms import PopulationNorms, TraitDistribution
+
+# 0.1-point values sit exactly on the histogram bins, so percentile ranks are exact, not binned
+SAMPLE = np.round(np.random.default_rng(17).uniform(0, 100, 2000), 1)
+
+
+def numpy_percentile_rank(values, value):
+    """Percent below value with ties counted as half (scipy's percentileofscore kind="mean")."""
+    return round((np.sum(values < value) + 0.5 * np.sum(values == value)) / values.size * 100, 1)
+
+
+def assert_matches_numpy(dist, values):
+    assert dist.count == values.size
+    assert dist.mean == pytest.approx(values.mean(), abs=1e-9)
+    assert dist.std() == pytest.approx(values.std(), abs=1e-9)
+    for probe in (0.0, 12.3, values.min(), np.median(values), 50.0, 77.7, values.max(), 100.0):
+        assert dist.percentile_rank(probe) == numpy_percentile_rank(values, probe)
+
+
+def test_welford_and_histogram_match_numpy():
+    dist = TraitDistribution()
+    for value in SAMPLE:
+        dist.add(value)
+
+    assert_matches_numpy(dist, SAMPLE)
+
+
+def test_removal_matches_numpy_on_what_is_left():
+    dist = TraitDistribution()
+    for value in SAMPLE:
+        dist.add(value)
+    for value in SAMPLE[::3]:
+        dist.remove(value)
+
+    assert_matches_numpy(dist, np.delete(SAMPLE, np.s_[::3]))
+
+
+def test_replace_moves_a_participant_instead_of_adding_one():
+    norms = PopulationNorms()
+    norms.reset({"Openness": value} for value in SAMPLE[:-1])
+    norms.replace({"Openness": SAMPLE[0]}, {"Openness": SAMPLE[-1]})
+
+    expected = np.append(SAMPLE[1:-1], SAMPLE[-1])
+    assert norms.summary()["Openness"] == {
+        "count": expected.size, "mean": round(expected.mean(), 3), "std": round(expected.std(), 3),
+    }
+
+
+def test_saved_norms_load_only_for_their_source(tmp_path):
+    path = str(tmp_path / "project.norms.json")
+    norms = PopulationNorms()
+    norms.reset({"Openness": a, "Neuroticism": b} for a, b in zip(SAMPLE, SAMPLE[::-1]))
+    norms.save(path, [1, 2])
+
+    restored = PopulationNorms()
+    assert not restored.load(path, [1, 3])
+    assert restored.load(path, [1, 2])
+    probe = {"Openness": 42.4, "Neuroticism": 88.8}
+    assert restored.compare(probe) == norms.compare(probe)
+    assert restored.summary() == norms.summary()
+
+
+# Boots the app (optionally importing records first) and reports the norms it ended up with
+CHILD = """
+import contextlib, io, json, sys
+out = io.StringIO()
+with contextlib.redirect_stdout(out):
+    import app
+    records = json.loads(sys.argv[1])
+    if records:
+        app.import_assessments((i + 1, record, None) for i, record in enumerate(records))
+rows = [app.stored_trait_percentages(user_id) for user_id in app.entity_index.scored_user_ids()]
+print(json.dumps({"loaded": "Population norms loaded" in out.getvalue(), "rows": rows,
+                  "compare": app.population_norms.compare(rows[-1])}))
+"""
+
+
+def test_restart_reloads_norms_from_the_norms_file(tmp_path, app_module):
+    ontology_path = str(tmp_path / "project.rdf")
+    shutil.copy(os.path.join(BACKEND_DIR, "project.rdf"), ontology_path)
+    env = dict(os.environ, ONTOLOGY_PATH=ontology_path, ONTOLOGY_STORAGE="rdfxml", ONTOLOGY_SAVE_INTERVAL_SECONDS="0",
+               GROQ_API_KEY="", LLM_CACHE_MAX_ENTRIES="0")
+    for key in ("ONTOLOGY_BOOT_SNAPSHOT", "LLM_CACHE_PATH", "POPULATION_NORMS_PATH"):
+        env.pop(key, None)
+    rng = np.random.default_rng(5)
+    questions = [q.id for q in app_module.scoring_engine.questions]
+    records = [{"id": f"norm{i}", "name": f"Norm {i}", "answers": {q: int(rng.integers(1, 6)) for q in questions}}
+               for i in range(40)]
+
+    def boot(payload):
+        out = subprocess.run([sys.executable, "-c", CHILD, json.dumps(payload)], cwd=BACKEND_DIR, env=env,
+                             check=True, capture_output=True, text=True).stdout
+        return json.loads(out.strip().splitlines()[-1])
+
+    first = boot(records)
+    assert os.path.exists(str(tmp_path / "project.norms.json"))
+    second = boot([])
+
+    assert second["loaded"] is True
+    assert second["compare"] == first["compare"]
+    for trait, result in second["compare"].items():
+        values = np.array([row[trait] for row in second["rows"] if trait in row])
+        mean, std = values.mean(), values.std()
+        assert result["percentile"] == pytest.approx(numpy_percentile_rank(values, second["rows"][-1][trait]), abs=0.05)
+        assert result["z"] == pytest.approx(round((second["rows"][-1][trait] - mean) / std, 3), abs=1e-3)
@@ -0,0 +1,23 @@
+from response_cache import ParticipantResponseCache
+
+
+def test_invalidation_versions_are_bounded():
+    cache = ParticipantResponseCache(max_participants=2)
+    for i in range(100):
+        cache.invalidate(f"user{i}")
+
+    assert cache.stats()["tracked_versions"] == 2
+
+
+def test_fill_in_flight_across_version_eviction_is_not_stored():
+    cache = ParticipantResponseCache(max_participants=2)
+    version = cache.version("a")
+    cache.invalidate("a")
+    cache.invalidate("b")
+    cache.invalidate("c")  # evicts a's version
+
+    cache.put("a", "v", version, b"stale", 200, "application/json")
+    assert cache.get("a", "v") is None
+
+    cache.put("a", "v", cache.version("a"), b"fresh", 200, "application/json")
+    assert cache.get("a", "v").body == b"fresh"
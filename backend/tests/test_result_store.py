@@ -0,0 +1,39 @@
+import random
+
+import numpy as np
+
+from result_store import ResultStore
+from role_fit import RoleFitMatrix
+
+
+def partial_answer_records(app_module, count):
+    """Participants who skipped questions, so their trait percentages are not round numbers."""
+    rng = random.Random("partial")
+    question_ids = [q.id for q in app_module.scoring_engine.questions]
+    for i in range(count):
+        answered = rng.sample(question_ids, rng.randint(len(question_ids) // 3, len(question_ids) - 1))
+        yield i + 1, {"id": f"partial{i}", "name": f"Partial {i}", "answers": {q: rng.randint(1, 5) for q in answered}}, None
+
+
+def test_batch_all_matches_score_role_fit(app_module, client):
+    report = app_module.import_assessments(partial_answer_records(app_module, 200))
+    assert report["imported"] == 200
+
+    batch = client.post("/api/career-fit/batch", json={"participants": "all"}).get_json()
+
+    assert batch["count"] >= 200
+    for participant in batch["participants"]:
+        trait_scores = app_module.extract_trait_percentages_for_participant(participant["id"])
+        role_results, ranking = app_module.score_role_fit(trait_scores)
+        assert participant["scores"] == {role: info["score"] for role, info in role_results.items()}
+        assert [item["role"] for item in participant["ranking"]] == ranking
+
+
+def test_new_trait_column_keeps_first_value():
+    store = ResultStore(RoleFitMatrix({}))
+    store.rebuild([("a", {"Openness": 61.25}, {}, None)])
+    store.upsert("b", {"Openness": 40.0, "Grit": 12.5}, {})
+
+    ids, matrix = store.trait_matrix(["Openness", "Grit"])
+    assert ids == ["a", "b"]
+    assert np.array_equal(matrix, [[61.25, 0.0], [40.0, 12.5]])
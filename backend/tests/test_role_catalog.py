@@ -0,0 +1,91 @@
+import copy
+
+from owlready2 import World
+
+from role_catalog import RoleCatalog, blueprints_from_json, seed_digest, seed_roles, write_roles
+
+
+def saved_ontology(app_module):
+    """A private World loaded from the saved ontology file, so edits never reach the app."""
+    app_module.ontology_writer.flush()
+    return World().get_ontology(app_module.ONTOLOGY_PATH).load()
+
+
+def test_seeded_catalog_keeps_blueprint_skill_order(app_module):
+    catalog = RoleCatalog.from_ontology(saved_ontology(app_module))
+
+    assert list(catalog.roles) == list(app_module.ROLE_BLUEPRINTS)
+    for role, cfg in app_module.ROLE_BLUEPRINTS.items():
+        assert catalog.blueprints[role]["skills"] == cfg["skills"]
+    assert catalog.skill_gaps == app_module.ROLE_TRAIT_SKILL_GAPS
+    contributions = [{"trait": "Extraversion", "closeness": 10.0}]
+    assert catalog.suggest_skill_gaps("Manager", contributions) == ["Executive Presence", "Facilitation"]
+
+
+def test_reimport_clears_role_level_trait_values(app_module):
+    o = saved_ontology(app_module)
+    role = o.search_one(iri=f"{o.base_iri}Role_Manager")
+    with o:
+        role.traitWeight = [0.28, 0.24]
+        role.requiresTrait = [o.search_one(iri=f"{o.base_iri}Openness")]
+        blueprints, skill_gaps = blueprints_from_json({"Manager": app_module.ROLE_BLUEPRINTS["Manager"]})
+        write_roles(o, blueprints, skill_gaps)
+
+    assert list(role.traitWeight) == []
+    assert list(role.requiresTrait) == []
+    assert RoleCatalog.from_ontology(o).blueprints["Manager"]["skills"] == app_module.ROLE_BLUEPRINTS["Manager"]["skills"]
+
+
+def test_reseed_keeps_imported_roles_and_updates_seeded_ones(app_module):
+    o = saved_ontology(app_module)
+    builtin, gaps = app_module.ROLE_BLUEPRINTS, app_module.ROLE_TRAIT_SKILL_GAPS
+    role = o.search_one(iri=f"{o.base_iri}Role_Manager")
+    assert list(role.seedDigest) == [seed_digest(builtin["Manager"], gaps.get("Manager"))]
+
+    imported = copy.deepcopy(builtin["Manager"])
+    imported["skills"] = ["Budgeting"]
+    changed = copy.deepcopy(builtin)
+    changed["Researcher"]["skills"].append("Grant Writing")
+    changed["Analyst"] = {"trait_targets": {"Openness": {"target": 70, "weight": 0.5}}, "skills": []}
+    with o:
+        write_roles(o, {"Manager": imported})
+        seeded = seed_roles(o, changed, gaps)
+
+    catalog = RoleCatalog.from_ontology(o)
+    assert seeded == ["Researcher", "Analyst"]
+    assert list(role.seedDigest) == []
+    assert catalog.blueprints["Manager"]["skills"] == ["Budgeting"]
+    assert catalog.blueprints["Researcher"]["skills"][-1] == "Grant Writing"
+    assert "Analyst" in catalog.roles
+    with o:
+        assert seed_roles(o, changed, gaps) == []
+
+
+def test_unmarked_role_matching_its_blueprint_is_adopted(app_module):
+    o = saved_ontology(app_module)
+    builtin, gaps = app_module.ROLE_BLUEPRINTS, app_module.ROLE_TRAIT_SKILL_GAPS
+    role = o.search_one(iri=f"{o.base_iri}Role_Manager")
+    with o:
+        role.seedDigest = []
+        assert seed_roles(o, builtin, gaps) == []
+
+    assert list(role.seedDigest) == [seed_digest(builtin["Manager"], gaps.get("Manager"))]
+
+
+def test_blueprints_from_json_without_skill_gaps():
+    blueprints, skill_gaps = blueprints_from_json({"Analyst": {"trait_targets": {"Openness": {"target": 70, "weight": 0.5}}}})
+
+    assert blueprints == {"Analyst": {"trait_targets": {"Openness": {"target": 70.0, "weight": 0.5}}, "skills": []}}
+    assert skill_gaps == {}
+
+
+def test_career_fit_stores_every_role_whatever_top_k(app_module, client, answers, groq_stub):
+    client.post("/submit_assessment", json={"id": "fit-all", "name": "Fit All", "answers": answers})
+
+    assert client.get("/api/career-fit/fit-all?top_k=1").status_code == 200
+    with app_module.ontology_snapshot():
+        participant = app_module.find_entity_by_id(app_module.onto.Participant, "Participant_fit-all")
+        stored = sorted(participant.roleFitScore)
+    trait_scores = app_module.extract_trait_percentages_for_participant("fit-all")
+    role_results, _ = app_module.score_role_fit(trait_scores)
+    assert stored == sorted(f"{role}:{info['score']}" for role, info in role_results.items())
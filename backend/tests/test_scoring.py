@@ -0,0 +1,87 @@
+import random
+
+import pytest
+
+from question_catalog import CompiledQuestion
+from scoring import ScoringEngine
+
+
+def reference_score(questions, answers):
+    """The per-question loop submit_assessment used before the keying matrix."""
+    trait_totals = {}
+    for details in questions:
+        trait = details.trait.lower()
+        if trait == "unknown":
+            continue
+        trait_totals.setdefault(trait, [])
+        if details.id in answers:
+            raw_val = int(answers[details.id])
+            trait_totals[trait].append((6 - raw_val) if details.is_reverse else raw_val)
+
+    raw_scores, numeric_percentages, formatted_scores = {}, {}, {}
+    for t, values in trait_totals.items():
+        trait_key = t.capitalize()
+        if values:
+            mean_val = sum(values) / len(values)
+            pct_val = round((mean_val / 5) * 100, 2)
+            raw_scores[trait_key], numeric_percentages[trait_key], formatted_scores[trait_key] = mean_val, pct_val, f"{pct_val}%"
+        else:
+            raw_scores[trait_key], numeric_percentages[trait_key], formatted_scores[trait_key] = 0, 0.0, "0%"
+    return raw_scores, numeric_percentages, formatted_scores
+
+
+QUESTIONS = [
+    CompiledQuestion("Q1", "a", "Openness", False),
+    CompiledQuestion("Q2", "b", "openness", True),
+    CompiledQuestion("Q3", "c", "Neuroticism", True),
+    CompiledQuestion("Q4", "d", "Unknown", False),
+    CompiledQuestion("Q5", "e", "Neuroticism", False),
+    CompiledQuestion("Q6", "f", "Conscientiousness", True),
+]
+
+
+def random_answer_sets(questions, count, seed):
+    """Partial answer sets that also carry ids the instrument does not know."""
+    rng = random.Random(seed)
+    ids = [q.id for q in questions]
+    for _ in range(count):
+        answers = {q_id: rng.randint(1, 5) for q_id in rng.sample(ids, rng.randint(0, len(ids)))}
+        if rng.random() < 0.5:
+            answers[f"Q{rng.randint(1000, 2000)}"] = rng.randint(1, 5)
+        yield answers
+
+
+@pytest.mark.parametrize("source", ["synthetic", "catalog"])
+def test_matches_reference_loop(app_module, source):
+    questions = QUESTIONS if source == "synthetic" else app_module.question_catalog.questions
+    engine = ScoringEngine(questions)
+    answer_sets = list(random_answer_sets(questions, 300, source))
+
+    expected = [reference_score(questions, answers) for answers in answer_sets]
+
+    assert [engine.score(answers) for answers in answer_sets] == expected
+    assert engine.score_batch(answer_sets) == expected
+
+
+def test_reverse_coding_unknown_and_missing_answers():
+    engine = ScoringEngine(QUESTIONS)
+
+    raw, numeric, formatted = engine.score({"Q1": 5, "Q2": 5, "Q3": 1, "Q4": 5, "Q999": 5})
+
+    assert engine.traits == ("Openness", "Neuroticism", "Conscientiousness")
+    assert raw == {"Openness": 3.0, "Neuroticism": 5.0, "Conscientiousness": 0}
+    assert numeric == {"Openness": 60.0, "Neuroticism": 100.0, "Conscientiousness": 0.0}
+    assert formatted["Conscientiousness"] == "0%"
+
+
+def test_invalid_answers_are_reported_per_row():
+    engine = ScoringEngine(QUESTIONS)
+    errors = {}
+
+    results = engine.score_batch([{"Q1": 4}, {"Q1": 6}, ["Q1"], {"Q1": "x"}], errors)
+
+    assert results[0] == reference_score(QUESTIONS, {"Q1": 4})
+    assert results[1:] == [None, None, None]
+    assert sorted(errors) == [1, 2, 3]
+    with pytest.raises(ValueError):
+        engine.score({"Q1": 0})
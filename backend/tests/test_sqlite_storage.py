@@ -0,0 +1,52 @@
+"""sqlite storage mode, in child interpreters (the session app runs in rdfxml mode)."""
+
+import json
+import os
+import shutil
+import subprocess
+import sys
+
+from conftest import BACKEND_DIR
+
+# Boots the app, reads a participant, imports it through the CLI in another process, reads again
+CHILD = """
+import contextlib, io, json, subprocess, sys
+with contextlib.redirect_stdout(io.StringIO()):
+    import app
+client = app.app.test_client()
+before = client.get("/get_previous_result?id=cli1").get_json()
+subprocess.run([sys.executable, "-m", "flask", "--app", "app", "import-assessments", sys.argv[1]], check=True, capture_output=True)
+after = client.get("/get_previous_result?id=cli1").get_json()
+print(json.dumps([before["found"], after["found"], after.get("scores")]))
+"""
+
+
+def sqlite_env(workdir, storage="sqlite"):
+    ontology_path = os.path.join(workdir, "project.rdf")
+    shutil.copy(os.path.join(BACKEND_DIR, "project.rdf"), ontology_path)
+    env = dict(os.environ, ONTOLOGY_PATH=ontology_path, ONTOLOGY_STORAGE=storage, GROQ_API_KEY="",
+               ONTOLOGY_QUADSTORE_PATH=os.path.join(workdir, "project.sqlite3"), LLM_CACHE_MAX_ENTRIES="0")
+    for key in ("ONTOLOGY_BOOT_SNAPSHOT", "LLM_CACHE_PATH", "POPULATION_NORMS_PATH"):
+        env.pop(key, None)
+    return env
+
+
+def test_running_app_sees_cli_import(tmp_path, answers):
+    records = tmp_path / "import.jsonl"
+    records.write_text(json.dumps({"id": "cli1", "name": "CLI Import", "answers": answers}) + "\n")
+
+    out = subprocess.run([sys.executable, "-c", CHILD, str(records)], cwd=BACKEND_DIR, env=sqlite_env(str(tmp_path)),
+                         check=True, capture_output=True, text=True).stdout
+    before, after, scores = json.loads(out.strip().splitlines()[-1])
+
+    assert before is False
+    assert after is True
+    assert scores
+
+
+def test_unknown_storage_is_rejected(tmp_path):
+    result = subprocess.run([sys.executable, "-c", "import app"], cwd=BACKEND_DIR, env=sqlite_env(str(tmp_path), "postgres"),
+                            capture_output=True, text=True)
+
+    assert result.returncode != 0
+    assert "ONTOLOGY_STORAGE must be 'rdfxml' or 'sqlite'" in result.stderr
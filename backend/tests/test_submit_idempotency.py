@@ -0,0 +1,29 @@
+def post(client, answers, key):
+    return client.post("/submit_assessment", json={"id": "idem", "name": "Idem Test", "answers": answers},
+                       headers={"Idempotency-Key": key})
+
+
+def test_failed_save_is_not_replayed(app_module, client, answers, monkeypatch):
+    persist_ontology = app_module.persist_ontology
+
+    def failing_persist(o):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(app_module, "persist_ontology", failing_persist)
+    failed = post(client, answers, "retry-after-failure")
+    assert failed.status_code == 500
+    assert not app_module.extract_trait_percentages_for_participant("idem")
+
+    monkeypatch.setattr(app_module, "persist_ontology", persist_ontology)
+    retried = post(client, answers, "retry-after-failure")
+    assert retried.status_code == 200
+    assert "Idempotent-Replayed" not in retried.headers
+    assert app_module.extract_trait_percentages_for_participant("idem")
+
+
+def test_completed_submission_is_replayed(client, answers):
+    first = post(client, answers, "replay-me")
+    replay = post(client, answers, "replay-me")
+
+    assert replay.headers["Idempotent-Replayed"] == "true"
+    assert replay.get_json() == first.get_json()
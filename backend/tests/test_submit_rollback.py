@@ -0,0 +1,139 @@
+"""A submit that fails mid-store while write-behind saves are pending (the default configuration)."""
+
+import threading
+import time
+
+import pytest
+from owlready2 import World
+
+from write_behind import WriteBehindSaver
+
+
+@pytest.fixture
+def write_behind(app_module, monkeypatch):
+    """Hold saves back like the default interval does (the session saves synchronously)."""
+    writer = WriteBehindSaver(app_module.save_ontology_snapshot, interval=3600)
+    monkeypatch.setattr(app_module, "ONTOLOGY_SAVE_INTERVAL_SECONDS", 3600)
+    monkeypatch.setattr(app_module, "ontology_writer", writer)
+    yield writer
+    writer.close()
+
+
+def fail_mid_store(app_module, monkeypatch, user_id, delay=0.0):
+    """Make storing user_id fail after its Participant, Assessment and first TraitScore are written."""
+    get_or_create_singleton = app_module.get_or_create_singleton
+    scores = []
+
+    def flaky(cls, name, log=True):
+        if name.startswith(f"Score_{user_id}_"):
+            scores.append(name)
+            if len(scores) == 2:
+                time.sleep(delay)
+                raise OSError("disk gone mid-store")
+        return get_or_create_singleton(cls, name, log=log)
+
+    monkeypatch.setattr(app_module, "get_or_create_singleton", flaky)
+
+
+def submit(client, user_id, answers):
+    return client.post("/submit_assessment", json={"id": user_id, "name": user_id.title(), "answers": answers})
+
+
+def derived_state(app_module, user_id):
+    return (app_module.stored_result_row(user_id)[1:3], app_module.population_norms.summary(),
+            app_module.result_store.summary(), app_module.similarity_index.vector(user_id))
+
+
+def saved_participants(app_module):
+    world = World()
+    saved = world.get_ontology(app_module.ONTOLOGY_PATH).load()
+    return {p.name: {s.name: s.meanScore[0] for s in saved.search(type=saved.TraitScore) if s.name.startswith(f"Score_{p.name[12:]}_")}
+            for p in saved.search(type=saved.Participant)}
+
+
+def test_failed_submit_leaves_nothing_behind(app_module, client, answers, write_behind, monkeypatch):
+    changed = {q_id: 6 - value for q_id, value in answers.items()}
+    assert submit(client, "rb_existing", answers).status_code == 200
+    assert submit(client, "rb_pending", changed).status_code == 200
+    assert write_behind.dirty
+    before = derived_state(app_module, "rb_existing")
+
+    fail_mid_store(app_module, monkeypatch, "rb_existing")
+    assert submit(client, "rb_existing", changed).status_code == 500
+    fail_mid_store(app_module, monkeypatch, "rb_new")
+    assert submit(client, "rb_new", changed).status_code == 500
+
+    assert app_module.find_entity_by_id(app_module.onto.Participant, "Participant_rb_new") is None
+    assert not app_module.entity_index.trait_scores("rb_new")
+    assert "rb_new" not in app_module.result_store
+    assert derived_state(app_module, "rb_existing") == before
+
+    write_behind.flush()
+    saved = saved_participants(app_module)
+    assert "Participant_rb_new" not in saved
+    assert "Participant_rb_pending" in saved
+    assert saved["Participant_rb_existing"] == {f"Score_rb_existing_{trait}": pct for trait, pct in before[0][0].items()}
+
+
+def read_while(app_module, read, action, readers=4):
+    """Run action() while reader threads call read() under the read lock; returns what they saw."""
+    seen, done = [], threading.Event()
+
+    def poll():
+        while True:
+            finished = done.is_set()
+            with app_module.ontology_snapshot():
+                seen.append(read())
+            if finished:
+                return
+
+    threads = [threading.Thread(target=poll) for _ in range(readers)]
+    for thread in threads:
+        thread.start()
+    try:
+        action()
+    finally:
+        done.set()
+        for thread in threads:
+            thread.join()
+    return seen
+
+
+def test_readers_never_see_a_partial_submission(app_module, answers, write_behind, monkeypatch):
+    client = app_module.app.test_client()
+    assert submit(client, "rb_race", answers).status_code == 200
+    expected = app_module.extract_trait_percentages_for_participant("rb_race")
+    changed = {q_id: 6 - value for q_id, value in answers.items()}
+
+    def failing_submits():
+        fail_mid_store(app_module, monkeypatch, "rb_race", delay=0.2)
+        assert submit(client, "rb_race", changed).status_code == 500
+        fail_mid_store(app_module, monkeypatch, "rb_race_new", delay=0.2)
+        assert submit(client, "rb_race_new", changed).status_code == 500
+
+    # Read the World directly: /get_previous_result would answer from the response cache
+    seen = read_while(app_module, lambda: (app_module.extract_trait_percentages_for_participant("rb_race"),
+                                           app_module.extract_trait_percentages_for_participant("rb_race_new")),
+                      failing_submits)
+
+    assert len(seen) >= 4
+    assert all(item == (expected, {}) for item in seen)
+
+
+def test_failed_transaction_is_rolled_back_before_readers_resume(app_module, client, answers, write_behind, monkeypatch):
+    assert submit(client, "rb_analysis", answers).status_code == 200
+    participant = app_module.find_entity_by_id(app_module.onto.Participant, "Participant_rb_analysis")
+
+    def slow_failing_persist(o):
+        time.sleep(0.2)
+        raise OSError("disk full")
+
+    def failing_store():
+        monkeypatch.setattr(app_module, "persist_ontology", slow_failing_persist)
+        with pytest.raises(OSError):
+            app_module.store_analysis_report("rb_analysis", "half-written analysis")
+
+    seen = read_while(app_module, lambda: list(participant.hasAnalysisReport), failing_store)
+
+    assert len(seen) >= 4
+    assert all(reports == [] for reports in seen)
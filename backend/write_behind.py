@@ -0,0 +1,126 @@
+"""Write-behind persistence: coalesce bursts of ontology mutations into one background save."""
+
+import threading
+import time
+
+
+class WriteBehindSaver:
+    """Debounced saver that runs save(target) on a background thread.
+
+    mark_dirty(target) records that target has unsaved changes. The first mark starts a timer;
+    once interval seconds have passed (or max_pending marks have piled up) every change made so
+    far is written with a single save() call. flush() saves synchronously and close() stops the
+    thread after a final flush, so nothing is lost on shutdown. A failed save keeps the changes
+    pending and is retried on the next round.
+    """
+
+    def __init__(self, save, interval=1.0, max_pending=25, name="ontology-writer"):
+        self.save = save
+        self.interval = interval
+        self.max_pending = max_pending
+        self.name = name
+        self.saves = 0
+        self.coalesced = 0
+        self.failures = 0
+        self.last_save_seconds = 0.0
+        self._target = None
+        self._pending = 0
+        self._first_dirty_at = None
+        self._saving = False
+        self._closed = False
+        self._cond = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def dirty(self):
+        """True while changes are waiting for, or in the middle of, a save."""
+        with self._cond:
+            return self._pending > 0 or self._saving
+
+    def mark_dirty(self, target):
+        with self._cond:
+            self._target = target
+            self._pending += 1
+            if self._first_dirty_at is None:
+                self._first_dirty_at = time.monotonic()
+            if self._thread is None and not self._closed:
+                self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self._thread.start()
+            self._cond.notify_all()
+
+    def flush(self):
+        """Save pending changes now; returns True when a save was performed."""
+        with self._flush_lock:
+            with self._cond:
+                pending, target = self._pending, self._target
+                if not pending:
+                    return False
+                self._pending = 0
+                self._first_dirty_at = None
+                self._saving = True
+            started = time.perf_counter()
+            try:
+                self.save(target)
+            except Exception:
+                with self._cond:
+                    self.failures += 1
+                    self._pending += pending
+                    if self._first_dirty_at is None:
+                        self._first_dirty_at = time.monotonic()
+                raise
+            finally:
+                with self._cond:
+                    self._saving = False
+            with self._cond:
+                self.saves += 1
+                self.coalesced += pending
+                self.last_save_seconds = time.perf_counter() - started
+            return True
+
+    def close(self):
+        """Stop the background thread and write whatever is still pending."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+            thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+        self.flush()
+
+    def stats(self):
+        with self._cond:
+            return {
+                "pending": self._pending,
+                "saves": self.saves,
+                "coalesced_mutations": self.coalesced,
+                "failures": self.failures,
+                "last_save_seconds": round(self.last_save_seconds, 4),
+                "interval_seconds": self.interval,
+                "max_pending": self.max_pending,
+            }
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+                if self._closed:
+                    return
+                # Debounce: wait out the interval unless enough mutations have piled up
+                while not self._closed and 0 < self._pending < self.max_pending:
+                    remaining = self._first_dirty_at + self.interval - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                if self._closed:
+                    return
+                if not self._pending:
+                    continue
+            try:
+                self.flush()
+            except Exception as exc:
+                print(f"⚠️ Background ontology save failed: {exc}")
+                with self._cond:
+                    # Back off before retrying so a persistent failure does not spin
+                    self._cond.wait(max(self.interval, 1.0))
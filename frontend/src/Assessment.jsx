@@ -86,7 +86,7 @@ const Assessment = () => {
       const res = await fetch(`${API_BASE}/submit_assessment`, {
         method: 'POST',
         headers: { 'Content-Type': 'application/json' },
-        body: JSON.stringify({ name, id: userId, answers })
+        body: JSON.stringify({ name, id: userId, answers, stream_analysis: true })
       });
       const data = await res.json();
       
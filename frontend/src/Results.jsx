@@ -14,6 +14,7 @@ const Results = () => {
   const [careerFitError, setCareerFitError] = useState('');
   const [selectedRole, setSelectedRole] = useState('');
   const [isRoleModalOpen, setIsRoleModalOpen] = useState(false);
+  const [streamedAnalysis, setStreamedAnalysis] = useState('');
 
   useEffect(() => {
     const stored = localStorage.getItem('pi_result');
@@ -74,6 +75,32 @@ const Results = () => {
     fetchCareerFit();
   }, [payload?.userId]);
 
+  useEffect(() => {
+    const streamPath = payload?.result?.analysis_stream;
+    if (!streamPath || payload?.result?.analysis) return undefined;
+
+    setStreamedAnalysis('');
+    let text = '';
+    const source = new EventSource(`${API_BASE}${streamPath}`);
+    source.addEventListener('token', (e) => {
+      text += JSON.parse(e.data).text;
+      setStreamedAnalysis(text);
+    });
+    source.addEventListener('done', () => {
+      source.close();
+      // Keep the finished analysis so a reload does not stream it again
+      const updated = { ...payload, result: { ...payload.result, analysis: text } };
+      localStorage.setItem('pi_result', JSON.stringify(updated));
+    });
+    source.addEventListener('error', (e) => {
+      source.close();
+      if (e.data) {
+        setStreamedAnalysis(text || JSON.parse(e.data).message);
+      }
+    });
+    return () => source.close();
+  }, [payload]);
+
   useEffect(() => {
     const anyModalOpen = isModalOpen || isRoleModalOpen;
     if (!anyModalOpen) {
@@ -118,6 +145,7 @@ const Results = () => {
   const { name, userId, result } = payload;
   const scores = result?.scores || {};
   const performance = result?.performance || {};
+  const analysisText = result?.analysis || streamedAnalysis;
 
   const allSections = [
     'Trait-by-Trait Justification',
@@ -433,14 +461,14 @@ const Results = () => {
             )}
           </div>
 
-          {result?.analysis && (
+          {analysisText && (
             <div className="card wide analysis-card-container">
               <div className="section-header">
                 <div className="pill">AI narrative</div>
                 <div className="muted small">Tailored summary</div>
               </div>
               <div className="analysis-content-wrapper">
-                {renderAnalysis(result.analysis)}
+                {renderAnalysis(analysisText)}
               </div>
             </div>
           )}